@@ -0,0 +1,66 @@
+"""
+Fight resolution cost vs enemy HP: the previous round-by-round loop vs the
+closed form in systems.combat.resolve_rounds.
+
+The worst case for the loop is an enemy whose attack does not beat the
+player's defense (0 damage per round), so the fight lasts hp / player_damage
+rounds. Every case is also checked for identical results.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_combat [--hp 1000,100000,10000000] [--fights 200]
+"""
+import argparse
+import random
+import time
+
+from systems.combat import resolve_rounds
+
+
+def loop_rounds(player_hp, enemy_hp, player_damage, enemy_damage):
+    """Round loop as simulate_combat ran it before the closed form."""
+    rounds = 0
+    while player_hp > 0 and enemy_hp > 0:
+        rounds += 1
+        enemy_hp -= player_damage
+        player_hp -= enemy_damage
+    return enemy_hp, player_hp, rounds
+
+
+def make_fights(enemy_hp: int, n: int, rng: random.Random):
+    """(player_hp, enemy_hp, player_damage, enemy_damage); half of them with a harmless enemy."""
+    out = []
+    for i in range(n):
+        player_damage = rng.randint(1, 40)
+        enemy_damage = 0 if i % 2 else rng.randint(1, 30)
+        out.append((rng.randint(1, 2000), enemy_hp, player_damage, enemy_damage))
+    return out
+
+
+def bench(fn, fights) -> float:
+    """Returns microseconds per fight."""
+    t0 = time.perf_counter()
+    for f in fights:
+        fn(*f)
+    return (time.perf_counter() - t0) * 1e6 / len(fights)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--hp", default="1000,100000,10000000")
+    ap.add_argument("--fights", type=int, default=200)
+    args = ap.parse_args()
+
+    rng = random.Random(1)
+    print(f"{'enemy hp':>10} | {'loop us/fight':>13} | {'closed us/fight':>15} | {'speedup':>8}")
+    print("-" * 56)
+    for hp in [int(x) for x in args.hp.split(",") if x.strip()]:
+        fights = make_fights(hp, args.fights, rng)
+        for f in fights:
+            assert loop_rounds(*f) == resolve_rounds(*f), f
+        loop = bench(loop_rounds, fights)
+        closed = bench(resolve_rounds, fights)
+        print(f"{hp:>10} | {loop:>13.1f} | {closed:>15.2f} | {loop / max(closed, 1e-9):>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
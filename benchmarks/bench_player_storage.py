@@ -0,0 +1,83 @@
+"""
+Per-command save cost: players.json blob vs SQLite row-per-player vs
+per-player files vs snapshot + append-only journal.
+
+Each "command" changes one profile and flushes it (write-through), which is
+the worst case for the store; write-behind batching only makes both faster.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_player_storage [--sizes 1000,10000,100000] [--saves 20]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from core.player_backends import JsonFileBackend, SqliteBackend, ShardedFilesBackend, JournalBackend
+from core.player_store import PlayerStore
+from core.players import default_profile
+
+
+def make_profiles(n: int) -> dict:
+    rng = random.Random(1234)
+    out = {}
+    for i in range(n):
+        uid = str(100000000000000000 + i)
+        prof = default_profile(uid, f"user_{i}")
+        prof["Scrap"] = rng.randint(0, 1_000_000)
+        prof["level"] = rng.randint(1, 200)
+        prof["inventory"] = {str(rng.randint(1, 400)): rng.randint(1, 500) for _ in range(30)}
+        prof["completed_quests"] = [f"q{j}" for j in range(rng.randint(0, 20))]
+        out[uid] = prof
+    return out
+
+
+def bench_backend(backend, profiles: dict, saves: int) -> float:
+    """Seed the backend, then time `saves` single-profile write-through saves. Returns ms/save."""
+    backend.write(profiles, list(profiles.keys()))
+    if hasattr(backend, "compact"):
+        backend.compact(profiles)
+    store = PlayerStore(backend, flush_interval=0, flush_threshold=1)
+    uids = list(profiles.keys())
+    rng = random.Random(99)
+    store.get(uids[0])  # warm the cache so load_all() is not timed
+    t0 = time.perf_counter()
+    for _ in range(saves):
+        uid = rng.choice(uids)
+        prof = store.get(uid)
+        prof["Scrap"] = int(prof.get("Scrap", 0)) + 1
+        store.put(uid, prof)
+    return (time.perf_counter() - t0) * 1000.0 / saves
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default="1000,10000,100000")
+    ap.add_argument("--saves", type=int, default=20)
+    args = ap.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    print(f"{'players':>10} | {'json ms/save':>14} | {'sqlite ms/save':>14} | {'files ms/save':>14} | {'journal ms/save':>15}")
+    print("-" * 79)
+    for n in sizes:
+        profiles = make_profiles(n)
+        tmp = tempfile.mkdtemp(prefix="bench_players_")
+        try:
+            json_ms = bench_backend(JsonFileBackend(os.path.join(tmp, "players.json")), profiles, args.saves)
+            db = SqliteBackend(os.path.join(tmp, "players.sqlite3"))
+            try:
+                sqlite_ms = bench_backend(db, profiles, args.saves)
+            finally:
+                db.close()
+            files_ms = bench_backend(ShardedFilesBackend(os.path.join(tmp, "players")), profiles, args.saves)
+            journal = JournalBackend(os.path.join(tmp, "snapshot.json"), os.path.join(tmp, "players.journal.jsonl"))
+            journal_ms = bench_backend(journal, profiles, args.saves)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        print(f"{n:>10} | {json_ms:>14.3f} | {sqlite_ms:>14.3f} | {files_ms:>14.3f} | {journal_ms:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+save_profile cost for large profiles: legacy full normalize + deep merge
+(plain dict) vs delta commit of a change-tracked profile.
+
+Each save models a typical command: +Scrap, one inventory entry changed.
+Only the in-memory save is timed (flushes are disabled), so the numbers
+show the per-save CPU cost independent of the storage backend.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_save_profile [--inventory 100,500,2000] [--quests 5000] [--saves 2000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import core.player_store as player_store
+from core.player_backends import JsonFileBackend
+from core.player_store import PlayerStore
+from core.players import default_profile, load_profile, save_profile
+
+UID = "100000000000000001"
+
+
+def make_profile(inv_keys: int, quests: int) -> dict:
+    prof = default_profile(UID, "bench")
+    prof["inventory"] = {str(i): (i % 97) + 1 for i in range(inv_keys)}
+    prof["completed_quests"] = [f"quest_{i}" for i in range(quests)]
+    prof["skills"] = {s: {"level": 10, "xp": 123} for s in ("worker", "crafter", "tinkerer", "trader", "boxer", "gambler", "soldier")}
+    prof["ship"] = {"owned": True, "tier": 2, "level": 40, "type": "soldier", "attempts": {}}
+    return prof
+
+
+def bench(plain: bool, saves: int) -> float:
+    """Returns microseconds per save."""
+    store = player_store.get_player_store()
+    total = 0.0
+    for i in range(saves):
+        prof = store.get(UID) if plain else load_profile(UID)
+        prof["Scrap"] = int(prof.get("Scrap", 0)) + 1
+        key = str(i % 50)
+        prof["inventory"][key] = int(prof["inventory"].get(key, 0)) + 1
+        t0 = time.perf_counter()
+        save_profile(UID, prof)
+        total += time.perf_counter() - t0
+    return total * 1e6 / saves
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--inventory", default="100,500,2000")
+    ap.add_argument("--quests", type=int, default=5000)
+    ap.add_argument("--saves", type=int, default=2000)
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_save_")
+    # Isolated store; never flushes during the run
+    player_store._store = PlayerStore(JsonFileBackend(os.path.join(tmp, "players.json")),
+                                      flush_interval=1e9, flush_threshold=10**9)
+
+    print(f"{'inventory keys':>14} | {'quests':>6} | {'legacy us/save':>14} | {'delta us/save':>13} | {'speedup':>7}")
+    print("-" * 68)
+    for n in [int(x) for x in args.inventory.split(",") if x.strip()]:
+        player_store._store.put(UID, make_profile(n, args.quests))
+        legacy = bench(True, args.saves)
+        delta = bench(False, args.saves)
+        print(f"{n:>14} | {args.quests:>6} | {legacy:>14.1f} | {delta:>13.1f} | {legacy / max(delta, 1e-9):>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
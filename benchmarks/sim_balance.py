@@ -0,0 +1,182 @@
+"""
+Offline Monte-Carlo balance simulator for scan/explore.
+
+For every (planet, sector, mode) bracket it builds a representative profile
+(level = the planet's level requirement, the planet's required gear equipped,
+optional ship/Boxer level) and simulates --fights encounters in batches:
+
+- enemy picks: one multinomial draw over the planet's pool
+- combat: one simulate_combat() per distinct enemy (fights are deterministic
+  at full HP), weighted by how often that enemy was picked
+- base Scrap/XP: multinomial counts over BASE_FIGHT_REWARDS, then the exact
+  per-fight core.rewards multipliers and rounding
+- enemy drops: one binomial per drop token (enemy_drop_chance)
+- supply crates: binomial base hits (supply_crate_drop_params), then
+  multinomial rarities over RARITY_WEIGHTS for base, ship-double and Boxer rolls
+
+So the cost per bracket is O(enemies + reward values + rarities), independent
+of --fights. Per-hour figures assume every fight starts at full HP and the
+command is used once per cooldown (COMMAND_COOLDOWNS); oxygen, healing and the
+level lost on a defeat are not modeled.
+
+Usage (from the repo root):
+    python -m benchmarks.sim_balance [--planets 1,2,3] [--sectors 0,1] [--modes scan,explore]
+                                     [--fights 1000000] [--ship-tier 4 --ship-level 50 --ship-type frigate]
+                                     [--boxer 100] [--no-gear] [--seed 1]
+"""
+import argparse
+import random
+from collections import Counter
+
+from core import gamedata
+from core.constants import COMMAND_COOLDOWNS
+from core.enemies import get_enemy_tables
+from core.items import get_item_index
+from core.players import default_profile
+from core.rewards import reward_multipliers
+from core.rng import set_root_seed, stream
+from core.sampling import binomial, multinomial
+from core.utils import get_max_health
+from systems.combat import (
+    BASE_FIGHT_REWARDS, RARITY_WEIGHTS, _unique_non_loot_drops_list,
+    enemy_drop_chance, simulate_combat, supply_crate_drop_params,
+)
+
+CATEGORY = {"scan": "basic", "explore": "elite"}
+GEAR_SLOTS = {"weapons": "weapon", "armor": "armor"}
+
+
+def _planets_data() -> dict:
+    root = gamedata.planets() or {}
+    return root.get("planets") if isinstance(root.get("planets"), dict) else root
+
+
+def make_profile(planet: int, sector: int, args) -> dict:
+    meta = _planets_data().get(str(planet), {}) or {}
+    prof = default_profile("0", "sim")
+    prof["level"] = int(args.level or meta.get("level_requirement", 1) or 1)
+    prof["current_planet"] = prof["max_unlocked_planet"] = planet
+    prof["sector"] = sector
+    prof["equipped"] = {}
+    if not args.no_gear:
+        index = get_item_index()
+        for name in meta.get("requirements", []) or []:
+            iid = index.id_for_name(name)
+            slot = GEAR_SLOTS.get(index.category_of(iid)) if iid else None
+            if slot:
+                prof["equipped"][slot] = iid
+    if args.ship_tier:
+        prof["ship"] = {"owned": True, "tier": args.ship_tier, "level": args.ship_level,
+                        "type": args.ship_type, "attempts": {}}
+    if args.boxer:
+        prof.setdefault("skills", {})["boxer"] = {"level": args.boxer, "xp": 0}
+    prof["health"] = get_max_health(prof)
+    return prof
+
+
+def _reward_total(counts, lo: int, mult: float, add: int) -> int:
+    """Sum of max(0, round(v * mult) + add) over per-value counts for v = lo, lo+1, ..."""
+    return sum(c * max(0, int(round((lo + i) * mult)) + add) for i, c in enumerate(counts) if c)
+
+
+def simulate_bracket(prof: dict, mode: str, fights: int, rng: random.Random) -> dict:
+    pool = get_enemy_tables().pool(prof["current_planet"], CATEGORY[mode])
+    out = {"fights": fights, "wins": 0, "losses": 0, "scrap": 0, "xp": 0,
+           "drops": Counter(), "crates": Counter()}
+    if not pool or fights <= 0:
+        return out
+
+    picks = multinomial(fights, [1.0 / len(pool)] * len(pool), rng)
+    for (key, enemy), n in zip(pool, picks):
+        if not n:
+            continue
+        result = simulate_combat(prof, enemy, mode)
+        if result["player_won"]:
+            out["wins"] += n
+            chance = enemy_drop_chance(prof, enemy)
+            for tok in _unique_non_loot_drops_list(enemy.get("drops", [])):
+                out["drops"][tok] += binomial(n, chance, rng)
+        elif result["enemy_hp_left"] > 0:
+            out["losses"] += n
+    wins = out["wins"]
+
+    # Base rewards through the reward engine's multipliers
+    mults = reward_multipliers(prof, ctx_meta={"command": mode, "planet": str(prof["current_planet"])}, tags=[mode])
+    for scope, (lo, hi) in BASE_FIGHT_REWARDS[mode].items():
+        counts = multinomial(wins, [1.0] * (hi - lo + 1), rng)
+        out[scope] = _reward_total(counts, lo, *mults[scope])
+
+    # Supply crates: base hits, then rarities for base + ship double + Boxer extras
+    chance, ship_double, extra = supply_crate_drop_params(prof, mode)
+    hits = binomial(wins, chance, rng)
+    rolls = hits * (1 + int(ship_double) + extra)
+    names = list(RARITY_WEIGHTS[mode])
+    for name, c in zip(names, multinomial(rolls, list(RARITY_WEIGHTS[mode].values()), rng)):
+        out["crates"][name] += c
+    return out
+
+
+def _int_list(spec: str):
+    out = []
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            a, b = part.split("-", 1)
+            out.extend(range(int(a), int(b) + 1))
+        elif part:
+            out.append(int(part))
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--planets", default="", help="e.g. 1-10 or 1,3,5 (default: every planet with enemies)")
+    ap.add_argument("--sectors", default="0")
+    ap.add_argument("--modes", default="scan,explore")
+    ap.add_argument("--fights", type=int, default=1_000_000, help="encounters per bracket and mode")
+    ap.add_argument("--level", type=int, default=0, help="player level (default: planet level requirement)")
+    ap.add_argument("--ship-tier", type=int, default=0)
+    ap.add_argument("--ship-level", type=int, default=1)
+    ap.add_argument("--ship-type", default=None)
+    ap.add_argument("--boxer", type=int, default=0, help="Boxer skill level")
+    ap.add_argument("--no-gear", action="store_true", help="do not equip the planet's required gear")
+    ap.add_argument("--seed", type=int, default=None, help="pin the core.rng root seed (reproducible runs)")
+    args = ap.parse_args()
+
+    if args.seed is not None:
+        set_root_seed(args.seed)
+    rng = stream("sim_balance")
+    planets = _int_list(args.planets) if args.planets else sorted({p for p, _ in get_enemy_tables().pools})
+    modes = [m.strip() for m in args.modes.split(",") if m.strip() in CATEGORY]
+
+    rows = []
+    for planet in planets:
+        for sector in _int_list(args.sectors):
+            prof = make_profile(planet, sector, args)
+            for mode in modes:
+                rows.append((planet, sector, mode, prof["level"], simulate_bracket(prof, mode, args.fights, rng)))
+
+    print(f"{'planet':>6} {'sector':>6} {'mode':>7} {'lvl':>4} | {'win%':>6} {'loss%':>6} | "
+          f"{'scrap/fight':>11} {'xp/fight':>9} | {'scrap/h':>10} {'xp/h':>10} | {'crates/1k':>9} {'drops/1k':>8}")
+    print("-" * 118)
+    for planet, sector, mode, level, r in rows:
+        n = max(1, r["fights"])
+        per_hour = 3600.0 / max(1, COMMAND_COOLDOWNS.get(mode, 60))
+        print(f"{planet:>6} {sector:>6} {mode:>7} {level:>4} | {100.0 * r['wins'] / n:>6.2f} {100.0 * r['losses'] / n:>6.2f} | "
+              f"{r['scrap'] / n:>11.2f} {r['xp'] / n:>9.2f} | {r['scrap'] / n * per_hour:>10.1f} {r['xp'] / n * per_hour:>10.1f} | "
+              f"{1000.0 * sum(r['crates'].values()) / n:>9.3f} {1000.0 * sum(r['drops'].values()) / n:>8.2f}")
+
+    for mode in modes:
+        names = list(RARITY_WEIGHTS[mode])
+        print(f"\nSupply crate rarity distribution ({mode}, % of crates)")
+        print(f"{'planet':>6} {'sector':>6} {'crates':>9} | " + " ".join(f"{nm[:9]:>9}" for nm in names))
+        for planet, sector, m, _, r in rows:
+            if m != mode:
+                continue
+            total = sum(r["crates"].values())
+            cells = " ".join(f"{100.0 * r['crates'][nm] / total if total else 0.0:>9.4f}" for nm in names)
+            print(f"{planet:>6} {sector:>6} {total:>9} | {cells}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,19 @@
 import os
+import sys
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 import asyncio
 
 from dynamic_loader import load_all_extensions
-from core.constants import PLAYERS_FILE, RUNTIME_DATA_DIR
+from core.constants import RUNTIME_DATA_DIR, SHARED_RUNTIME, BOT_SHARD_COUNT
+from core import gamedata
+from core.sharding import run_shard_supervisor, worker_shard_ids, is_primary_process
 from core.backup import run_daily_players_backup
+from core.player_store import (
+    run_player_store_flusher, run_player_store_compactor, flush_player_store,
+    players_backup_source, prepare_players_backup,
+)
 
 # Load environment variables
 load_dotenv()
@@ -14,23 +21,36 @@ TOKEN = os.getenv("DISCORD_TOKEN")
 
 # Bot setup
 intents = discord.Intents.all()
-bot = commands.Bot(command_prefix=["!", "spc "], intents=intents, help_command=None)
+SHARD_IDS = worker_shard_ids()
+if SHARD_IDS is not None:
+    # Shard worker started by core/sharding.py (BOT_PROCESSES > 1)
+    bot = commands.AutoShardedBot(command_prefix=["!", "spc "], intents=intents, help_command=None,
+                                  shard_ids=SHARD_IDS, shard_count=BOT_SHARD_COUNT)
+else:
+    bot = commands.Bot(command_prefix=["!", "spc "], intents=intents, help_command=None)
 
 
 @bot.event
 async def on_ready():
     print(f"\n[🚀] Logged in as {bot.user} (ID: {bot.user.id})")
-    print(f"[💡] Connected to {len(bot.guilds)} servers")
+    print(f"[💡] Connected to {len(bot.guilds)} servers" + (f" (shards {SHARD_IDS})" if SHARD_IDS is not None else ""))
     print(f"[💬] Loaded commands: {[c.name for c in bot.commands]}")
     print("-" * 50)
     # Schedule daily backup of players.json at 04:00 UTC
     backup_dir = os.path.join(RUNTIME_DATA_DIR, "backups")
     keep = int(os.getenv("BACKUP_KEEP_COUNT", "14"))
     hour = int(os.getenv("BACKUP_HOUR_UTC", "4"))
-    # Ensure only one task
-    if not getattr(bot, "_backup_task_started", False):
+    # Ensure only one task (and only in one process of the sharded runtime)
+    if is_primary_process() and not getattr(bot, "_backup_task_started", False):
         bot._backup_task_started = True
-        asyncio.create_task(run_daily_players_backup(PLAYERS_FILE, backup_dir, keep=keep, hour_utc=hour, logger=print))
+        asyncio.create_task(run_daily_players_backup(players_backup_source(), backup_dir, keep=keep, hour_utc=hour, logger=print, before_backup=prepare_players_backup))
+    # Periodically write cached profiles back to disk
+    if not getattr(bot, "_flush_task_started", False):
+        bot._flush_task_started = True
+        asyncio.create_task(run_player_store_flusher(logger=print))
+        # Journal backend: fold the journal into the snapshot between daily backups
+        if is_primary_process():
+            asyncio.create_task(run_player_store_compactor(logger=print))
 
 
 # Basic ping test command (always keep one internal command for diagnostics)
@@ -41,14 +61,23 @@ async def ping(ctx):
 @commands.is_owner()
 @bot.command(name="reload")
 async def reload_extensions(ctx):
+    # Re-read static data files too (normally they reload on their own when edited)
+    gamedata.reload()
     await load_all_extensions(ctx.bot)
-    await ctx.send("♻️ Reloaded all extensions.")
+    await ctx.send("♻️ Reloaded all extensions and game data.")
 
 async def main():
-    async with bot:
-        await load_all_extensions(bot)
-        await bot.start(TOKEN)
+    try:
+        async with bot:
+            await load_all_extensions(bot)
+            await bot.start(TOKEN)
+    finally:
+        # Persist any profiles still waiting for the write-behind flush
+        flush_player_store()
 
 
 if __name__ == "__main__":
+    if SHARED_RUNTIME and SHARD_IDS is None:
+        # BOT_PROCESSES > 1: this process only supervises the shard workers
+        sys.exit(run_shard_supervisor(os.path.abspath(__file__)))
     asyncio.run(main())
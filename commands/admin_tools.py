@@ -1,7 +1,11 @@
 import discord
 from discord.ext import commands
 from core.decorators import requires_profile
-from core.cooldowns import COOLDOWNS_FILE, active_cooldowns, save_cooldowns  # CHANGED
+from core.cooldowns import get_user_cooldowns, set_user_cooldowns
+from core.constants import PLAYERS_FILE, PROFILE_DIR
+from core.player_store import get_player_store
+from core.player_backends import split_players_json
+from core.players import migrate_all_profiles, CURRENT_SCHEMA_VERSION
 import importlib
 
 
@@ -16,7 +20,7 @@ class AdminTools(commands.Cog):
 
     def _clear_user_cooldowns(self, user_id: int | str, command: str | None = None) -> int:
         uid = str(user_id)
-        user_data = active_cooldowns.get(uid)
+        user_data = get_user_cooldowns(uid)
         if not user_data or not isinstance(user_data, dict):
             return 0
 
@@ -24,7 +28,7 @@ class AdminTools(commands.Cog):
         cooldowns = user_data.get("cooldowns")
         if not isinstance(cooldowns, dict):
             user_data["cooldowns"] = {}
-            save_cooldowns()
+            set_user_cooldowns(uid, user_data)
             return 0
 
         cleared = 0
@@ -42,8 +46,7 @@ class AdminTools(commands.Cog):
             cleared = len(cooldowns)
             user_data["cooldowns"] = {}
 
-        active_cooldowns[uid] = user_data
-        save_cooldowns()
+        set_user_cooldowns(uid, user_data)
         return cleared
 
     @commands.command(name="clearcd", aliases=["cdclear", "cooldownclear"])
@@ -101,5 +104,28 @@ class AdminTools(commands.Cog):
             if old_cap_fn is not None:
                 cs.capacity_for_sector = old_cap_fn
 
+    @commands.command(name="splitplayers")
+    async def split_players(self, ctx):
+        """
+        Owner: split players.json into per-player files under players/<shard>/<uid>.json.
+        Run this before restarting the bot with PLAYERS_BACKEND=files.
+        """
+        store = get_player_store()
+        if store.backend.name == "json":
+            # Make sure cached profiles are on disk before splitting
+            store.flush()
+        try:
+            n = split_players_json(PLAYERS_FILE, PROFILE_DIR)
+        except Exception as e:
+            await ctx.send(f"⚠️ Split failed: {type(e).__name__}: {e}")
+            return
+        await ctx.send(f"✅ Split {n} profiles into `{PROFILE_DIR}`. Set `PLAYERS_BACKEND=files` and restart to use them.")
+
+    @commands.command(name="migrateplayers")
+    async def migrate_players(self, ctx):
+        """Owner: run pending schema migrations for every stored profile now (instead of lazily on load)."""
+        n = migrate_all_profiles()
+        await ctx.send(f"✅ Migrated {n} profiles to schema v{CURRENT_SCHEMA_VERSION}.")
+
 async def setup(bot):
     await bot.add_cog(AdminTools(bot))
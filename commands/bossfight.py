@@ -1,6 +1,6 @@
 from discord.ext import commands
 from core.decorators import requires_profile
-from core.players import load_profile, save_profile
+from core.players import load_profiles, save_profiles
 from core.guards import set_lock, clear_lock, require_no_lock
 from systems.bossfight_sys import (
     ensure_party_on_same_boss_planet,
@@ -22,7 +22,7 @@ class Bossfight(commands.Cog):
         self.bot = bot
 
     @commands.command(name="bossfight", aliases=["bf"])
-    @requires_profile(auto_save=False)
+    @requires_profile(auto_save=False, txn=False)
     @require_no_lock()
     async def bossfight(self, ctx, *members: commands.MemberConverter):
         unique_allies = []
@@ -37,7 +37,7 @@ class Bossfight(commands.Cog):
             return await ctx.send("❌ You can only bring up to 3 allies (4 total).")
 
         # Load profiles
-        profiles = {pid: load_profile(pid) for pid in player_ids}
+        profiles = load_profiles(player_ids)
         if any(p is None for p in profiles.values()):
             return await ctx.send("❌ One or more players do not have profiles.")
 
@@ -121,10 +121,10 @@ class Bossfight(commands.Cog):
 
 
         finally:
-            # Always clear locks and save
+            # Always clear locks and save the whole party in one write
             for pid in player_ids:
                 clear_lock(pid)
-                save_profile(pid, profiles[pid])
+            save_profiles({pid: profiles[pid] for pid in player_ids})
 
 async def setup(bot):
     await bot.add_cog(Bossfight(bot))
@@ -4,10 +4,10 @@ from discord.ext import commands
 from core.decorators import requires_profile
 from core.players import save_profile
 from core.shared import load_json, save_json
+from core import gamedata
 from core.guards import require_no_lock
 from core.utils import add_xp
 from systems.ship_sys import grant_starter_ship, ensure_ship
-from core.constants import ITEMS_FILE  
 from core.items import get_item_by_id, get_item_display_name  
 
 CODES_FILE = "data/codes.json"
@@ -33,7 +33,7 @@ def _apply_rewards(player: dict, rewards: dict, bot=None) -> list[str]:
     rewards = rewards or {}
 
     # Load item catalog to resolve names
-    items_catalog = load_json(ITEMS_FILE) or {}
+    items_catalog = gamedata.items() or {}
 
     # Reserved keys that are NOT items
     reserved_keys = {"Scrap", "Credits", "xp", "items", "starter_ship"}
@@ -2,14 +2,16 @@ import re
 import discord
 from discord.ext import commands
 from core.decorators import requires_profile
-from core.shared import load_json
-from core.constants import CRAFTING_FILE, ITEMS_FILE
+from core import gamedata
 from core.players import save_profile
 from core.guards import set_lock, clear_lock, require_no_lock
 from core.quest_progress import update_quest_progress_for_crafting, craft_progress_line_if_applicable
 from math import floor
 from core.skills_hooks import crafter_effects, award_skill
-from systems.crafting import crafter_xp_for_product
+from systems.crafting import (
+    crafter_xp_for_product, find_recipe, suggest_recipe_names, get_recipe_graph, plan_chain_craft,
+)
+from core.fuzzy import did_you_mean
 from core.parsing import parse_amount
 
 
@@ -49,8 +51,8 @@ class Craft(commands.Cog):
         !craft <item_name> all
         """
         player = ctx.player
-        crafting_data = load_json(CRAFTING_FILE).get("recipes", {})
-        items_data = load_json(ITEMS_FILE)
+        crafting_data = gamedata.crafting().get("recipes", {})
+        items_data = gamedata.items()
 
         if not item_and_amount:
             await ctx.send(f"{ctx.author.mention} ❌ You must specify an item to craft. Example: `!craft Plasteel Sheet 2`.")
@@ -74,18 +76,11 @@ class Craft(commands.Cog):
         item_name = item_name.lower().strip()
 
         # --- Find recipe by key, name, or alias ---
-        recipe_key, recipe = None, None
-        for key, r in crafting_data.items():
-            names = [str(key).lower()]
-            if "name" in r:
-                names.append(str(r["name"]).lower())
-            names.extend([str(a).lower() for a in r.get("aliases", [])])
-            if item_name in names:
-                recipe_key, recipe = key, r
-                break
+        recipe_key, recipe = find_recipe(item_name, crafting_data)
 
         if not recipe:
-            await ctx.send(f"{ctx.author.mention} ❌ Unknown recipe: `{item_name}`")
+            hint = did_you_mean(suggest_recipe_names(item_name, crafting_data))
+            await ctx.send(f"{ctx.author.mention} ❌ Unknown recipe: `{item_name}`.{hint}")
             return
 
         # --- Level check ---
@@ -225,5 +220,123 @@ class Craft(commands.Cog):
         tail = " • " + " • ".join(extras) if extras else ""
         await ctx.send(f"{ctx.author.mention} ✅ Crafted **{amount_to_craft}x {recipe.get('name', recipe_key)}** (x{output_qty} output)!{tail}")
 
+    @commands.command(name="craftchain", aliases=["cchain", "craftmax"])
+    @requires_profile()
+    @require_no_lock()
+    async def craftchain(self, ctx, *, item_and_amount: str = None):
+        """
+        Craft an item and any missing intermediates in one go.
+        Usage:
+        !craftchain <item_name>            (as many as possible)
+        !craftchain <item_name> <amount>
+        """
+        player = ctx.player
+        crafting_data = gamedata.crafting().get("recipes", {})
+
+        if not item_and_amount:
+            await ctx.send(f"{ctx.author.mention} ❌ You must specify an item. Example: `!craftchain Plasteel Block` or `!craftchain Plasteel Bar 5`.")
+            return
+
+        parts = item_and_amount.rsplit(" ", 1)
+        item_name, requested = item_and_amount, None
+        if len(parts) == 2 and (parts[1].lower() in ("all", "max") or parts[1].isdigit()):
+            item_name = parts[0]
+            requested = None if parts[1].lower() in ("all", "max") else max(1, int(parts[1]))
+        item_name = item_name.lower().strip()
+
+        recipe_key, recipe = find_recipe(item_name, crafting_data)
+        if not recipe:
+            hint = did_you_mean(suggest_recipe_names(item_name, crafting_data))
+            await ctx.send(f"{ctx.author.mention} ❌ Unknown recipe: `{item_name}`.{hint}")
+            return
+
+        player_level = int(player.get("level", 1) or 1)
+        level_req = int(recipe.get("level_req", 0) or 0)
+        if player_level < level_req:
+            await ctx.send(f"⚠️ You need to be **Level {level_req}** to craft {recipe.get('name', recipe_key)}. (Your level: {player_level})")
+            return
+
+        inventory = player.get("inventory", {}) or {}
+        inv_index = _build_inv_index(inventory)
+        stock = {nk: int(inventory.get(k, 0) or 0) for nk, k in inv_index.items()}
+        stock["scrap"] = int(player.get("Scrap", 0) or 0)
+
+        plan = plan_chain_craft(recipe_key, stock, player_level, batches=requested, recipes=crafting_data)
+        if plan["batches"] <= 0:
+            if requested and plan["max"] > 0:
+                await ctx.send(f"{ctx.author.mention} ❌ You can only make **{plan['max']}x {recipe.get('name', recipe_key)}** through the chain right now.")
+            else:
+                await ctx.send(f"{ctx.author.mention} ❌ You don't have enough materials to craft any {recipe.get('name', recipe_key)}, even through intermediates.")
+            return
+
+        graph = get_recipe_graph(crafting_data)
+
+        def inv_key(nk: str) -> str:
+            return inv_index.get(nk) or graph.keys.get(nk, nk)
+
+        def pretty(nk: str) -> str:
+            r = graph.recipes.get(nk)
+            if r and r.get("name"):
+                return str(r["name"])
+            return "Scrap" if nk == "scrap" else inv_key(nk).replace("_", " ").title()
+
+        # --- Apply the whole material delta at once ---
+        for nk, d in plan["delta"].items():
+            if nk == "scrap":
+                player["Scrap"] = max(0, int(player.get("Scrap", 0) or 0) + d)
+                continue
+            key = inv_key(nk)
+            inventory[key] = int(inventory.get(key, 0) or 0) + d
+            if inventory[key] <= 0:
+                inventory.pop(key, None)
+
+        # --- Crafter refund perk, per craft step (as if each step were its own !craft) ---
+        refund_pct = float(crafter_effects(player).get("craft_refund_pct", 0.0))
+        refunds: dict[str, int] = {}
+        if refund_pct > 0:
+            for nk, b in plan["crafts"]:
+                for mat, q in graph.inputs[nk].items():
+                    give_back = int(floor(q * b * refund_pct))
+                    if give_back > 0:
+                        refunds[mat] = refunds.get(mat, 0) + give_back
+            for mat, qty in refunds.items():
+                if mat == "scrap":
+                    player["Scrap"] = int(player.get("Scrap", 0) or 0) + qty
+                else:
+                    inventory[inv_key(mat)] = int(inventory.get(inv_key(mat), 0) or 0) + qty
+
+        # --- Quest progress and Crafter XP for every product made along the way ---
+        total_xp = 0
+        output_id = str(recipe_key)
+        output_qty = 0
+        for nk, b in plan["crafts"]:
+            r = graph.recipes[nk]
+            qty = int(r.get("output", 1) or 1) * b
+            update_quest_progress_for_crafting(player, graph.keys[nk], qty)
+            total_xp += crafter_xp_for_product(graph.keys[nk], r.get("name")) * qty
+            if graph.keys[nk] == output_id:
+                output_qty = qty
+        player["inventory"] = inventory
+        new_lvl, ups = award_skill(ctx, "crafter", total_xp) if total_xp > 0 else (0, 0)
+
+        save_profile(ctx.author.id, player)
+
+        chain = " → ".join(f"{b}x {pretty(nk)}" for nk, b in plan["crafts"])
+        used = [f"{pretty(nk)} x{-d}" for nk, d in plan["delta"].items() if d < 0]
+        extras = [f"Chain: {chain}"]
+        if used:
+            extras.append(f"Used: {', '.join(used)}")
+        if refunds:
+            extras.append("Refunded: " + ", ".join(f"{pretty(m)} x{q}" for m, q in refunds.items()))
+        if total_xp > 0:
+            extras.append(f"Crafter +{total_xp} XP" + (f" (L{new_lvl} +{ups})" if ups > 0 else ""))
+        qline = craft_progress_line_if_applicable(player, output_id)
+        if qline:
+            extras.append(qline)
+        await ctx.send(
+            f"{ctx.author.mention} ✅ Crafted **{plan['batches']}x {recipe.get('name', recipe_key)}** (x{output_qty} output)!\n"
+            + "\n".join(extras)
+        )
+
 async def setup(bot):
     await bot.add_cog(Craft(bot))
@@ -2,14 +2,14 @@ import discord
 from discord.ext import commands
 from core.decorators import requires_profile
 from core.players import save_profile
-from core.shared import load_json
+from core import gamedata
 from core.bank import ensure_bank
 from core.guards import require_no_lock
 
 CREDITSHOP_FILE = "data/creditshop.json"
 
 def load_cshop():
-    data = load_json(CREDITSHOP_FILE) or {}
+    data = gamedata.creditshop() or {}
     # Support both {"items": {...}} and flat {"bank": {...}}
     items = data.get("items")
     if isinstance(items, dict):
@@ -3,10 +3,9 @@ import random
 import discord
 from discord.ext import commands
 from core.decorators import requires_profile
-from core.shared import load_json
+from core import gamedata
 from core.players import save_profile
-from core.constants import ITEMS_FILE
-from core.items import iterate_all_items
+from core.items import get_item_index
 from core.guards import require_no_lock
 from core.rewards import apply_rewards  # CHANGED
 
@@ -32,15 +31,10 @@ class Daily(commands.Cog):
         xp_base = int(random.randint(10, 25) * max(1, player.get("max_unlocked_planet", 1)))
 
         # --- look up item IDs for medkits and oxy tanks ---
-        items_data = load_json(ITEMS_FILE)
-        medkit_id = None
-        oxy_id = None
-        for iid, item in iterate_all_items(items_data):
-            nm = item.get("name", "").lower()
-            if nm == "medkit":
-                medkit_id = str(iid)
-            elif nm == "oxygen tank":
-                oxy_id = str(iid)
+        items_data = gamedata.items()
+        index = get_item_index(items_data)
+        medkit_id = index.id_for_name("medkit")
+        oxy_id = index.id_for_name("oxygen tank")
 
         # Scale items by planet progression (same as before)
         med_kits_earned = 5 * max(1, player.get("max_unlocked_planet", 1))
@@ -1,7 +1,7 @@
 import discord
 from discord.ext import commands
 from core.decorators import requires_profile
-from systems.dismantle_sys import dismantle_item
+from systems.dismantle_sys import dismantle_item, dismantle_chain, dismantle_family
 from core.guards import require_no_lock
 from core.parsing import parse_amount
 
@@ -18,7 +18,21 @@ class Dismantle(commands.Cog):
         Dismantle higher-tier materials into lower-tier ones.
         Example: !dismantle plasteel sheet 3
         Supports: !dismantle psheet 5k, !dismantle pbar all, !dismantle pbeam half
+        Chains:   !dismantle pbar all to plasteel, !dismantle all plasteel [to psheet]
         """
+        # Optional chain target: "... to <material>"
+        down_to = None
+        lowered = args.lower()
+        if " to " in lowered:
+            cut = lowered.rindex(" to ")
+            args, down_to = args[:cut], args[cut + 4:].strip()
+
+        player = ctx.player
+        if args.lower().startswith("all ") and len(args.split()) >= 2:
+            result = dismantle_family(player, args[4:].strip(), down_to)
+            await self._reply(ctx, result)
+            return
+
         parts = args.split()
         if len(parts) < 1:
             await ctx.send("❌ Usage: `!dismantle <item name> [amount]`")
@@ -38,9 +52,13 @@ class Dismantle(commands.Cog):
             item_name = " ".join(parts)
             amount_str = None
 
-        player = ctx.player
-        result = dismantle_item(player, item_name, amount_str)
+        if down_to is not None:
+            result = dismantle_chain(player, item_name, amount_str, down_to=down_to)
+        else:
+            result = dismantle_item(player, item_name, amount_str)
+        await self._reply(ctx, result)
 
+    async def _reply(self, ctx, result: str):
         embed = discord.Embed(
             title="🧰 Dismantle",
             description=result,
@@ -2,11 +2,11 @@
 import discord
 from discord.ext import commands
 from core.decorators import requires_profile
-from core.shared import load_json
+from core import gamedata
 from core.players import calculate_combat_stats, save_profile
-from core.items import load_items, find_item, get_item_by_id, iterate_all_items
+from core.items import load_items, find_item, get_item_by_id, get_item_index, iterate_all_items, suggest_item_names
+from core.fuzzy import did_you_mean
 from core.guards import require_no_lock
-from core.constants import ITEMS_FILE
 
 
 class Equip(commands.Cog):
@@ -27,26 +27,22 @@ class Equip(commands.Cog):
 
         player = ctx.player
         inventory = player.get("inventory", {})
-        items = load_json(ITEMS_FILE)
+        items = gamedata.items()
         item_name = item_name.lower()
 
-        # Search player inventory for matching item
+        # First item matching the name/alias that the player actually owns
         target_id = None
         target_item = None
-        for category, item_dict in items.items():
-            for item_id, item in item_dict.items():
-                if str(item_id) not in inventory or inventory[str(item_id)] <= 0:
-                    continue
-                names = [item.get("name","").lower()] + [a.lower() for a in item.get("aliases", [])]
-                if item_name in names:
-                    target_id = item_id
-                    target_item = item
-                    break
-            if target_item:
-                break  # stop after finding the first valid item
+        index = get_item_index(items)
+        for item_id in index.ids_for(item_name):
+            if inventory.get(item_id, 0) > 0:
+                target_id = item_id
+                target_item = index.get(item_id)
+                break
 
         if not target_item:
-            await ctx.send(f"{ctx.author.mention}, you don’t have that item in your inventory!")
+            hint = did_you_mean(suggest_item_names(item_name, items, owned=inventory, category_filter=["weapons", "armor"]))
+            await ctx.send(f"{ctx.author.mention}, you don’t have that item in your inventory!{hint}")
             return
 
         # Only weapons/armor can be equipped
@@ -1,17 +1,16 @@
 # ====== EXPLORE COMMAND ==========
-import random
 import discord
 from discord.ext import commands
 from core.decorators import requires_profile, requires_oxygen
 from core.utils import get_max_health, get_max_oxygen
-from core.shared import load_json
+from core import gamedata
 from core.players import save_profile
-from systems.combat import simulate_combat, choose_random_enemy
-from core.constants import PLANETS_FILE
+from systems.combat import simulate_combat, choose_random_enemy, BASE_FIGHT_REWARDS
 from core.cooldowns import check_and_set_cooldown
 from core.guards import require_no_lock
 from systems.ship_sys import derive_ship_effects
 from core.rewards import apply_rewards 
+from core.rng import command_rng
 from systems.crew_sys import maybe_spawn_crew
 from core.quest_progress import update_quest_progress_for_enemy_kill
 from collections import defaultdict
@@ -44,17 +43,18 @@ class Explore(commands.Cog):
 
         # Planet materials multiplier
         planet_id = str(player.get("current_planet", 1))
-        planets_root = load_json(PLANETS_FILE) or {}
+        planets_root = gamedata.planets() or {}
         planets_data = planets_root.get("planets") if isinstance(planets_root.get("planets"), dict) else planets_root
         planet_data = planets_data.get(planet_id, {}) if isinstance(planets_data, dict) else {}
         materials_mult = float(planet_data.get("materials_mult", 1))
 
-        enemy_key, enemy = choose_random_enemy(player, category="elite")
+        rng = command_rng(ctx)
+        enemy_key, enemy = choose_random_enemy(player, category="elite", rng=rng)
         if not enemy:
             await ctx.send(f"{ctx.author.mention}, there are no elite enemies here.")
             return
 
-        combat_result = simulate_combat(player, enemy, fight_type="explore")
+        combat_result = simulate_combat(player, enemy, fight_type="explore", rng=rng)
 
         embed = discord.Embed(
             title=f"Exploration Encounter - {enemy['name']}",
@@ -66,8 +66,8 @@ class Explore(commands.Cog):
             player["health"] = combat_result["player_hp_left"]
 
             # Base rewards (let core.rewards stack multipliers)
-            base_scrap = random.randint(50, 100)
-            base_xp = random.randint(80, 150)
+            base_scrap = rng.randint(*BASE_FIGHT_REWARDS["explore"]["scrap"])
+            base_xp = rng.randint(*BASE_FIGHT_REWARDS["explore"]["xp"])
 
             res = apply_rewards(
                 player,
@@ -3,8 +3,8 @@ from discord.ext import commands
 from core.decorators import requires_profile
 from core.utils import get_max_health
 from core.players import save_profile
-from core.constants import ITEMS_FILE
-from core.shared import load_json
+from core import gamedata
+from core.items import get_item_index
 from core.guards import require_no_lock
 
 
@@ -22,19 +22,12 @@ class Heal(commands.Cog):
         """
         player = ctx.player
         inventory = player.get("inventory", {})
-        items = load_json(ITEMS_FILE)
+        items = gamedata.items()
 
-        # Try to find the medkit by name or ID
-        medkit_id = None
-        medkit_item = None
-        for category, entries in items.items():
-            for item_id, item in entries.items():
-                if item.get("name", "").lower() == "medkit":
-                    medkit_id = item_id
-                    medkit_item = item
-                    break
-            if medkit_id:
-                break
+        # Find the medkit by name
+        index = get_item_index(items)
+        medkit_id = index.id_for_name("medkit")
+        medkit_item = index.get(medkit_id) if medkit_id else None
 
         if not medkit_id or medkit_id not in inventory or inventory[medkit_id] <= 0:
             await ctx.send(f"{ctx.author.mention}, you don’t have any Medkits to use!")
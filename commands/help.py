@@ -1,14 +1,12 @@
+import re
+from bisect import bisect_left
 import discord
 from discord.ext import commands
-from typing import List, Dict, Any
-from core.shared import load_json
+from typing import List, Dict, Any, Tuple
+from core import gamedata
+from core.constants import ITEMS_FILE, SHOP_FILE, CREDITSHOP_FILE
 from core.decorators import requires_profile
 from core.guards import require_no_lock
-from core.constants import ITEMS_FILE, SHOP_FILE
-try:
-    from core.constants import CREDITSHOP_FILE
-except ImportError:
-    CREDITSHOP_FILE = "data/creditshop.json"
 
 MECHANICS: Dict[str, Dict[str, Any]] = {
     "sector": {
@@ -71,9 +69,9 @@ MECHANICS: Dict[str, Dict[str, Any]] = {
     },
 }
 
-def _collect_commands(ctx: commands.Context) -> List[Dict[str, Any]]:
+def _collect_commands(bot: commands.Bot) -> List[Dict[str, Any]]:
     entries = []
-    for cmd in ctx.bot.commands:
+    for cmd in bot.commands:
         if cmd.hidden:
             continue
         name = cmd.name
@@ -91,7 +89,7 @@ def _collect_commands(ctx: commands.Context) -> List[Dict[str, Any]]:
     return entries
 
 def _collect_items() -> List[Dict[str, Any]]:
-    data = load_json(ITEMS_FILE) or {}
+    data = gamedata.items() or {}
     entries = []
     for category, items in (data.items() if isinstance(data, dict) else []):
         if not isinstance(items, dict): 
@@ -111,7 +109,7 @@ def _collect_items() -> List[Dict[str, Any]]:
     return entries
 
 def _collect_shop() -> List[Dict[str, Any]]:
-    shop = load_json(SHOP_FILE) or {}
+    shop = gamedata.shop() or {}
     entries = []
     for category, items in (shop.items() if isinstance(shop, dict) else []):
         if not isinstance(items, dict):
@@ -130,7 +128,7 @@ def _collect_shop() -> List[Dict[str, Any]]:
     return entries
 
 def _collect_creditshop() -> List[Dict[str, Any]]:
-    cs = load_json(CREDITSHOP_FILE) or {}
+    cs = gamedata.creditshop() or {}
     items = cs.get("items", {}) if isinstance(cs, dict) else {}
     entries = []
     for iid, entry in (items.items() if isinstance(items, dict) else []):
@@ -159,27 +157,118 @@ def _collect_mechanics() -> List[Dict[str, Any]]:
         })
     return entries
 
-def _search(entries: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
-    q = query.lower().strip()
-    def score(e):
-        name = e["key"]
-        aliases = e.get("aliases", [])
-        if q == name or q in aliases:
-            return 0  # best
-        if q in name:
-            return 1
-        for a in aliases:
-            if q in a:
-                return 2
-        if q in e.get("desc", "").lower():
-            return 3
-        return 4
-    results = sorted(entries, key=score)
-    return [r for r in results if score(r) < 4]
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Field ranks (lower is better); an exact key/alias match of the whole query ranks 0
+_RANK_NAME, _RANK_ALIAS, _RANK_DESC = 1, 2, 3
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(str(text or "").lower())
+
+
+class HelpIndex:
+    """
+    Token-level inverted index over the help corpus:
+    - exact:    whole key/alias -> entry ids
+    - postings: token -> {entry id: best field rank}
+    - vocab:    sorted tokens, so a query token also matches longer tokens it prefixes
+    A query touches only the postings of its tokens, never the whole corpus.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.entries = entries
+        self.exact: Dict[str, List[int]] = {}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        for eid, e in enumerate(entries):
+            for term in [e["key"]] + list(e.get("aliases", [])):
+                ids = self.exact.setdefault(term.strip(), [])
+                if eid not in ids:
+                    ids.append(eid)
+            fields = (
+                (_RANK_NAME, [e["key"], e.get("name", "")]),
+                (_RANK_ALIAS, e.get("aliases", [])),
+                (_RANK_DESC, [e.get("desc", "")]),
+            )
+            for rank, texts in fields:
+                for text in texts:
+                    for tok in _tokens(text):
+                        hits = self.postings.setdefault(tok, {})
+                        if hits.get(eid, rank + 1) > rank:
+                            hits[eid] = rank
+        self.vocab: List[str] = sorted(self.postings)
+
+    def _matches(self, token: str) -> Dict[int, Tuple[int, int]]:
+        """entry id -> (best rank, 0 if the token matched exactly else 1) for one query token."""
+        out: Dict[int, Tuple[int, int]] = {}
+        i = bisect_left(self.vocab, token)
+        while i < len(self.vocab) and self.vocab[i].startswith(token):
+            v = self.vocab[i]
+            partial = 0 if v == token else 1
+            for eid, rank in self.postings[v].items():
+                cur = out.get(eid)
+                if cur is None or (rank, partial) < cur:
+                    out[eid] = (rank, partial)
+            i += 1
+        return out
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        q = query.lower().strip()
+        scores: Dict[int, Tuple[int, int]] = {eid: (0, 0) for eid in self.exact.get(q, ())}
+
+        toks = _tokens(q)
+        if toks:
+            # AND across query tokens, rarest first so the candidate set shrinks fast
+            per_token = sorted((self._matches(t) for t in toks), key=len)
+            combined = {eid: (rank, partial) for eid, (rank, partial) in per_token[0].items()}
+            for m in per_token[1:]:
+                combined = {
+                    eid: (max(r, m[eid][0]), p + m[eid][1])
+                    for eid, (r, p) in combined.items() if eid in m
+                }
+            for eid, sc in combined.items():
+                if eid not in scores:
+                    scores[eid] = sc
+
+        ranked = sorted(scores.items(), key=lambda kv: (kv[1], kv[0]))
+        return [self.entries[eid] for eid, _ in ranked]
+
+
+def _build_index(bot) -> HelpIndex:
+    entries: List[Dict[str, Any]] = []
+    entries += _collect_commands(bot)
+    entries += _collect_items()
+    entries += _collect_shop()
+    entries += _collect_creditshop()
+    entries += _collect_mechanics()
+    return HelpIndex(entries)
+
+
+def _corpus_signature(bot) -> tuple:
+    """Changes whenever a cog adds/removes commands or a backing data file is reloaded."""
+    return (
+        len(bot.all_commands),
+        gamedata.version(ITEMS_FILE),
+        gamedata.version(SHOP_FILE),
+        gamedata.version(CREDITSHOP_FILE),
+    )
 
 class Help(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self._index: HelpIndex | None = None
+        self._signature: tuple | None = None
+
+    async def cog_load(self):
+        self._refresh_index()
+
+    def _refresh_index(self) -> HelpIndex:
+        """Rebuild the help corpus only when commands or data files changed since the last build."""
+        sig = _corpus_signature(self.bot)
+        if self._index is None or sig != self._signature:
+            self._index = _build_index(self.bot)
+            self._signature = sig
+        return self._index
 
     @commands.command(name="help", aliases=["info"])
     @require_no_lock()
@@ -201,14 +290,7 @@ class Help(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        entries: List[Dict[str, Any]] = []
-        entries += _collect_commands(ctx)
-        entries += _collect_items()
-        entries += _collect_shop()
-        entries += _collect_creditshop()
-        entries += _collect_mechanics()
-
-        results = _search(entries, query)
+        results = self._refresh_index().search(query)
         if not results:
             await ctx.send(f"No info found for `{query}`.")
             return
@@ -5,7 +5,7 @@ import discord
 from discord.ext import commands
 from core.decorators import requires_profile
 from core.guards import require_no_lock
-from core.players import load_profile, save_profile
+from core.players import profiles_txn
 from core.quest_progress import update_quest_progress_for_gambling
 from core.skills_hooks import award_player_skill
 
@@ -57,7 +57,9 @@ class Race(commands.Cog):
         self.active_channels = set()  # prevent concurrent races per channel
 
     @commands.command(name="race", help="Start an animated horse race with betting.")
-    @requires_profile()
+    # The lobby + race run for a minute or more: don't hold the starter's profile lock
+    # for all of it. Every Scrap change below commits through a profiles_txn.
+    @requires_profile(auto_save=False, txn=False)
     @require_no_lock()
     async def race(self, ctx):
         # Prevent concurrent race in the same channel
@@ -153,17 +155,19 @@ class Race(commands.Cog):
                 await ctx.send("No bets placed. Running an exhibition race for fun.")
             locked_bets = {}  # user_id -> {"horse": idx, "amount": locked_amount, "name": str}
             pool = 0
-            for uid, entry in list(bets.items()):
-                profile = load_profile(str(uid)) or {}
-                have = int(profile.get("Scrap", 0) or 0)
-                bet_amt = min(entry["amount"], have)
-                if bet_amt <= 0:
-                    continue
-                # Deduct and save immediately
-                profile["Scrap"] = have - bet_amt
-                save_profile(str(uid), profile)
-                locked_bets[uid] = {"horse": entry["horse"], "amount": bet_amt, "name": entry["name"]}
-                pool += bet_amt
+            # Deduct every bet in one transaction; all deductions commit together
+            async with profiles_txn(bets.keys()) as profiles:
+                for uid, entry in list(bets.items()):
+                    profile = profiles.get(uid)
+                    if not profile:
+                        continue
+                    have = int(profile.get("Scrap", 0) or 0)
+                    bet_amt = min(entry["amount"], have)
+                    if bet_amt <= 0:
+                        continue
+                    profile["Scrap"] = have - bet_amt
+                    locked_bets[uid] = {"horse": entry["horse"], "amount": bet_amt, "name": entry["name"]}
+                    pool += bet_amt
 
             if pool <= 0:
                 await ctx.send("⚠️ All bets were invalid or had insufficient Scrap. Running an exhibition race.")
@@ -202,26 +206,27 @@ class Race(commands.Cog):
                     payout_pool = int(pool * (1.0 - HOUSE_RAKE))
                     lines = [f"🏦 Pool: {pool:,} Scrap | Rake: {int(HOUSE_RAKE*100)}% | Payout: {payout_pool:,} Scrap"]
                     # Payout proportionally; all winning bettors get flat Gambler XP
-                    for uid, b in locked_bets.items():
-                        if b["horse"] not in winners:
-                            continue
-                        share = b["amount"] / winners_total
-                        payout = int(round(payout_pool * share))
-                        profile = load_profile(str(uid)) or {}
-                        before = int(profile.get("Scrap", 0) or 0)
-                        profile["Scrap"] = before + payout
-
-                        # Quest progress (net positive only)
-                        net = payout - b["amount"]
-                        if net > 0:
-                            update_quest_progress_for_gambling(profile, net)
-
-                        # NEW: Gambler XP (flat +25 per winning bettor)
-                        award_player_skill(profile, "gambler", 25)
-                        save_profile(str(uid), profile)
-
-                        hname = horses[b["horse"]]["name"]
-                        lines.append(f"• {b['name']}: +{payout:,} Scrap (bet {b['amount']:,} on {hname}) • 🎲 Gambler +25 XP")
+                    winning = {uid: b for uid, b in locked_bets.items() if b["horse"] in winners}
+                    async with profiles_txn(winning.keys()) as profiles:
+                        for uid, b in winning.items():
+                            share = b["amount"] / winners_total
+                            payout = int(round(payout_pool * share))
+                            profile = profiles.get(uid)
+                            if profile is None:
+                                continue
+                            before = int(profile.get("Scrap", 0) or 0)
+                            profile["Scrap"] = before + payout
+
+                            # Quest progress (net positive only)
+                            net = payout - b["amount"]
+                            if net > 0:
+                                update_quest_progress_for_gambling(profile, net)
+
+                            # NEW: Gambler XP (flat +25 per winning bettor)
+                            award_player_skill(profile, "gambler", 25)
+
+                            hname = horses[b["horse"]]["name"]
+                            lines.append(f"• {b['name']}: +{payout:,} Scrap (bet {b['amount']:,} on {hname}) • 🎲 Gambler +25 XP")
 
                     await ctx.send("\n".join(lines))
 
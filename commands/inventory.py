@@ -1,8 +1,8 @@
 import discord
 from discord.ext import commands
 from core.decorators import requires_profile
-from core.constants import ITEMS_FILE, SUPPLY_CRATE_TIERS
-from core.shared import load_json
+from core.constants import SUPPLY_CRATE_TIERS
+from core import gamedata
 from core.guards import require_no_lock
 from core.players import load_profile
 from core.emoji_helper import get_item_emoji
@@ -75,7 +75,7 @@ class Inventory(commands.Cog):
                 await ctx.send(f"{target_user.mention} has an empty inventory.")
             return
 
-        items = load_json(ITEMS_FILE) or {}
+        items = gamedata.items() or {}
         mats = items.get("materials", {}) or {}
         drops = items.get("drops", {}) or {}
 
@@ -3,7 +3,7 @@ import discord
 from discord.ext import commands
 from core.decorators import requires_profile
 from core.guards import require_no_lock, set_lock, clear_lock
-from core.players import load_profile, save_profile, get_scrap, set_scrap
+from core.players import profile_txn, get_scrap, set_scrap
 from core.utils import parse_float_amount
 from systems.commodities import get_quote
 
@@ -41,52 +41,47 @@ class Market(commands.Cog):
                 await ctx.send("Market price unavailable.")
                 return
 
-            # Preview using a snapshot
-            snap = load_profile(uid) or {}
-            scrap_snap = get_scrap(snap)
-            if scrap_snap <= 0:
-                await ctx.send("You have no Scrap.")
-                return
-
-            # Calculate max affordable units for validation
-            max_units = scrap_snap / (price * (1.0 + FEE_RATE))
-            units = parse_float_amount(amount, max_units)
-            
-            if units <= 0:
-                await ctx.send("Amount must be positive. Use a number, 'all', 'half', or suffixes like '1.5m', '500k'.")
-                return
+            async with profile_txn(uid) as prof:
+                prof = prof if prof is not None else {}
+                have = get_scrap(prof)
+                if have <= 0:
+                    await ctx.send("You have no Scrap.")
+                    return
 
-            gross = units * price
-            fee = gross * FEE_RATE
-            total_cost = math.ceil(gross + fee)
+                # Calculate max affordable units for validation
+                max_units = have / (price * (1.0 + FEE_RATE))
+                units = parse_float_amount(amount, max_units)
 
-            # Commit on a fresh profile (to avoid stale overwrite)
-            prof = load_profile(uid) or {}
-            port = _ensure_portfolio(prof)
-            have = get_scrap(prof)
+                if units <= 0:
+                    await ctx.send("Amount must be positive. Use a number, 'all', 'half', or suffixes like '1.5m', '500k'.")
+                    return
 
-            # Clamp to current funds at commit time
-            if total_cost > have:
-                units = (have) / (price * (1.0 + FEE_RATE))
-                units = max(0.0, round(units, 4))
                 gross = units * price
                 fee = gross * FEE_RATE
                 total_cost = math.ceil(gross + fee)
-                if units <= 0:
-                    await ctx.send("Insufficient Scrap.")
-                    return
-
-            set_scrap(prof, have - total_cost)
 
-            pos = port["positions"].get(base) or {"units": 0.0, "avg_cost": 0.0}
-            new_units = pos["units"] + units
-            if new_units > 0:
-                pos["avg_cost"] = round(((pos["units"] * pos["avg_cost"]) + gross) / new_units, 4)
-            pos["units"] = round(new_units, 4)
-            port["positions"][base] = pos
-            prof["commodities"] = port
+                # Rounding up the fee can push 'all' just past the wallet; clamp
+                if total_cost > have:
+                    units = (have) / (price * (1.0 + FEE_RATE))
+                    units = max(0.0, round(units, 4))
+                    gross = units * price
+                    fee = gross * FEE_RATE
+                    total_cost = math.ceil(gross + fee)
+                    if units <= 0:
+                        await ctx.send("Insufficient Scrap.")
+                        return
+
+                port = _ensure_portfolio(prof)
+                set_scrap(prof, have - total_cost)
+
+                pos = port["positions"].get(base) or {"units": 0.0, "avg_cost": 0.0}
+                new_units = pos["units"] + units
+                if new_units > 0:
+                    pos["avg_cost"] = round(((pos["units"] * pos["avg_cost"]) + gross) / new_units, 4)
+                pos["units"] = round(new_units, 4)
+                port["positions"][base] = pos
+                prof["commodities"] = port
 
-            save_profile(uid, prof)
             await ctx.send(f"✅ Bought {units:.4f} {base} @ {price:.2f} (fee {fee:.0f}). New position: {pos['units']:.4f}")
         finally:
             clear_lock(uid)
@@ -111,42 +106,41 @@ class Market(commands.Cog):
                 await ctx.send("Market price unavailable.")
                 return
 
-            # Commit on fresh profile
-            prof = load_profile(uid) or {}
-            port = _ensure_portfolio(prof)
-            pos = port["positions"].get(base) or {"units": 0.0, "avg_cost": 0.0}
-            held = float(pos.get("units", 0.0))
-            if held <= 0:
-                await ctx.send(f"You hold no {base}.")
-                return
+            async with profile_txn(uid) as prof:
+                prof = prof if prof is not None else {}
+                port = _ensure_portfolio(prof)
+                pos = port["positions"].get(base) or {"units": 0.0, "avg_cost": 0.0}
+                held = float(pos.get("units", 0.0))
+                if held <= 0:
+                    await ctx.send(f"You hold no {base}.")
+                    return
 
-            units = parse_float_amount(amount, held)
-            
-            if units <= 0:
-                await ctx.send("Amount must be positive. Use a number, 'all', 'half', or suffixes like '1.5m', '500k'.")
-                return
+                units = parse_float_amount(amount, held)
 
-            gross = units * price
-            fee = gross * FEE_RATE
-            proceeds = math.floor(gross - fee)
+                if units <= 0:
+                    await ctx.send("Amount must be positive. Use a number, 'all', 'half', or suffixes like '1.5m', '500k'.")
+                    return
+
+                gross = units * price
+                fee = gross * FEE_RATE
+                proceeds = math.floor(gross - fee)
 
-            avg_cost = float(pos.get("avg_cost", 0.0))
-            cost_basis = units * avg_cost
-            realized = gross - fee - cost_basis
+                avg_cost = float(pos.get("avg_cost", 0.0))
+                cost_basis = units * avg_cost
+                realized = gross - fee - cost_basis
 
-            # Update position
-            pos["units"] = round(held - units, 4)
-            if pos["units"] <= 0:
-                pos["units"] = 0.0
-                pos["avg_cost"] = 0.0
-            port["positions"][base] = pos
-            port["realized_pnl"] = round(float(port.get("realized_pnl", 0.0)) + float(realized), 2)
-            prof["commodities"] = port
+                # Update position
+                pos["units"] = round(held - units, 4)
+                if pos["units"] <= 0:
+                    pos["units"] = 0.0
+                    pos["avg_cost"] = 0.0
+                port["positions"][base] = pos
+                port["realized_pnl"] = round(float(port.get("realized_pnl", 0.0)) + float(realized), 2)
+                prof["commodities"] = port
 
-            # Credit scrap
-            set_scrap(prof, get_scrap(prof) + proceeds)
+                # Credit scrap
+                set_scrap(prof, get_scrap(prof) + proceeds)
 
-            save_profile(uid, prof)
             sign = "profit" if realized >= 0 else "loss"
             await ctx.send(f"✅ Sold {units:.4f} {base} @ {price:.2f} (fee {fee:.0f}). Proceeds {proceeds:,}. Realized {sign}: {realized:+.0f}. Remaining: {pos['units']:.4f}")
         finally:
@@ -155,8 +149,8 @@ class Market(commands.Cog):
     @commands.command(name="mportfolio", aliases=["mpositions"])
     @requires_profile()
     async def mportfolio(self, ctx):
-        prof = load_profile(str(ctx.author.id)) or {}
-        port = (prof.get("commodities") or {})
+        async with profile_txn(ctx.author.id, commit=False) as prof:
+            port = ((prof or {}).get("commodities") or {})
         positions = (port.get("positions") or {})
         if not positions:
             await ctx.send("You have no commodity positions. Use !mbuy to get started.")
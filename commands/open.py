@@ -2,12 +2,12 @@
 import discord
 from discord.ext import commands
 
-from core.shared import load_json
-from core.constants import ITEMS_FILE
+from core import gamedata
 from core.items import get_item_by_id
 from core.guards import require_no_lock, set_lock, clear_lock
-from core.players import load_profile, save_profile
-from systems.supply_crates import generate_supply_crate_rewards, has_valid_supply_crate_config
+from core.players import profile_txn
+from systems.supply_crates import open_supply_crates, has_valid_supply_crate_config
+from core.rng import command_rng
 # NEW: Boxer XP award without needing ctx.player
 from core.skills_hooks import award_player_skill
 from core.emoji_helper import get_item_emoji
@@ -64,7 +64,7 @@ def _candidate_supply_crate_ids(items_data: dict, tier_key: str) -> list[tuple[s
             if isinstance(meta, dict) and str(meta.get("tier", "")).lower() == tier_key:
                 cands.append((str(iid), str(meta.get("name") or f"{tier_key.title()} Supply Crate")))
     try:
-        shop = load_json(SHOP_FILE) or {}
+        shop = gamedata.shop() or {}
         crate = (shop.get("supply_crate") or {})
         entry = crate.get(tier_key) or {}
         sid = entry.get("item_id")
@@ -124,7 +124,7 @@ class OpenCommand(commands.Cog):
     @commands.command(name="open")
     @require_no_lock()
     async def open_lootbox(self, ctx, tier: str, amount: str = "1"):
-        items_data = load_json(ITEMS_FILE) or {}
+        items_data = gamedata.items() or {}
 
         tier_key = TIER_MAP.get(str(tier).lower().strip())
         if not tier_key:
@@ -137,77 +137,68 @@ class OpenCommand(commands.Cog):
         uid = str(ctx.author.id)
         set_lock(uid, lock_type="supply_crate_open", allowed=set(), note=f"open {tier_key}")
         try:
-            prof = load_profile(uid) or {}
-            inv = _get_inv(prof)
-
-            crate_id, crate_name = _resolve_supply_crate_id_in_inventory(items_data, inv, tier_key)
-            owned = int(inv.get(crate_id, 0) or 0)
-            if owned <= 0:
-                await ctx.send(f"{ctx.author.mention}, you don't have any {crate_name}s to open!")
-                return
-
-            amt = str(amount).strip().lower()
-            if amt == "all":
-                to_open = owned
-            elif amt == "half":
-                to_open = max(1, owned // 2)
-            else:
-                try:
-                    to_open = int(amt)
-                except ValueError:
-                    await ctx.send("Invalid amount! Use a number, 'all', or 'half'.")
+            # One load, one commit; serialized against the user's other commands
+            async with profile_txn(uid) as prof:
+                if not prof:
+                    await ctx.send(f"{ctx.author.mention}, you don't have a profile yet. Use `!start` first.")
                     return
-                to_open = max(1, min(to_open, owned))
-
-            # Collect rewards
-            aggregated: dict[str, int] = {}
-            for _ in range(to_open):
-                rewards = generate_supply_crate_rewards(prof, tier_key, items_data)
-                for item_id, qty in rewards.items():
-                    sid = str(item_id)
-                    aggregated[sid] = aggregated.get(sid, 0) + int(qty)
-
-            if not aggregated:
-                await ctx.send(f"{ctx.author.mention} No items were generated. Your {crate_name}(x{to_open}) was not consumed.")
-                return
-
-            # Split out premium currency
-            credit_keys = {"credit", "credits"}
-            credits_gained = 0
-            for k in list(aggregated.keys()):
-                if k.lower() in credit_keys:
-                    credits_gained += int(aggregated.pop(k) or 0)
-
-            # Single delta: consume crates, add drops
-            delta: dict[str, int] = {crate_id: -to_open}
-            for iid, q in aggregated.items():
-                delta[iid] = delta.get(iid, 0) + q
-
-            # Apply on latest and persist
-            latest = load_profile(uid) or {}
-            inv_latest = _get_inv(latest)
-            _apply_delta(inv_latest, delta)
-
-            # Enforce exact consumption
-            expected_final = max(0, owned - to_open)
-            if expected_final > 0:
-                inv_latest[crate_id] = expected_final
-            else:
-                inv_latest.pop(crate_id, None)
-
-            # Apply credits to profile (not inventory)
-            if credits_gained > 0:
-                latest["Credits"] = int(latest.get("Credits", 0) or 0) + credits_gained
+                inv = _get_inv(prof)
 
-            latest["inventory"] = inv_latest
+                crate_id, crate_name = _resolve_supply_crate_id_in_inventory(items_data, inv, tier_key)
+                owned = int(inv.get(crate_id, 0) or 0)
+                if owned <= 0:
+                    await ctx.send(f"{ctx.author.mention}, you don't have any {crate_name}s to open!")
+                    return
 
-            # NEW: Award Boxer XP (per crate × crates opened)
-            boxer_xp_each = int(BOXER_XP_PER_CRATE.get(tier_key, 0))
-            boxer_xp_total = boxer_xp_each * to_open
-            if boxer_xp_total > 0:
-                award_player_skill(latest, "boxer", boxer_xp_total)
+                amt = str(amount).strip().lower()
+                if amt == "all":
+                    to_open = owned
+                elif amt == "half":
+                    to_open = max(1, owned // 2)
+                else:
+                    try:
+                        to_open = int(amt)
+                    except ValueError:
+                        await ctx.send("Invalid amount! Use a number, 'all', or 'half'.")
+                        return
+                    to_open = max(1, min(to_open, owned))
+
+                # Collect rewards (aggregate draw; same distribution as opening one by one)
+                aggregated = open_supply_crates(prof, tier_key, to_open, items_data, rng=command_rng(ctx))
+
+                if not aggregated:
+                    await ctx.send(f"{ctx.author.mention} No items were generated. Your {crate_name}(x{to_open}) was not consumed.")
+                    return
 
-            save_profile(uid, latest)
+                # Split out premium currency
+                credit_keys = {"credit", "credits"}
+                credits_gained = 0
+                for k in list(aggregated.keys()):
+                    if k.lower() in credit_keys:
+                        credits_gained += int(aggregated.pop(k) or 0)
+
+                # Single delta: consume crates, add drops
+                delta: dict[str, int] = {crate_id: -to_open}
+                for iid, q in aggregated.items():
+                    delta[iid] = delta.get(iid, 0) + q
+                _apply_delta(inv, delta)
+
+                # Enforce exact consumption
+                expected_final = max(0, owned - to_open)
+                if expected_final > 0:
+                    inv[crate_id] = expected_final
+                else:
+                    inv.pop(crate_id, None)
+
+                # Apply credits to profile (not inventory)
+                if credits_gained > 0:
+                    prof["Credits"] = int(prof.get("Credits", 0) or 0) + credits_gained
+
+                # NEW: Award Boxer XP (per crate × crates opened)
+                boxer_xp_each = int(BOXER_XP_PER_CRATE.get(tier_key, 0))
+                boxer_xp_total = boxer_xp_each * to_open
+                if boxer_xp_total > 0:
+                    award_player_skill(prof, "boxer", boxer_xp_total)
 
             # Build result embed
             lines = []
@@ -1,9 +1,9 @@
 import discord
 from discord.ext import commands
 from core.decorators import requires_profile
-from core.shared import load_json
+from core import gamedata
+from core.enemies import get_enemy_tables
 from core.guards import require_no_lock
-from core.constants import PLANETS_FILE, ENEMIES_FILE
 
 
 class PlanetCommand(commands.Cog):
@@ -18,12 +18,12 @@ class PlanetCommand(commands.Cog):
         player = ctx.player
         planet_id = str(player.get("current_planet", 1))
 
-        planets_data = load_json(PLANETS_FILE)
+        planets_data = gamedata.planets()
         planet = planets_data.get(planet_id)
 
-        enemies_data = load_json(ENEMIES_FILE).get(f"P{planet_id}E", {})
-        basic_enemies = [e["name"] for e in enemies_data.values() if e.get("category") == "basic"]
-        elite_enemies = [e["name"] for e in enemies_data.values() if e.get("category") == "elite"]
+        tables = get_enemy_tables()
+        basic_enemies = [e["name"] for _, e in tables.pool(planet_id, "basic")]
+        elite_enemies = [e["name"] for _, e in tables.pool(planet_id, "elite")]
 
 
         if not planet:
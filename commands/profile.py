@@ -4,8 +4,7 @@ from core.bank import ensure_bank
 from core.decorators import requires_profile
 from core.players import calculate_combat_stats, load_profile  # added load_profile
 from core.utils import get_max_health, get_max_oxygen, make_progress_bar
-from core.shared import load_json
-from core.constants import PLANETS_FILE, ITEMS_FILE
+from core import gamedata
 from core.items import get_item_by_id
 from core.guards import require_no_lock
 from core.bank import ensure_bank, compute_bank_boost_percent
@@ -38,8 +37,8 @@ class Profile(commands.Cog):
         enhancements = player.get("enhancements", {}) or {}
 
         # Load items and planets JSON
-        items = load_json(ITEMS_FILE) or {}
-        planets_root = load_json(PLANETS_FILE) or {}
+        items = gamedata.items() or {}
+        planets_root = gamedata.planets() or {}
         planets = planets_root.get("planets", planets_root) if isinstance(planets_root, dict) else {}
 
         # Fetch equipped item details
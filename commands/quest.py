@@ -3,11 +3,12 @@ from datetime import timedelta  # NEW
 from discord.ext import commands
 from core.decorators import requires_profile
 from core.cooldowns import get_cooldown, set_cooldown 
-from core.shared import load_json, save_json
-from core.constants import ENEMIES_FILE, ITEMS_FILE, PLANETS_FILE
+from core.shared import save_json
+from core import gamedata
+from core.enemies import get_enemy_tables
 from core.players import save_profile
 from core.utils import get_max_health, get_max_oxygen, add_xp  
-from core.guards import require_no_lock
+from core.guards import require_no_lock, set_lock, clear_lock
 from core.items import get_item_by_id
 from core.quest_progress import update_quest_progress_for_materials 
 from core.rewards import apply_rewards 
@@ -95,27 +96,11 @@ class Quest(commands.Cog):
         If 'category' is provided, restrict to that category (e.g., 'basic' or 'elite').
         Returns (enemy_key, enemy_display_name) or (None, None) if no match in this planet.
         """
-        if not isinstance(enemies, dict) or not enemies:
-            return None, None
-
         pid = max(1, int(planet_id or 1))
-        section = enemies.get(f"P{pid}E") or enemies.get(f"P{pid}")
-        if not isinstance(section, dict):
+        enemy_id, meta = get_enemy_tables(enemies).pick(pid, category)
+        if not meta:
             return None, None
-
-        # Build pool filtered by category if provided
-        pool = []
-        for eid, meta in section.items():
-            if not isinstance(meta, dict):
-                continue
-            if category and str(meta.get("category", "")).lower() != category.lower():
-                continue
-            pool.append((str(eid), str(meta.get("name") or eid)))
-
-        if not pool:
-            return None, None
-
-        return random.choice(pool)
+        return enemy_id, str(meta.get("name") or enemy_id)
 
 
     def _choose_quest_type(self) -> str:
@@ -376,8 +361,8 @@ class Quest(commands.Cog):
         now = int(time.time())
 
         # Load files
-        enemies = load_json(ENEMIES_FILE)
-        items = load_json(ITEMS_FILE)
+        enemies = gamedata.enemies()
+        items = gamedata.items()
         planet_id = player.get("max_unlocked_planet", 1)
         quest = player.get("active_quest", None)
 
@@ -419,7 +404,7 @@ class Quest(commands.Cog):
                 f"⭐ XP: **{int(applied.get('xp', 0)):,}**",
             ]
             if lootbox_id and lootbox_qty > 0:
-                items = load_json(ITEMS_FILE) or {}
+                items = gamedata.items() or {}
                 lb_name = items.get("lootboxes", {}).get(str(lootbox_id), {}).get("name", "Lootbox")
                 lines.append(f"🎁 Lootbox: **{lootbox_qty}x {lb_name}**")
 
@@ -506,11 +491,15 @@ class Quest(commands.Cog):
         def check(m):
             return m.author.id == ctx.author.id and m.channel.id == ctx.channel.id and m.content.lower() in ("yes", "no")
 
+        # Lock during prompt (the profile transaction is held until it ends)
+        set_lock(str(ctx.author.id), lock_type="quest_offer", allowed=set(), note="Quest offer (reply yes or no)")
         try:
             msg = await self.bot.wait_for("message", check=check, timeout=15)
             answer = msg.content.lower()
         except asyncio.TimeoutError:
             answer = "no"
+        finally:
+            clear_lock(str(ctx.author.id))
 
         if answer == "yes":
             # Accept quest: set active and apply full cooldown
@@ -2,8 +2,7 @@
 import discord
 from discord.ext import commands
 from discord.ui import View, Button 
-from core.shared import load_json
-from core.constants import CRAFTING_FILE
+from core import gamedata
 from core.guards import require_no_lock
 from core.items import load_items, resolve_item_by_name_or_alias
 
@@ -107,7 +106,7 @@ class Recipes(commands.Cog):
     @commands.command(name="recipes", aliases=["rcp", "recipe", "rec"])
     @require_no_lock()
     async def recipes(self, ctx, category: str = None):
-        crafting_data = load_json(CRAFTING_FILE)
+        crafting_data = gamedata.crafting()
         recipes_dict = crafting_data.get("recipes", {})
         items_data = load_items()  # NEW
 
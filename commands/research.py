@@ -4,9 +4,9 @@ import random
 import asyncio
 from typing import Tuple, Optional, List, Dict
 from core.decorators import requires_profile, requires_oxygen
-from core.shared import load_json
+from core import gamedata
+from core.enemies import get_enemy_tables
 from core.players import save_profile
-from core.constants import PLANETS_FILE, RESEARCH_FILE, ENEMIES_FILE, ITEMS_FILE  # CHANGED
 from core.cooldowns import command_cooldowns, check_and_set_cooldown
 from core.guards import set_lock, clear_lock, require_no_lock
 from core.rewards import apply_rewards
@@ -43,63 +43,8 @@ def _get_ship_type(player: dict) -> Optional[str]:
     t = (ship.get("type") or "").strip().lower()
     return t if t else None
 
-def _enemies_for_planet(enemies_data: dict, planet_id: int) -> List[dict]:
-    if not isinstance(enemies_data, dict):
-        return []
-    # Support shape A: { "1": [ {...}, ... ], "2": [ ... ] }
-    if str(planet_id) in enemies_data and isinstance(enemies_data[str(planet_id)], list):
-        return [e for e in enemies_data[str(planet_id)] if isinstance(e, dict)]
-    # Shape B: flat dict { "enemy_id": { name, planets:[...]/min_planet/max_planet, ... } }
-    present = []
-    for _, e in enemies_data.items():
-        if not isinstance(e, dict):
-            continue
-        ps = e.get("planets")
-        if isinstance(ps, list) and any(int(p) == int(planet_id) for p in ps):
-            present.append(e)
-            continue
-        minp = e.get("min_planet"); maxp = e.get("max_planet")
-        if isinstance(minp, int) or isinstance(maxp, int):
-            lo = int(minp or 1); hi = int(maxp or 999)
-            if lo <= planet_id <= hi:
-                present.append(e)
-    return present
-
-def _enemies_not_on_planet(enemies_data: dict, planet_id: int) -> List[dict]:
-    if not isinstance(enemies_data, dict):
-        return []
-    present_set = set()
-    for e in _enemies_for_planet(enemies_data, planet_id):
-        nm = (e.get("name") or "").lower()
-        if nm:
-            present_set.add(nm)
-    others = []
-    # Collect all distinct enemies not present
-    for _, e in enemies_data.items():
-        if isinstance(e, list):
-            for ee in e:
-                if not isinstance(ee, dict): continue
-                nm = (ee.get("name") or "").lower()
-                if nm and nm not in present_set:
-                    others.append(ee)
-        elif isinstance(e, dict):
-            nm = (e.get("name") or "").lower()
-            if nm and nm not in present_set:
-                others.append(e)
-    # unique by name
-    seen = set(); uniq = []
-    for e in others:
-        nm = (e.get("name") or "").lower()
-        if nm and nm not in seen:
-            seen.add(nm)
-            uniq.append(e)
-    return uniq
-
-def _pick_distractors(all_enemies: List[dict], count: int) -> List[str]:
-    pool = [(e.get("name") or "").strip() for e in all_enemies if isinstance(e, dict) and e.get("name")]
-    pool = [p for p in pool if p]
-    random.shuffle(pool)
-    return pool[:count]
+def _pick_distractors(names: List[str], count: int) -> List[str]:
+    return random.sample(names, min(count, len(names)))
 
 def generate_lab_question(player: dict, items_data: dict) -> Optional[dict]:
     # Pick a random first-tier mat; resolve to id and nice name
@@ -124,13 +69,12 @@ def generate_lab_question(player: dict, items_data: dict) -> Optional[dict]:
 
 def generate_field_question(player: dict, enemies_data: dict) -> Optional[dict]:
     planet_id = int(player.get("current_planet") or player.get("max_unlocked_planet", 1))
-    present = _enemies_for_planet(enemies_data, planet_id)
-    if not present:
+    tables = get_enemy_tables(enemies_data)
+    _, correct_enemy = tables.pick(planet_id)
+    if not correct_enemy:
         return None
-    correct_enemy = random.choice(present)
     correct_name = correct_enemy.get("name", "Unknown")
-    distractor_pool = _enemies_not_on_planet(enemies_data, planet_id)
-    distractor_names = _pick_distractors(distractor_pool, 3)
+    distractor_names = _pick_distractors(tables.names_not_on_planet(planet_id), 3)
     if len(distractor_names) < 3:
         return None
     choices = distractor_names + [correct_name]
@@ -165,8 +109,8 @@ def generate_ship_question(player: dict) -> Optional[dict]:
 
 def generate_dynamic_question(player: dict) -> Tuple[Optional[dict], dict]:
     """Return (question_dict_or_none, context_data)."""
-    items_data = load_json(ITEMS_FILE) or {}
-    enemies_data = load_json(ENEMIES_FILE) or {}
+    items_data = gamedata.items() or {}
+    enemies_data = gamedata.enemies() or {}
     generators = [lambda: generate_lab_question(player, items_data),
                   lambda: generate_field_question(player, enemies_data)]
     # Ship question only if eligible
@@ -195,7 +139,7 @@ class Research(commands.Cog):
 
         # Try dynamic question first; fallback to static pool
         dyn_q, _ctx = generate_dynamic_question(player)
-        data = load_json(RESEARCH_FILE) or {}
+        data = gamedata.research() or {}
         static_pool = data.get("questions", []) or []
 
         if dyn_q:
@@ -312,7 +256,8 @@ class Research(commands.Cog):
         await maybe_spawn_crew(ctx, source="research")
 
     @commands.command(name="cancel", aliases=["rcancel", "researchcancel"])
-    @requires_profile()
+    # Must not wait on the running research command's profile transaction
+    @requires_profile(auto_save=False, txn=False)
     async def research_cancel(self, ctx):
         clear_lock(str(ctx.author.id))
         await ctx.send(f"{ctx.author.mention} canceled their research attempt.")
@@ -1,17 +1,16 @@
-import random
 import discord
 from discord.ext import commands
 from core.decorators import requires_profile, requires_oxygen
-from core.shared import load_json
+from core import gamedata
 from core.players import save_profile
 from core.utils import get_max_health, get_max_oxygen
-from core.constants import PLANETS_FILE
 from core.cooldowns import check_and_set_cooldown
-from systems.combat import choose_random_enemy, simulate_combat 
+from systems.combat import choose_random_enemy, simulate_combat, BASE_FIGHT_REWARDS
 from core.items import load_items, get_item_by_id, get_item_display_name
 from core.guards import require_no_lock
 from systems.ship_sys import derive_ship_effects
 from core.rewards import apply_rewards
+from core.rng import command_rng
 from collections import defaultdict  
 from core.quest_progress import update_quest_progress_for_materials, update_quest_progress_for_enemy_kill
 from systems.crew_sys import maybe_spawn_crew
@@ -43,17 +42,18 @@ class Scan(commands.Cog):
         planet_id = str(player.get("current_planet", 1))
 
         # Load planets config; support both schemas:
-        planets_root = load_json(PLANETS_FILE) or {}
+        planets_root = gamedata.planets() or {}
         planets_data = planets_root.get("planets") if isinstance(planets_root.get("planets"), dict) else planets_root
         planet_data = planets_data.get(planet_id, {}) if isinstance(planets_data, dict) else {}
         materials_mult = float(planet_data.get("materials_mult", 1))  # apply to non-lootbox drops
 
-        enemy_key, enemy = choose_random_enemy(player, category="basic")
+        rng = command_rng(ctx)
+        enemy_key, enemy = choose_random_enemy(player, category="basic", rng=rng)
         if not enemy:
             await ctx.send(f"{ctx.author.mention}, there are no enemies here.")
             return
 
-        combat_result = simulate_combat(player, enemy, fight_type="scan")
+        combat_result = simulate_combat(player, enemy, fight_type="scan", rng=rng)
 
         embed = discord.Embed(
             title=f"Scan Result - {enemy.get('name', enemy_key)}",
@@ -67,8 +67,8 @@ class Scan(commands.Cog):
 
         if combat_result["player_won"]:
             # Base rewards (let core.rewards apply multipliers: planet, ship, bank, etc.)
-            base_scrap = random.randint(5, 25)
-            base_xp = random.randint(10, 30)
+            base_scrap = rng.randint(*BASE_FIGHT_REWARDS["scan"]["scrap"])
+            base_xp = rng.randint(*BASE_FIGHT_REWARDS["scan"]["xp"])
 
             res = apply_rewards(
                 player,
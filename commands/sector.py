@@ -5,6 +5,7 @@ from core.decorators import requires_profile
 from core.players import save_profile
 from core.utils import get_max_health, get_max_oxygen
 from core.sector import ensure_sector, set_sector, format_sector_bonuses
+from core.guards import set_lock, clear_lock
 
 # Persist these Credit Shop items across sector travel
 PERSISTENT_ITEM_IDS = {"ship_token"}  # add more if future credit shop items should persist
@@ -89,11 +90,15 @@ class Sector(commands.Cog):
         def check(m):
             return m.author.id == ctx.author.id and m.channel.id == ctx.channel.id and m.content.lower().strip() in {"yes", "no"}
 
+        # Lock during prompt (the profile transaction is held until it ends)
+        set_lock(str(ctx.author.id), lock_type="sector_travel", allowed=set(), note="Sector travel confirmation (reply yes or no)")
         try:
             msg = await self.bot.wait_for("message", timeout=20.0, check=check)
         except asyncio.TimeoutError:
             await ctx.send("⏳ Sector travel canceled (timeout).")
             return
+        finally:
+            clear_lock(str(ctx.author.id))
 
         if msg.content.lower().strip() != "yes":
             await ctx.send("❎ Sector travel canceled.")
@@ -1,19 +1,14 @@
 from discord.ext import commands
 from core.decorators import requires_profile
-from core.shared import load_json
+from core import gamedata
+from core.items import get_item_index, suggest_item_names
+from core.fuzzy import did_you_mean
 from core.players import save_profile
 from core.guards import require_no_lock
-from core.constants import ITEMS_FILE
 from core.skills_hooks import trader_effects, award_skill, trader_xp_for_item
 
 def find_item_by_query(items_data, query):
-    query = query.lower().strip()
-    for category in items_data:
-        for item_id, item in items_data[category].items():
-            names = [item["name"].lower()] + [a.lower() for a in item.get("aliases", [])]
-            if query in names or query == item_id.lower():
-                return category, item_id, item
-    return None, None, None
+    return get_item_index(items_data).resolve(query, match_id=True)
 
 def _clear_enhancement_if_none_left(player: dict, item_id: str):
     """Remove enhancement entry if the player has no copies left and it's not equipped."""
@@ -90,7 +85,7 @@ class Sell(commands.Cog):
 
         player = ctx.player
         inventory = player.get("inventory", {})
-        items_data = load_json(ITEMS_FILE) or {}
+        items_data = gamedata.items() or {}
         equipped = player.get("equipped", {}) or {}
 
         # Skill: Trader sell multiplier
@@ -163,7 +158,8 @@ class Sell(commands.Cog):
         # Normal item selling path (by name or id)
         category, item_id, item = find_item_by_query(items_data, item_query)
         if not item:
-            await ctx.send(f"{ctx.author.mention}, item `{item_query}` not found.")
+            hint = did_you_mean(suggest_item_names(item_query, items_data, owned=inventory))
+            await ctx.send(f"{ctx.author.mention}, item `{item_query}` not found.{hint}")
             return
 
         if not item.get("sellable", False):
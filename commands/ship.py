@@ -4,13 +4,14 @@ import asyncio  # NEW
 from discord.ext import commands
 from core.decorators import requires_profile
 from core.players import save_profile, load_profile
+from core.guards import set_lock, clear_lock
 import time
 from datetime import timedelta
 from core.cooldowns import check_and_set_cooldown, set_cooldown, get_cooldown, command_cooldowns
 from core.skills_hooks import soldier_effects
 from systems.ship_sys import (
     ensure_ship, grant_starter_ship, has_ship, mk_name, SHIP_TYPES,
-    derive_ship_effects, upgrade_cost_for_next_level,
+    derive_ship_effects, upgrade_cost_for_next_level, upgrade_cost_table, upgrade_cost_between, max_affordable_level,
     can_tier, roll_tier_up, max_attempts_for_tier, MAX_TIER, MAX_LEVEL,
 )
 
@@ -23,7 +24,7 @@ class Ship(commands.Cog):
     async def ship(self, ctx, subcmd: str = None, *, rest: str = ""):
         """
         !ship → show your ship
-        !ship upgrade → level up (costs Scrap)
+        !ship upgrade [n|max] → level up once, n times, or as far as your Scrap allows (costs Scrap)
         !ship refit [solo|@ally] → attempt tier-up (solo has lower success). At MK10, refit rerolls type only.
         """
         player = ctx.player
@@ -34,13 +35,13 @@ class Ship(commands.Cog):
             await self._show(ctx, player)
             return
         if sub == "upgrade":
-            await self._upgrade(ctx, player)
+            await self._upgrade(ctx, player, rest)
             return
         if sub in ("refit", "tier", "tierup"):
             await self._refit(ctx, player, rest)
             return
 
-        await ctx.send(f"{ctx.author.mention}, usage: `!ship`, `!ship upgrade`, `!ship refit [@ally] [type]`")
+        await ctx.send(f"{ctx.author.mention}, usage: `!ship`, `!ship upgrade [n|max]`, `!ship refit [@ally] [type]`")
 
     async def _show(self, ctx, player: dict):
         ensure_ship(player)
@@ -88,41 +89,69 @@ class Ship(commands.Cog):
 
         await ctx.send(embed=embed)
 
-    async def _upgrade(self, ctx, player: dict):
+    async def _upgrade(self, ctx, player: dict, rest: str = ""):
         ensure_ship(player)
         ship = player["ship"]
         if not ship.get("owned"):
             await ctx.send(f"{ctx.author.mention}, buy a Starter Ship with `!buy starter ship` first.")
             return
 
+        arg = (rest or "").strip().lower()
+        want_max = arg in ("max", "all")
+        if arg and not want_max:
+            if not arg.isdigit() or int(arg) < 1:
+                await ctx.send(f"{ctx.author.mention}, usage: `!ship upgrade [n|max]`")
+                return
+        steps = 1 if not arg or want_max else int(arg)
+
         # Soldier effective max level
         s_eff = soldier_effects(player)
         eff_max_level = MAX_LEVEL + int(s_eff.get("ship_max_level_bonus", 0))
-        if ship["level"] >= eff_max_level:
+        level = int(ship["level"])
+        tier = int(ship["tier"])
+        if level >= eff_max_level:
             await ctx.send(f"{ctx.author.mention}, your ship is already max level.")
             return
 
-        # Base cost then apply Soldier reduction
+        # Costs come from the cumulative per-tier table (Soldier reduction applied per level)
         ship_skill = float((player.get("skills") or {}).get("ship", 0))
-        base_cost = upgrade_cost_for_next_level(ship["tier"], ship["level"], ship_skill)
-        if base_cost is None:
+        reduction = float(s_eff.get("ship_upgrade_cost_reduction", 0.0))
+        if upgrade_cost_for_next_level(tier, level, ship_skill) is None:
             await ctx.send(f"{ctx.author.mention}, your ship is already max level.")
             return
+        scrap = int(player.get("Scrap", 0) or 0)
 
-        cost = max(1, int(round(base_cost * (1.0 - float(s_eff.get("ship_upgrade_cost_reduction", 0.0))))))
-        if player.get("Scrap", 0) < cost:
-            await ctx.send(f"{ctx.author.mention}, you need {cost} Scrap to upgrade (you have {player.get('Scrap',0)}).")
+        if want_max:
+            target = max_affordable_level(tier, level, scrap, eff_max_level, ship_skill, reduction)
+            if target <= level:
+                cost = upgrade_cost_between(tier, level, level + 1, ship_skill, reduction)
+                await ctx.send(f"{ctx.author.mention}, you need {cost} Scrap to upgrade (you have {scrap}).")
+                return
+        else:
+            last = len(upgrade_cost_table(tier, ship_skill, reduction)) - 1
+            target = min(level + steps, eff_max_level, last)
+
+        cost = upgrade_cost_between(tier, level, target, ship_skill, reduction)
+        if scrap < cost:
+            affordable = max_affordable_level(tier, level, scrap, target, ship_skill, reduction) - level
+            hint = f" You can afford {affordable} level(s) now." if affordable > 0 else ""
+            await ctx.send(
+                f"{ctx.author.mention}, you need {cost:,} Scrap to upgrade {target - level} level(s) (you have {scrap:,}).{hint}"
+            )
             return
 
-        player["Scrap"] -= cost
-        ship["level"] += 1
-        # Clamp in case of external changes
-        ship["level"] = min(ship["level"], eff_max_level)
+        player["Scrap"] = scrap - cost
+        ship["level"] = target
         save_profile(ctx.author.id, player)
 
-        await ctx.send(
-            f"🛠️ {ctx.author.mention} upgraded their ship to Level {ship['level']} for {cost} Scrap."
-        )
+        if target == level + 1:
+            await ctx.send(
+                f"🛠️ {ctx.author.mention} upgraded their ship to Level {ship['level']} for {cost} Scrap."
+            )
+        else:
+            await ctx.send(
+                f"🛠️ {ctx.author.mention} upgraded their ship from Level {level} to Level {ship['level']} for {cost:,} Scrap."
+            )
 
     async def _refit(self, ctx, player: dict, rest: str):
         """
@@ -235,10 +264,17 @@ class Ship(commands.Cog):
                     and m.author.id == user.id
                     and m.content.lower().strip() in (yset | nset)
                 )
+            # Lock the initiator during the prompt (their profile transaction is held until it ends)
+            own = user.id == ctx.author.id
+            if own:
+                set_lock(str(user.id), lock_type="ship_refit", allowed=set(), note="Ship refit confirmation (reply yes or no)")
             try:
                 msg = await self.bot.wait_for("message", timeout=15.0, check=check)
             except asyncio.TimeoutError:
                 return None
+            finally:
+                if own:
+                    clear_lock(str(user.id))
             return True if msg.content.lower().strip() in yset else False
 
         if solo_mode:
@@ -2,9 +2,8 @@ import time
 import discord
 from discord.ext import commands
 from core.decorators import requires_profile
-from core.constants import SHOP_FILE, ITEMS_FILE
-from core.shared import load_json
-from core.items import get_item_by_id
+from core import gamedata
+from core.items import get_item_by_id, get_item_index
 from core.cooldowns import check_and_set_cooldown
 from core.guards import require_no_lock
 from systems.ship_sys import grant_starter_ship
@@ -29,8 +28,8 @@ class Shop(commands.Cog):
     async def shop(self, ctx):
         """View items available in the shop, shown in two wide columns."""
         player = ctx.player
-        shop_data = load_json(SHOP_FILE) or {}
-        items_data = load_json(ITEMS_FILE) or {}
+        shop_data = gamedata.shop() or {}
+        items_data = gamedata.items() or {}
 
         Scrap = player.get("Scrap", 0)
 
@@ -116,22 +115,19 @@ class Buy(commands.Cog):
     async def buy(self, ctx, item_name: str, amount: int = 1):
         """Buy an item or lootbox."""
         player = ctx.player
-        shop = load_json(SHOP_FILE) or {}
-        items = load_json(ITEMS_FILE) or {}
+        shop = gamedata.shop() or {}
+        items = gamedata.items() or {}
 
         query = item_name.lower().strip()
         amount = max(1, min(amount, 100))
         found_item = None
         found_category = None
 
-        for category, entries in shop.items():
-            for item_id, data in entries.items():
-                item_obj = get_item_by_id(items, item_id)
-                if not item_obj:
-                    continue
-                names = [str(item_id).lower(), item_obj["name"].lower()] + [a.lower() for a in item_obj.get("aliases", [])]
-                if query in names:
-                    found_item = (item_id, item_obj, data)
+        index = get_item_index(items)
+        for item_id in index.ids_for(query, match_id=True):
+            for category, entries in shop.items():
+                if isinstance(entries, dict) and item_id in entries:
+                    found_item = (item_id, index.get(item_id), entries[item_id])
                     found_category = category
                     break
             if found_item:
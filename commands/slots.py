@@ -6,11 +6,11 @@ from discord.ext import commands
 from core.decorators import requires_profile
 from core.guards import require_no_lock, set_lock, clear_lock
 from core.players import load_profile, save_profile, get_scrap, set_scrap
-from core.shared import load_json
+from core import gamedata
 from core.quest_progress import update_quest_progress_for_gambling
 from systems.ship_sys import derive_ship_effects
 from core.skills_hooks import award_skill
-from core.constants import SHOP_FILE
+from core.rng import command_rng
 
 # Reels and payouts (3-of-a-kind wins; 2-of-a-kind small return)
 SYMBOLS = [
@@ -63,7 +63,7 @@ def _format_reels(idxs):
     return " | ".join(SYMBOLS[i]["emoji"] for i in idxs)
 
 def _resolve_crate_prices() -> dict:
-    shop = load_json(SHOP_FILE) or {}
+    shop = gamedata.shop() or {}
     loot = (shop.get("Supply Crate") or {})
     id_to_price = {}
     if isinstance(loot, dict):
@@ -141,7 +141,7 @@ class Slots(commands.Cog):
     @requires_profile()
     @require_no_lock()
     async def slots(self, ctx, bet: str = None):
-        rng = random.Random()
+        rng = command_rng(ctx)
         uid = str(ctx.author.id)
 
         prof = load_profile(uid) or {}
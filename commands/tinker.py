@@ -4,7 +4,7 @@ from core.players import save_profile
 from systems.tinker_sys import apply_tinker, tinker_cost_for_planet
 from core.guards import require_no_lock
 # NEW
-import random
+from core.rng import command_rng
 from core.skills_hooks import tinkerer_effects, award_skill, is_player_overcharged
 
 # NEW: Tier → base Tinkerer XP (tune freely)
@@ -62,7 +62,8 @@ class Tinker(commands.Cog):
         cost = tinker_cost_for_planet(eff_p)
         before_scrap = int(player.get("Scrap", 0))
 
-        ok, tier, buff, new_val, name = apply_tinker(player, slot, effective_planet=eff_p)
+        rng = command_rng(ctx)
+        ok, tier, buff, new_val, name = apply_tinker(player, slot, effective_planet=eff_p, rng=rng)
         if not ok:
             eq = (player.get("equipped") or {}).get(slot.lower())
             if not eq:
@@ -78,7 +79,7 @@ class Tinker(commands.Cog):
         eff = tinkerer_effects(player)
         refund_chance = float(eff.get("tinker_scrap_refund_chance", 0.0))
         refunded = False
-        if refund_chance > 0.0 and random.random() < refund_chance:
+        if refund_chance > 0.0 and rng.random() < refund_chance:
             player["Scrap"] = int(player.get("Scrap", 0)) + (2 * int(cost))
             refunded = True
 
@@ -4,9 +4,9 @@ from discord.ext import commands
 from core.decorators import requires_profile
 from core.guards import require_no_lock
 from core.guards import set_lock, clear_lock  # for atomic p2p commit
-from core.players import save_profile, load_profile
-from core.shared import load_json
-from core.constants import ITEMS_FILE
+from core.players import save_profile, load_profile, profiles_txn, ProfileBusy
+from core.constants import PROFILE_TXN_TIMEOUT
+from core import gamedata
 from core.quest_progress import update_quest_progress_for_trade
 
 
@@ -77,7 +77,7 @@ class Trade(commands.Cog):
           • !trade [ID] [amt] @User → player-to-player trade (inverse applied to the tagged player)
         """
         player = ctx.player
-        items_data = load_json(ITEMS_FILE) or {}
+        items_data = gamedata.items() or {}
         player_planet = int(player.get("current_planet") or player.get("max_unlocked_planet", 1))
 
         # No args: show menu
@@ -204,11 +204,18 @@ class Trade(commands.Cog):
         async def ask_yes(user):
             def check(m):
                 return m.channel.id == ctx.channel.id and m.author.id == user.id and m.content.lower().strip() in (yset | nset)
+            # Lock the initiator during the prompt (their profile transaction is held until it ends)
+            own = user.id == ctx.author.id
+            if own:
+                set_lock(str(user.id), lock_type="trade_offer", allowed=set(), note="Trade confirmation (reply yes or no)")
             try:
                 msg = await self.bot.wait_for("message", timeout=15.0, check=check)
                 return msg.content.lower().strip() in yset
             except Exception:
                 return None
+            finally:
+                if own:
+                    clear_lock(str(user.id))
 
         embed = discord.Embed(
             title="🤝 Player Trade Confirmation",
@@ -237,48 +244,48 @@ class Trade(commands.Cog):
         set_lock(p_id, lock_type="trade", allowed=set(), note=f"Trade with {a_id}")
         set_lock(a_id, lock_type="trade", allowed=set(), note=f"Trade with {p_id}")
         try:
-            # Reload fresh snapshots to avoid stale ctx.player and ensure latest balances
-            player_fresh = load_profile(p_id) or {}
-            ally_fresh = load_profile(a_id) or {}
-
-            inv_self = player_fresh.get("inventory", {}) or {}
-            inv_ally = ally_fresh.get("inventory", {}) or {}
-
-            # Re-check availability with fresh state
-            owned_self = int(inv_self.get(src_key, 0) or 0)
-            owned_ally = int(inv_ally.get(ally_src_key, 0) or 0)
-            final_qty = min(final_qty, owned_self, owned_ally)
-            if final_qty <= 0:
-                await ctx.send(
-                    f"{ctx.author.mention} Trade failed after recheck: insufficient materials.\n"
-                    f"- You now have {owned_self} {src_name}\n"
-                    f"- {ally.display_name} now has {owned_ally} {ally_src_name}"
-                )
-                return
-
-            # Initiator: src_key -> dst_key
-            inv_self[src_key] = owned_self - final_qty
-            if inv_self[src_key] <= 0:
-                inv_self.pop(src_key, None)
-            inv_self[dst_key] = int(inv_self.get(dst_key, 0) or 0) + final_qty
-            player_fresh["inventory"] = inv_self
-
-            # Ally: ally_src_key -> ally_dst_key
-            inv_ally[ally_src_key] = owned_ally - final_qty
-            if inv_ally[ally_src_key] <= 0:
-                inv_ally.pop(ally_src_key, None)
-            inv_ally[ally_dst_key] = int(inv_ally.get(ally_dst_key, 0) or 0) + final_qty
-            ally_fresh["inventory"] = inv_ally
-
-            # Save both using string IDs
-            save_profile(p_id, player_fresh)
-            save_profile(a_id, ally_fresh)
+            # Reload fresh snapshots under both players' transactions; profiles_txn
+            # commits the pair together (all or nothing) when the block exits
+            async with profiles_txn([p_id, a_id], timeout=PROFILE_TXN_TIMEOUT) as fresh:
+                player_fresh = fresh[p_id] or {}
+                ally_fresh = fresh[a_id] or {}
+
+                inv_self = player_fresh.get("inventory", {}) or {}
+                inv_ally = ally_fresh.get("inventory", {}) or {}
+
+                # Re-check availability with fresh state
+                owned_self = int(inv_self.get(src_key, 0) or 0)
+                owned_ally = int(inv_ally.get(ally_src_key, 0) or 0)
+                final_qty = min(final_qty, owned_self, owned_ally)
+                if final_qty <= 0:
+                    await ctx.send(
+                        f"{ctx.author.mention} Trade failed after recheck: insufficient materials.\n"
+                        f"- You now have {owned_self} {src_name}\n"
+                        f"- {ally.display_name} now has {owned_ally} {ally_src_name}"
+                    )
+                    return
+
+                # Initiator: src_key -> dst_key
+                inv_self[src_key] = owned_self - final_qty
+                if inv_self[src_key] <= 0:
+                    inv_self.pop(src_key, None)
+                inv_self[dst_key] = int(inv_self.get(dst_key, 0) or 0) + final_qty
+                player_fresh["inventory"] = inv_self
+
+                # Ally: ally_src_key -> ally_dst_key
+                inv_ally[ally_src_key] = owned_ally - final_qty
+                if inv_ally[ally_src_key] <= 0:
+                    inv_ally.pop(ally_src_key, None)
+                inv_ally[ally_dst_key] = int(inv_ally.get(ally_dst_key, 0) or 0) + final_qty
+                ally_fresh["inventory"] = inv_ally
 
             await ctx.send(
                 f"✅ Trade complete: {ctx.author.mention} ⇄ {ally.mention}\n"
                 f"- {ctx.author.display_name}: {final_qty}x {src_name} → {dst_name}\n"
                 f"- {ally.display_name}: {final_qty}x {ally_src_name} → {ally_dst_name}"
             )
+        except ProfileBusy:
+            await ctx.send(f"{ctx.author.mention} ⏳ {ally.mention} is busy with another command — try the trade again in a moment.")
         finally:
             clear_lock(p_id)
             clear_lock(a_id)
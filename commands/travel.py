@@ -1,7 +1,6 @@
 from discord.ext import commands
 from core.decorators import requires_profile
-from core.shared import load_json
-from core.constants import PLANETS_FILE
+from core import gamedata
 from core.guards import require_no_lock
 
 
@@ -22,7 +21,7 @@ class Travel(commands.Cog):
             return
 
         player["current_planet"] = planet_id
-        planets = load_json(PLANETS_FILE)
+        planets = gamedata.planets()
         planet_name = planets.get(str(planet_id), {}).get("name", f"Planet {planet_id}")
         await ctx.send(f"🛸 You traveled to **{planet_name}**.")
 
@@ -3,9 +3,10 @@ import discord
 from discord.ext import commands
 from core.decorators import requires_profile
 from core.utils import get_max_oxygen, get_max_health
-from core.shared import load_json, save_json
-from core.items import load_items, find_item, get_item_by_id, iterate_all_items
-from core.constants import ITEMS_FILE
+from core.shared import save_json
+from core import gamedata
+from core.items import load_items, get_item_by_id, get_item_index, iterate_all_items, suggest_item_names
+from core.fuzzy import did_you_mean
 from core.guards import require_no_lock
 from core.players import save_profile
 
@@ -21,7 +22,7 @@ class Use(commands.Cog):
         """Use one or more items from your inventory (by name or alias). Example: !use med 3"""
         player = ctx.player
         inventory = player.get("inventory", {})
-        items = load_json(ITEMS_FILE)
+        items = gamedata.items()
 
         item_query = item_query.lower().strip()
         amount = max(1, amount)
@@ -44,25 +45,19 @@ class Use(commands.Cog):
             await ctx.send("🪙 Ship Token used. Your next `!ship refit` will keep your current ship type.")
             return
 
-        # Search inventory by name/alias
+        # First item matching the name/alias that the player actually owns
         target_item_id = None
         target_item = None
-        for inv_id, quantity in inventory.items():
-            if quantity <= 0:
-                continue
-
-            item = find_item(items, inv_id)
-            if not item:
-                continue
-
-            names = [item["name"].lower()] + [a.lower() for a in item.get("aliases", [])]
-            if item_query in names:
-                target_item_id = str(inv_id)
-                target_item = item
+        index = get_item_index(items)
+        for inv_id in index.ids_for(item_query):
+            if inventory.get(inv_id, 0) > 0:
+                target_item_id = inv_id
+                target_item = index.get(inv_id)
                 break
 
         if not target_item:
-            await ctx.send(f"{ctx.author.mention}, you don’t have `{item_query}` in your inventory!")
+            hint = did_you_mean(suggest_item_names(item_query, items, owned=inventory))
+            await ctx.send(f"{ctx.author.mention}, you don’t have `{item_query}` in your inventory!{hint}")
             return
 
         available = inventory[target_item_id]
@@ -61,10 +61,11 @@ def seconds_until(hour_utc: int = 4, minute: int = 0) -> float:
     return (target - now).total_seconds()
 
 
-async def run_daily_players_backup(players_file: str, backup_dir: str, keep: int = 14, hour_utc: int = 4, logger=print):
+async def run_daily_players_backup(players_file: str, backup_dir: str, keep: int = 14, hour_utc: int = 4, logger=print, before_backup=None):
     """
     Background task: wait until the next hour:minute UTC, then every ~24h
     back up players_file into backup_dir and rotate old backups.
+    `before_backup` (optional callable) runs first, e.g. to flush cached profiles to disk.
     """
     try:
         # Initial delay to scheduled time
@@ -72,6 +73,8 @@ async def run_daily_players_backup(players_file: str, backup_dir: str, keep: int
         logger(f"[backup] First backup in ~{int(delay)}s (UTC {hour_utc:02d}:00)")
         await __import__("asyncio").sleep(delay)
         while True:
+            if before_backup is not None:
+                before_backup()
             path = backup_file(players_file, backup_dir, prefix="players")
             if path:
                 logger(f"[backup] Wrote {path}")
@@ -0,0 +1,251 @@
+"""
+Change-tracking containers for player profiles.
+
+TrackedProfile is a dict subclass (isinstance(p, dict) still holds) that
+records which top-level keys a command changed, and which entries of the
+"inventory" map changed, so save_profile can persist only those paths
+instead of normalizing and merging the whole profile.
+
+Rules:
+- Nested dicts/lists present at load time are wrapped; mutating them marks
+  their top-level key changed (inventory is tracked per entry instead).
+- Assigning a key marks it changed. The assigned value is stored as-is (not
+  copied), so callers keep their alias; because later mutations of such a
+  plain container cannot be seen, the key stays changed ("sticky") and is
+  persisted whole on every commit. That holds at any depth: a plain
+  container put inside a tracked one (item assignment, setdefault, update,
+  list append/insert/extend) makes the top-level key above it sticky.
+"""
+import copy
+from typing import Callable, Dict, Optional, Set
+
+INVENTORY_KEY = "inventory"
+
+
+def to_plain(value):
+    """Deep copy into plain dict/list containers (drops tracking)."""
+    if isinstance(value, dict):
+        return {k: to_plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [to_plain(v) for v in value]
+    return copy.deepcopy(value) if not isinstance(value, (str, int, float, bool, type(None))) else value
+
+
+def _is_plain(value) -> bool:
+    """dict/list whose mutations nobody reports."""
+    return isinstance(value, (dict, list)) and not isinstance(value, (TrackedDict, TrackedList))
+
+
+def _wrap(value, on_change: Callable[..., None]):
+    if isinstance(value, dict):
+        return TrackedDict(value, on_change)
+    if isinstance(value, list):
+        return TrackedList(value, on_change)
+    return value
+
+
+class TrackedDict(dict):
+    """
+    dict that reports every mutation to `on_change(key, plain)`; nested
+    containers report as the same key. plain is True when an untracked
+    container was stored, here or anywhere below.
+    """
+
+    __slots__ = ("_on_change",)
+
+    def __init__(self, data=None, on_change: Optional[Callable[..., None]] = None):
+        super().__init__()
+        self._on_change = on_change
+        child = lambda _k, plain=False: self._touch(None, plain)
+        for k, v in (data or {}).items():
+            dict.__setitem__(self, k, _wrap(v, child))
+
+    def _touch(self, key, plain: bool = False):
+        if self._on_change is not None:
+            self._on_change(key, plain)
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._touch(key, _is_plain(value))
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._touch(key)
+
+    def pop(self, key, *default):
+        had = key in self
+        out = dict.pop(self, key, *default)
+        if had:
+            self._touch(key)
+        return out
+
+    def popitem(self):
+        k, v = dict.popitem(self)
+        self._touch(k)
+        return k, v
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        for k, v in dict(*args, **kwargs).items():
+            self[k] = v
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        keys = list(self.keys())
+        dict.clear(self)
+        for k in keys:
+            self._touch(k)
+
+    def __deepcopy__(self, memo):
+        return {k: copy.deepcopy(v, memo) for k, v in self.items()}
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class TrackedList(list):
+    """list that reports any mutation to `on_change(None, plain)` (see TrackedDict)."""
+
+    __slots__ = ("_on_change",)
+
+    def __init__(self, data=None, on_change: Optional[Callable[..., None]] = None):
+        child = lambda _k, plain=False: self._touch(plain)
+        super().__init__(_wrap(v, child) for v in (data or []))
+        self._on_change = on_change
+
+    def _touch(self, plain: bool = False):
+        if self._on_change is not None:
+            self._on_change(None, plain)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(v, memo) for v in self]
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def _stored_values(name, args):
+    """The values a list mutator call stores."""
+    if name == "append":
+        return args[:1]
+    if name == "insert":
+        return args[1:2]
+    if name in ("extend", "__iadd__"):
+        return args[0] if args else ()
+    if name == "__setitem__" and len(args) == 2:
+        return args[1] if isinstance(args[0], slice) else args[1:]
+    return ()
+
+
+def _mutator(name):
+    base = getattr(list, name)
+
+    def method(self, *args, **kwargs):
+        iterable = name in ("extend", "__iadd__") or (name == "__setitem__" and isinstance(args[0], slice))
+        if iterable and not isinstance(args[-1], (list, tuple)):
+            args = args[:-1] + (list(args[-1]),)  # iterators: consume once, inspect and store the same items
+        out = base(self, *args, **kwargs)
+        self._touch(any(_is_plain(v) for v in _stored_values(name, args)))
+        return out
+
+    method.__name__ = name
+    return method
+
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+              "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(TrackedList, _name, _mutator(_name))
+
+
+class TrackedProfile(TrackedDict):
+    """
+    Top-level profile wrapper. collect_changes() returns what changed since
+    load (or since the last mark_clean()):
+        {"set": {key: plain value}, "unset": [key], "inventory": {item_id: qty or None}}
+    "inventory" holds per-entry changes (None = removed) and is only present
+    when the original inventory map was mutated rather than replaced.
+    """
+
+    __slots__ = ("_changed", "_removed", "_inv_changed", "_sticky", "_attached")
+
+    def __init__(self, data=None):
+        self._changed: Set[str] = set()
+        self._removed: Set[str] = set()
+        self._inv_changed: Set[str] = set()
+        self._sticky: Set[str] = set()
+        self._attached: Dict[str, object] = {}
+        super().__init__({}, self._top_changed)
+        for k, v in (data or {}).items():
+            dict.__setitem__(self, k, self._attach(k, v))
+
+    def _attach(self, key, value):
+        """Wrap a loaded container with a hook that only fires while it is still self[key]."""
+        if not isinstance(value, (dict, list)):
+            return value
+        holder = []
+
+        def hook(entry, plain=False):
+            if holder and dict.get(self, key) is holder[0]:
+                if plain:
+                    # Untracked container somewhere below: persist the whole key from now on
+                    self._changed.add(key)
+                    self._sticky.add(key)
+                elif key == INVENTORY_KEY and INVENTORY_KEY not in self._changed:
+                    self._inv_changed.add(str(entry))
+                else:
+                    self._changed.add(key)
+
+        if key == INVENTORY_KEY and isinstance(value, dict):
+            # Per-entry tracking: the inventory map holds plain ints
+            wrapped = TrackedDict({}, hook)
+            dict.update(wrapped, value)
+        else:
+            wrapped = _wrap(value, hook)
+        holder.append(wrapped)
+        self._attached[key] = wrapped
+        return wrapped
+
+    # ---- change hooks ----
+    def _top_changed(self, key, plain=False):
+        if key in self:
+            self._changed.add(key)
+            self._removed.discard(key)
+            value = dict.__getitem__(self, key)
+            # A container only reports for the key it was loaded under
+            if plain or (isinstance(value, (dict, list)) and self._attached.get(key) is not value):
+                self._sticky.add(key)
+        else:
+            self._changed.discard(key)
+            self._sticky.discard(key)
+            self._removed.add(key)
+        if key == INVENTORY_KEY:
+            self._inv_changed.clear()
+
+    # ---- public API ----
+    @property
+    def has_changes(self) -> bool:
+        return bool(self._changed or self._removed or self._inv_changed or self._sticky)
+
+    def collect_changes(self) -> Dict:
+        changed = self._changed | self._sticky
+        out = {
+            "set": {k: to_plain(dict.__getitem__(self, k)) for k in changed if k in self},
+            "unset": sorted(self._removed),
+        }
+        if self._inv_changed and INVENTORY_KEY not in changed:
+            inv = dict.get(self, INVENTORY_KEY) or {}
+            out[INVENTORY_KEY] = {iid: inv.get(iid) for iid in self._inv_changed}
+        return out
+
+    def mark_clean(self) -> None:
+        """Forget recorded changes (after a commit). Sticky keys stay changed."""
+        self._changed.clear()
+        self._removed.clear()
+        self._inv_changed.clear()
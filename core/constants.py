@@ -5,10 +5,16 @@ Data directories
 - DATA_DIR: packaged, read-only defaults (items.json, planets.json, etc.)
 - RUNTIME_DATA_DIR: writable location for runtime state (players.json, cooldowns.json, raids.json)
     Can be overridden via env var RUNTIME_DATA_DIR (e.g., when mounting a volume in production).
+- PLAYERS_BACKEND: where player profiles live inside RUNTIME_DATA_DIR (env var PLAYERS_BACKEND)
+    "json"   -> one players.json blob (default)
+    "sqlite" -> one row per player in players.sqlite3 (WAL mode)
+    "files"  -> one small JSON file per player under players/<shard>/<uid>.json
+    "journal"-> players.json snapshot + append-only players.journal.jsonl of per-save deltas
 """
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 RUNTIME_DATA_DIR = os.getenv("RUNTIME_DATA_DIR", DATA_DIR)
+PLAYERS_BACKEND = os.getenv("PLAYERS_BACKEND", "json").strip().lower()
 
 # === JSON FILES ===
 PLAYERS_FILE = os.path.join(RUNTIME_DATA_DIR, "players.json")
@@ -25,6 +31,44 @@ CODES_FILE = os.path.join(DATA_DIR, "codes.json")
 CREDITSHOP_FILE = os.path.join(DATA_DIR, "creditshop.json")
 RECIPES_FILE = os.path.join(DATA_DIR, "recipes.json")
 RAIDS_FILE = os.path.join(RUNTIME_DATA_DIR, "raids.json")
+# Static data files above are cached by core.gamedata; their mtimes are checked at most this often (seconds)
+GAMEDATA_CHECK_INTERVAL = float(os.getenv("GAMEDATA_CHECK_INTERVAL", "2"))
+# Root seed for core.rng reward streams; unset = fresh random seed per process.
+# Pin it to replay rolls (with the logged command/message ids).
+RNG_SEED = os.getenv("RNG_SEED")
+
+# === SHARDED RUNTIME ===
+# BOT_PROCESSES > 1 turns bot.py into a supervisor that starts that many shard
+# processes (core/sharding.py). BOT_SHARD_COUNT is the total number of Discord
+# shards spread across them (default: one per process). The processes share
+# player profiles (PLAYERS_SHARED), user locks and cooldowns (SHARED_STATE_FILE).
+BOT_PROCESSES = max(1, int(os.getenv("BOT_PROCESSES", "1")))
+BOT_SHARD_COUNT = int(os.getenv("BOT_SHARD_COUNT", "0"))
+SHARED_RUNTIME = BOT_PROCESSES > 1
+SHARED_STATE_FILE = os.path.join(RUNTIME_DATA_DIR, "shared_state.sqlite3")
+
+# === PLAYER STORE ===
+PLAYERS_DB_FILE = os.path.join(RUNTIME_DATA_DIR, "players.sqlite3")
+PROFILE_DIR = os.path.join(RUNTIME_DATA_DIR, "players")
+PLAYERS_JOURNAL_FILE = os.path.join(RUNTIME_DATA_DIR, "players.journal.jsonl")
+# Journal backend: fold the journal into players.json this often (seconds) and before each daily backup
+PLAYERS_COMPACT_INTERVAL = float(os.getenv("PLAYERS_COMPACT_INTERVAL", "3600"))
+# JSON export of the SQLite / per-file store, used as the source for daily backups
+PLAYERS_EXPORT_FILE = os.path.join(RUNTIME_DATA_DIR, "players.export.json")
+
+# Profiles are cached in memory and written back in batches.
+# A flush happens when PLAYERS_FLUSH_THRESHOLD profiles are dirty, when
+# PLAYERS_FLUSH_INTERVAL seconds have passed since the last flush, and on shutdown.
+PLAYERS_FLUSH_INTERVAL = float(os.getenv("PLAYERS_FLUSH_INTERVAL", "5"))
+PLAYERS_FLUSH_THRESHOLD = int(os.getenv("PLAYERS_FLUSH_THRESHOLD", "50"))
+# Commands for the same user run one at a time; a new command waits this long
+# (seconds) for the previous one before the user is told to retry.
+PROFILE_TXN_TIMEOUT = float(os.getenv("PROFILE_TXN_TIMEOUT", "10"))
+# Several bot processes share one store (sqlite or files backend only): reads go to
+# the backend and every save is a compare-and-swap on the profile's "rev".
+PLAYERS_SHARED = SHARED_RUNTIME or os.getenv("PLAYERS_SHARED", "0").strip().lower() in ("1", "true", "yes")
+# update_profile re-runs its mutation this many times when a save loses the CAS race
+PROFILE_CAS_RETRIES = int(os.getenv("PROFILE_CAS_RETRIES", "5"))
 
 # === GAME CONSTANTS ===
 DEFAULT_HEALTH = 100
@@ -1,5 +1,6 @@
 import json, os, time
 from core.constants import COOLDOWNS_FILE
+from core.shared_state import get_shared_state
 
 command_cooldowns = {
     "scan": 60,           # 1 minute
@@ -14,6 +15,8 @@ command_cooldowns = {
     "ship refit": 28800         # 8 hours
 }
 
+# In the sharded runtime cooldowns live in core.shared_state (seeded from
+# cooldowns.json) so every shard process sees them; active_cooldowns is then unused.
 if os.path.exists(COOLDOWNS_FILE):
     with open(COOLDOWNS_FILE, "r") as f:
         active_cooldowns = json.load(f)
@@ -26,6 +29,10 @@ def save_cooldowns():
 
 def set_cooldown(user_id, command, expires_at, username=None):
     uid = str(user_id)
+    shared = get_shared_state()
+    if shared is not None:
+        shared.set_cooldown(uid, command, expires_at, username or f"user_{uid}")
+        return
     if uid not in active_cooldowns:
         active_cooldowns[uid] = {"username": username or f"user_{uid}", "cooldowns": {}}
     active_cooldowns[uid]["username"] = username or f"user_{uid}"
@@ -34,10 +41,31 @@ def set_cooldown(user_id, command, expires_at, username=None):
 
 def get_cooldown(user_id, command):
     uid = str(user_id)
+    shared = get_shared_state()
+    if shared is not None:
+        return shared.get_cooldown(uid, command)
     user_data = active_cooldowns.get(uid, {})
     cooldowns = user_data.get("cooldowns", {})
     return cooldowns.get(command, 0)
 
+def get_user_cooldowns(user_id):
+    """{"username": str, "cooldowns": {command: expires_at}} for one user, or None."""
+    uid = str(user_id)
+    shared = get_shared_state()
+    if shared is not None:
+        return shared.get_user_cooldowns(uid)
+    return active_cooldowns.get(uid)
+
+def set_user_cooldowns(user_id, user_data):
+    """Replace one user's cooldown entry (admin tools)."""
+    uid = str(user_id)
+    shared = get_shared_state()
+    if shared is not None:
+        shared.set_user_cooldowns(uid, user_data)
+        return
+    active_cooldowns[uid] = user_data
+    save_cooldowns()
+
 # NEW: humanize durations for consistent messages
 def _humanize(seconds: int) -> str:
     seconds = int(max(0, seconds))
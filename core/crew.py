@@ -1,8 +1,9 @@
 from __future__ import annotations
 import random, string, time
 from typing import Dict, List, Optional, Tuple
-from core.shared import load_json
-from core.constants import ITEMS_FILE
+from core import gamedata
+from core.items import get_item_index
+from core.rng import stream as rng_stream
 
 CREW_TYPES = ["soldier", "contractor", "scientist", "explorer"]
 JOB_SECONDS = 4 * 60 * 60  # 4 hours
@@ -44,16 +45,12 @@ def next_crew_code(existing: List[str]) -> str:
             return code
 
 def resolve_medkit_key() -> str:
-    items = load_json(ITEMS_FILE) or {}
     # Try to find “medkit” by name across categories
-    if isinstance(items, dict):
-        for cat, data in items.items():
-            if not isinstance(data, dict):
-                continue
-            for iid, meta in data.items():
-                nm = str(meta.get("name", "")).strip().lower()
-                if nm in {"medkit", "med kit", "med-kit"}:
-                    return str(iid)
+    index = get_item_index(gamedata.items() or {})
+    for nm in ("medkit", "med kit"):
+        iid = index.id_for_name(nm)
+        if iid:
+            return iid
     return "medkit"
 
 def parse_offer_string(s: str, max_tokens: int = 6) -> Tuple[int, int, int]:
@@ -93,12 +90,12 @@ def pay_now(player: Dict, scrap: int, meds: int) -> None:
             inv.pop(med_key, None)
         player["inventory"] = inv
 
-def spawn_candidate() -> Dict:
+def spawn_candidate(rng=random) -> Dict:
     return {
-        "name": random.choice(["Avery", "Morgan", "Rhett", "Kai", "Nova", "Skye", "Vega", "Juno"]),
-        "type": random.choice(CREW_TYPES),
-        "salary_demand": random.choice([0, 1000, 2000, 3000, 4000, 5000]),
-        "benefits_demand": random.randint(0, 5),
+        "name": rng.choice(["Avery", "Morgan", "Rhett", "Kai", "Nova", "Skye", "Vega", "Juno"]),
+        "type": rng.choice(CREW_TYPES),
+        "salary_demand": rng.choice([0, 1000, 2000, 3000, 4000, 5000]),
+        "benefits_demand": rng.randint(0, 5),
     }
 
 def hire_probability(offer_scrap: int, offer_med: int, demand_scrap: int, demand_med: int) -> float:
@@ -146,9 +143,11 @@ def is_job_ready(crew: Dict, now: int) -> bool:
     ends = int(crew.get("job_ends") or 0)
     return crew.get("status") == "working" and ends > 0 and now >= ends
 
-def finalize_job_reward(player: Dict, crew: Dict, sector: int, planet: int) -> Dict:
+def finalize_job_reward(player: Dict, crew: Dict, sector: int, planet: int, rng=None) -> Dict:
     """
     Build rewards based on crew type; tie to sector/planet; ignore other multipliers.
+    Rolls come from a stream keyed on the job (player, crew code, start time), so
+    a claim can be replayed under the same root seed.
     TODO: respect double-drop effects for explorer where applicable.
     """
     ctype = crew.get("type")
@@ -156,12 +155,13 @@ def finalize_job_reward(player: Dict, crew: Dict, sector: int, planet: int) -> D
     s = max(1, int(sector or 1))
     p = max(1, int(planet or 1))
     reward = {"scrap": 0, "xp": 0, "items": {}}
-    rng = random.Random()
+    if rng is None:
+        rng = rng_stream("crew.job", player.get("id"), crew.get("code"), crew.get("job_started"))
     if ctype == "soldier":
         reward["scrap"] = 300 * s * p
     elif ctype == "contractor":
         # First-tier mats
-        mat = random.choice(["plasteel", "circuit", "plasma", "biofiber"])
+        mat = rng.choice(["plasteel", "circuit", "plasma", "biofiber"])
         qty = 10 + 3 * s + 2 * p
         reward["items"][mat] = qty
     elif ctype == "scientist":
@@ -174,12 +174,12 @@ def finalize_job_reward(player: Dict, crew: Dict, sector: int, planet: int) -> D
         reward["items"]["plasteel"] = 5 + s + p
     return reward
 
-def claim_job(player: Dict, crew: Dict, sector: int, planet: int, now: int) -> Tuple[bool, Optional[Dict]]:
+def claim_job(player: Dict, crew: Dict, sector: int, planet: int, now: int, rng=None) -> Tuple[bool, Optional[Dict]]:
     if crew.get("status") != "working":
         return False, None
     if not is_job_ready(crew, now):
         return False, None
-    reward = finalize_job_reward(player, crew, sector, planet)
+    reward = finalize_job_reward(player, crew, sector, planet, rng)
     # Apply to player
     if reward.get("scrap"):
         player["scrap"] = int(player.get("scrap", 0) or 0) + int(reward["scrap"])
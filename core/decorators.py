@@ -1,15 +1,26 @@
 import traceback
 from functools import wraps
 from discord.ext import commands
-from core.players import load_profile, save_profile, default_profile, migrate_player
+from core.players import load_profile, save_profile, default_profile, migrate_player, profile_txn, ProfileBusy, ProfileConflict
+from core.constants import PROFILE_TXN_TIMEOUT
+from core.guards import blocking_lock, lock_hint
 from core.utils import get_max_health, get_max_oxygen
 from systems.oxygenregen import apply_oxygen_regen
 from core.sector import ensure_sector
 from core.skills_hooks import is_player_overcharged
 
 
-def requires_profile(auto_save=True):
-    """Require an existing profile; if present, migrate + regen, attach to ctx, clamp and save after."""
+def requires_profile(auto_save=True, txn=True):
+    """
+    Require an existing profile; if present, migrate + regen, attach to ctx, clamp and save after.
+
+    With txn=True (default) the command runs inside profile_txn: commands for the
+    same user are serialized, the profile is loaded once and committed once.
+    Long-running interactive commands that must not block the user's other
+    commands can pass txn=False to get the plain load/run/save lifecycle.
+    A user with a pending lock (core.guards) gets the lock hint right away
+    instead of waiting up to PROFILE_TXN_TIMEOUT for the transaction.
+    """
     def inner(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -17,38 +28,21 @@ def requires_profile(auto_save=True):
             ctx = args[1] if len(args) > 1 and hasattr(args[1], "author") else args[0]
             uid = str(ctx.author.id)
             try:
-                profile = load_profile(uid)
-                if not profile:
-                    await ctx.send(
-                        "👋 Welcome! You don’t have a profile yet.\n"
-                        "Use `!start` to register and begin playing. After that, try: `scan`, `research`, `explore`.\n"
-                        "Tip: Use `!tutorial` next for a quick guide."
-                    )
+                if not txn:
+                    return await _run_with_profile(ctx, uid, load_profile(uid), func, args, kwargs, auto_save, False)
+                # Prompts hold the transaction while they wait for a reply; fail fast instead of queueing
+                lock = blocking_lock(ctx)
+                if lock:
+                    await ctx.send(f"⏳ {lock_hint(lock)}")
                     return
-
-                # Match with_profile lifecycle (minus auto-create)
-                username = getattr(ctx.author, "name", str(ctx.author))
-                profile = migrate_player(profile, uid, username)
-                profile = apply_oxygen_regen(profile)
-                ctx.player = profile
-
-                result = await func(*args, **kwargs)
-
-                # Clamp and save like with_profile
                 try:
-                    ctx.player["health"] = min(
-                        ctx.player.get("health", 0), get_max_health(ctx.player)
-                    )
-                    ctx.player["oxygen"] = min(
-                        ctx.player.get("oxygen", 0), get_max_oxygen(ctx.player)
-                    )
-                except Exception as e:
-                    print(f"[requires_profile] Clamp warning: {e}")
-
-                if auto_save:
-                    save_profile(uid, ctx.player)
-
-                return result
+                    async with profile_txn(uid, timeout=PROFILE_TXN_TIMEOUT, commit=auto_save) as profile:
+                        return await _run_with_profile(ctx, uid, profile, func, args, kwargs, auto_save, True)
+                except ProfileBusy:
+                    await ctx.send(f"{ctx.author.mention} ⏳ Your previous command is still running — try again in a moment.")
+                except ProfileConflict:
+                    # Shared store: another bot process saved this profile while the command ran
+                    await ctx.send(f"{ctx.author.mention} ⚠️ Your profile changed while that command ran, so its result was not saved — please try again.")
             except Exception as e:
                 print(f"[❌ requires_profile error] {type(e).__name__}: {e}")
                 traceback.print_exc()
@@ -59,6 +53,41 @@ def requires_profile(auto_save=True):
         return wrapper
     return inner
 
+async def _run_with_profile(ctx, uid, profile, func, args, kwargs, auto_save, in_txn):
+    if not profile:
+        await ctx.send(
+            "👋 Welcome! You don’t have a profile yet.\n"
+            "Use `!start` to register and begin playing. After that, try: `scan`, `research`, `explore`.\n"
+            "Tip: Use `!tutorial` next for a quick guide."
+        )
+        return
+
+    # Match with_profile lifecycle (minus auto-create).
+    # Schema migrations already ran once at load; this is an int compare + username check.
+    username = getattr(ctx.author, "name", str(ctx.author))
+    profile = migrate_player(profile, uid, username)
+    profile = apply_oxygen_regen(profile)
+    ctx.player = profile
+
+    result = await func(*args, **kwargs)
+
+    # Clamp and save like with_profile
+    try:
+        ctx.player["health"] = min(
+            ctx.player.get("health", 0), get_max_health(ctx.player)
+        )
+        ctx.player["oxygen"] = min(
+            ctx.player.get("oxygen", 0), get_max_oxygen(ctx.player)
+        )
+    except Exception as e:
+        print(f"[requires_profile] Clamp warning: {e}")
+
+    # Inside profile_txn the transaction commits ctx.player on exit
+    if auto_save and not (in_txn and ctx.player is profile):
+        save_profile(uid, ctx.player)
+
+    return result
+
 # def with_profile(auto_save=True):
 #     def decorator(func):
 #         @wraps(func)
@@ -0,0 +1,189 @@
+# core/derived.py
+"""
+Memoized derived stats for a profile: ship effects, skill perks and flattened
+skill effects, combat stats, max health and max oxygen.
+
+All of them are pure functions of a handful of profile fields (level, skill
+levels, overcharged, ship, equipped gear and its enhancements) plus items.json.
+derived_stats() fingerprints exactly those fields and memoizes on the
+fingerprint, so the repeated calls inside one command (requires_profile clamps,
+add_xp, every *_effects helper, combat) cost one small tuple build. Any change
+to those fields produces a different key, so nothing has to be invalidated by
+hand; a reload of items.json changes the key too.
+
+Returned mappings are read-only and shared; copy before modifying. The
+profile itself is only read: missing skill nodes or ship fields count as their
+defaults and are not written back.
+"""
+from typing import Dict
+
+from core import gamedata
+from core.constants import ITEMS_FILE
+from core.items import get_item_by_id
+from core.skills import SKILLS, compute_perks, skill_level
+
+_MAX_CACHED = 4096
+
+
+class DerivedStats:
+    __slots__ = ("ship", "perks", "effects", "attack", "defense", "max_health", "max_oxygen")
+
+    def __init__(self, ship, perks, effects, attack, defense, max_health, max_oxygen):
+        self.ship = ship
+        self.perks = perks
+        self.effects = effects
+        self.attack = attack
+        self.defense = defense
+        self.max_health = max_health
+        self.max_oxygen = max_oxygen
+
+    @property
+    def combat(self) -> Dict[str, int]:
+        return {"attack": self.attack, "defense": self.defense}
+
+
+_cache: Dict[tuple, DerivedStats] = {}
+
+
+def _fingerprint(player: dict) -> tuple:
+    """
+    Every input the derived stats read, without writing to the profile. Missing
+    skill nodes / ship fields read as the defaults get_level / ensure_ship
+    would have filled in.
+    """
+    skills = player.get("skills")
+    levels = []
+    try:
+        for name in SKILLS:
+            lv = skills[name]["level"]
+            if type(lv) is not int or lv < 1:
+                raise TypeError
+            levels.append(lv)
+    except (TypeError, KeyError):
+        levels = [skill_level(player, name) for name in SKILLS]
+
+    ship = player.get("ship")
+    if not isinstance(ship, dict):
+        ship = {}
+    equipped = player.get("equipped") or {}
+    enhancements = player.get("enhancements") or {}
+    weapon_id = equipped.get("weapon")
+    armor_id = equipped.get("armor")
+    w_buff = (enhancements.get(str(weapon_id)) or {}).get("buff", 0.0) if weapon_id else 0.0
+    a_buff = (enhancements.get(str(armor_id)) or {}).get("buff", 0.0) if armor_id else 0.0
+    return (
+        int(player.get("level", 1)),
+        tuple(levels),
+        bool(player.get("overcharged", False)),
+        bool(ship.get("owned", False)), ship.get("tier", 0), ship.get("level", 0), ship.get("type"),
+        weapon_id, armor_id, w_buff, a_buff,
+        gamedata.version(ITEMS_FILE),
+    )
+
+
+def _flat_effects(pk: dict) -> dict:
+    boxer = pk.get("boxer", {}) or {}
+    trader = pk.get("trader", {}) or {}
+    tink = pk.get("tinkerer", {}) or {}
+    soldi = pk.get("soldier", {}) or {}
+    work = pk.get("worker", {}) or {}
+    craft = pk.get("crafter", {}) or {}
+    return {
+        "supply_crate_mult": float(boxer.get("supply_crate_chance_mult", 1.0)),
+        "extra_supply_crates": int(boxer.get("extra_supply_crates", 0)),
+        "sell_price_mult": float(trader.get("sell_price_mult", 1.0)),
+        "tinker_high_tier_weight_mult": float(tink.get("tinker_high_tier_weight_mult", 1.0)),
+        "tinker_scrap_refund_chance": float(tink.get("tinker_scrap_refund_chance", 0.0)),
+        "ship_upgrade_cost_reduction": float(soldi.get("ship_upgrade_cost_reduction", 0.0)),
+        "ship_max_level_bonus": int(soldi.get("ship_max_level_bonus", 0)),
+        "work_tier_weight_mult": float(work.get("work_tier_weight_mult", 1.0)),
+        "cross_material_chance": float(work.get("cross_material_chance", 0.0)),
+        "craft_refund_pct": float(craft.get("craft_refund_pct", 0.0)),
+        "overcharged": bool(pk.get("overcharged", False)),
+    }
+
+
+def _gear_stats(items, item_id, enhancements) -> tuple:
+    """(attack add, defense add, attack mult, defense mult) of one equipped item."""
+    if not item_id:
+        return 0, 0, 1.0, 1.0
+    item = get_item_by_id(items, item_id)
+    if not item:
+        return 0, 0, 1.0, 1.0
+    buff = float((enhancements.get(str(item_id)) or {}).get("buff", 0.0))
+    # Enhancement applies multiplicatively to the gear stat only
+    return (
+        int(round(int(item.get("attack", 0) or 0) * (1.0 + buff))),
+        int(round(int(item.get("defense", 0) or 0) * (1.0 + buff))),
+        float(item.get("attack_mult", 1.0)),
+        float(item.get("defense_mult", 1.0)),
+    )
+
+
+def _compute(player: dict) -> DerivedStats:
+    from systems.ship_sys import ship_effects_uncached
+
+    level = int(player.get("level", 1))
+    # ship_effects_uncached repairs the ship container in place; give it a copy
+    ship = player.get("ship")
+    ship = ship_effects_uncached({"ship": dict(ship) if isinstance(ship, dict) else {}})
+    perks = compute_perks(player)
+    tb = ship.get("type_boost", {}) or {}
+
+    # Combat: base per level + equipped gear, gear multipliers, then ship type boost
+    items = gamedata.items()
+    equipped = player.get("equipped", {}) or {}
+    enhancements = player.get("enhancements", {}) or {}
+    attack = defense = 5 * level
+    attack_mult = defense_mult = 1.0
+    for slot in ("weapon", "armor"):
+        atk, dfn, am, dm = _gear_stats(items, equipped.get(slot), enhancements)
+        attack += atk
+        defense += dfn
+        attack_mult *= am
+        defense_mult *= dm
+    final_attack = int(attack * attack_mult)
+    final_defense = int(defense * defense_mult)
+    if tb.get("stat") == "attack":
+        final_attack = int(round(final_attack * (1.0 + float(tb.get("value", 0.0)))))
+    if tb.get("stat") == "defense":
+        final_defense = int(round(final_defense * (1.0 + float(tb.get("value", 0.0)))))
+
+    # Max health: ship "hp" type boost
+    max_hp = 100 + level * 5
+    if tb.get("stat") == "hp":
+        max_hp = int(round(max_hp * (1.0 + float(tb.get("value", 0.0)))))
+
+    # Max oxygen: equipped armor oxygen_capacity bonus
+    o2_bonus = 0
+    armor_id = equipped.get("armor")
+    if armor_id:
+        armor = get_item_by_id(items, armor_id)
+        if armor and "oxygen_capacity" in armor:
+            o2_bonus = int(armor["oxygen_capacity"])
+    max_o2 = 100 + level * 5 + o2_bonus
+
+    return DerivedStats(
+        ship=gamedata.freeze(ship),
+        perks=gamedata.freeze(perks),
+        effects=gamedata.freeze(_flat_effects(perks)),
+        attack=final_attack,
+        defense=final_defense,
+        max_health=max_hp,
+        max_oxygen=max_o2,
+    )
+
+
+def derived_stats(player: dict) -> DerivedStats:
+    """Memoized DerivedStats for the profile's current level/skills/ship/gear."""
+    key = _fingerprint(player)
+    stats = _cache.get(key)
+    if stats is None:
+        if len(_cache) >= _MAX_CACHED:
+            _cache.clear()
+        stats = _cache[key] = _compute(player)
+    return stats
+
+
+def clear_cache() -> None:
+    _cache.clear()
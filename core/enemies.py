@@ -0,0 +1,90 @@
+import random
+import re
+from typing import Dict, List, Optional, Tuple
+
+from core import gamedata
+
+_SECTION_RE = re.compile(r"^P(\d+)E?$", re.IGNORECASE)
+
+Enemy = Tuple[str, dict]  # (enemy_key, enemy meta from enemies.json)
+
+
+def _iter_sections(enemies_data):
+    """
+    Yield (planet_id, [(enemy_key, meta), ...]) for the supported enemies.json shapes:
+    - sectioned: { "P1E": { "wolf": {...}, ... }, ... }   (current file)
+    - legacy:    { "1": [ {...}, ... ], ... }
+    """
+    if not isinstance(enemies_data, dict):
+        return
+    for key, section in enemies_data.items():
+        m = _SECTION_RE.match(str(key))
+        if m and isinstance(section, dict):
+            yield int(m.group(1)), [(str(k), v) for k, v in section.items() if isinstance(v, dict)]
+        elif str(key).isdigit() and isinstance(section, list):
+            yield int(key), [(str(e.get("id") or e.get("name") or i), e)
+                             for i, e in enumerate(section) if isinstance(e, dict)]
+
+
+class EnemyTables:
+    """
+    Enemy pools precompiled once per enemies.json version:
+    - pools:  (planet, category) -> [(key, meta), ...]; category None is every enemy on the planet
+    - absent: planet -> names of enemies (unique by name) that do not appear on that planet
+    Categories are matched lowercase.
+    """
+
+    __slots__ = ("pools", "absent", "all_names")
+
+    def __init__(self, enemies_data):
+        self.pools: Dict[Tuple[int, Optional[str]], List[Enemy]] = {}
+        planet_names: Dict[int, set] = {}
+        self.all_names: List[str] = []
+        seen = set()
+        for pid, entries in _iter_sections(enemies_data):
+            names = planet_names.setdefault(pid, set())
+            for key, meta in entries:
+                self.pools.setdefault((pid, None), []).append((key, meta))
+                cat = str(meta.get("category", "")).lower()
+                self.pools.setdefault((pid, cat), []).append((key, meta))
+                nm = str(meta.get("name") or "").strip()
+                if nm:
+                    names.add(nm.lower())
+                    if nm.lower() not in seen:
+                        seen.add(nm.lower())
+                        self.all_names.append(nm)
+        self.absent: Dict[int, List[str]] = {
+            pid: [n for n in self.all_names if n.lower() not in names]
+            for pid, names in planet_names.items()
+        }
+
+    def pool(self, planet_id, category: Optional[str] = None) -> List[Enemy]:
+        key = (int(planet_id), category.lower() if category else None)
+        return self.pools.get(key, [])
+
+    def pick(self, planet_id, category: Optional[str] = None, rng=random) -> Tuple[Optional[str], Optional[dict]]:
+        """One uniformly random (key, meta) from the pool, or (None, None) if it is empty."""
+        pool = self.pool(planet_id, category)
+        if not pool:
+            return None, None
+        return pool[rng.randrange(len(pool))]
+
+    def names_not_on_planet(self, planet_id) -> List[str]:
+        return self.absent.get(int(planet_id), self.all_names)
+
+
+_tables_cache: Tuple[object, Optional[EnemyTables]] = (None, None)
+
+
+def get_enemy_tables(enemies_data=None) -> EnemyTables:
+    """EnemyTables for enemies_data (default: live enemies.json), rebuilt only after a reload."""
+    global _tables_cache
+    if enemies_data is None:
+        enemies_data = gamedata.enemies()
+    data, tables = _tables_cache
+    if tables is not None and enemies_data is data:
+        return tables
+    tables = EnemyTables(enemies_data)
+    if isinstance(enemies_data, gamedata.FrozenDict):
+        _tables_cache = (enemies_data, tables)
+    return tables
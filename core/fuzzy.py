@@ -0,0 +1,184 @@
+# core/fuzzy.py
+"""
+Prefix / typo-tolerant name search used for "did you mean" suggestions.
+
+A NameSearch is built once from (term, key) pairs and then answers:
+  - prefix queries via bisect over a sorted term list (every word start of a
+    multi-word term is indexed too, so "sheet" finds "plasteel sheet")
+  - edit-distance queries via a trigram inverted index: only terms sharing
+    trigrams with the query are scored, never the whole catalogue
+"""
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Candidates scored with full edit distance per query (best trigram overlap first)
+_MAX_FUZZY_CANDIDATES = 32
+
+
+def normalize_term(text) -> str:
+    """Lowercase, trim and treat '_' / '-' as spaces (collapsing runs)."""
+    s = str(text or "").lower().replace("_", " ").replace("-", " ")
+    return " ".join(s.split())
+
+
+def _trigrams(term: str) -> Set[str]:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal-string-alignment distance (insert/delete/substitute/transpose).
+    Returns limit + 1 as soon as the distance is known to exceed `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            v = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                v = min(v, prev2[j - 2] + 1)
+            cur[j] = v
+            if v < row_min:
+                row_min = v
+        if row_min > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def default_max_distance(query: str) -> int:
+    """Allowed typos scale with query length: 1 up to 5 chars, 2 up to 9, else 3."""
+    n = len(query)
+    return 1 if n <= 5 else (2 if n <= 9 else 3)
+
+
+class NameSearch:
+    """
+    Immutable search index over (term, key) pairs. Several terms may map to
+    the same key (name + aliases); results are de-duplicated by key.
+    """
+
+    __slots__ = ("_exact", "_sorted", "_terms", "_grams")
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        self._exact: Dict[str, List[str]] = {}
+        prefix_rows: Set[Tuple[str, str]] = set()
+        for raw, key in entries:
+            term = normalize_term(raw)
+            if not term:
+                continue
+            keys = self._exact.setdefault(term, [])
+            if key not in keys:
+                keys.append(key)
+            words = term.split(" ")
+            for i in range(len(words)):
+                prefix_rows.add((" ".join(words[i:]), key))
+        self._sorted: List[Tuple[str, str]] = sorted(prefix_rows)
+
+        # Trigram postings over distinct searchable terms (full terms + word suffixes)
+        self._terms: List[str] = sorted({t for t, _ in self._sorted})
+        self._grams: Dict[str, List[int]] = {}
+        for tid, term in enumerate(self._terms):
+            for g in _trigrams(term):
+                self._grams.setdefault(g, []).append(tid)
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def exact(self, query) -> List[str]:
+        return list(self._exact.get(normalize_term(query), ()))
+
+    def prefix(self, query, limit: int = 5, accept: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """Keys whose term (or a word-start within it) begins with `query`, shortest term first."""
+        q = normalize_term(query)
+        if not q:
+            return []
+        hits: List[Tuple[int, str, str]] = []
+        i = bisect_left(self._sorted, (q, ""))
+        while i < len(self._sorted) and self._sorted[i][0].startswith(q):
+            term, key = self._sorted[i]
+            if accept is None or accept(key):
+                hits.append((len(term), term, key))
+            i += 1
+        hits.sort()
+        return _dedupe((k for _, _, k in hits), limit)
+
+    def fuzzy(self, query, limit: int = 5, max_distance: Optional[int] = None,
+              accept: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """Keys whose term is within `max_distance` edits of `query`, closest first."""
+        q = normalize_term(query)
+        if not q:
+            return []
+        if max_distance is None:
+            max_distance = default_max_distance(q)
+
+        grams = _trigrams(q)
+        overlap: Dict[int, int] = {}
+        for g in grams:
+            for tid in self._grams.get(g, ()):
+                overlap[tid] = overlap.get(tid, 0) + 1
+        # Each edit touches at most 3 of the query's trigrams, so terms sharing
+        # fewer cannot be within max_distance; skip them before the DP.
+        need = len(grams) - 3 * max_distance
+        lo, hi = len(q) - max_distance, len(q) + max_distance
+        best = sorted(
+            ((tid, n) for tid, n in overlap.items()
+             if n >= need and lo <= len(self._terms[tid]) <= hi),
+            key=lambda kv: -kv[1],
+        )[:_MAX_FUZZY_CANDIDATES]
+
+        scored: List[Tuple[int, int, str]] = []
+        for tid, shared in best:
+            term = self._terms[tid]
+            d = edit_distance(q, term, max_distance)
+            if d <= max_distance:
+                scored.append((d, -shared, term))
+        scored.sort()
+
+        keys: List[str] = []
+        for _, _, term in scored:
+            i = bisect_left(self._sorted, (term, ""))
+            while i < len(self._sorted) and self._sorted[i][0] == term:
+                key = self._sorted[i][1]
+                if accept is None or accept(key):
+                    keys.append(key)
+                i += 1
+        return _dedupe(keys, limit)
+
+    def suggest(self, query, limit: int = 3, accept: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """Prefix matches first, then typo matches, up to `limit` distinct keys."""
+        out = self.prefix(query, limit=limit, accept=accept)
+        if len(out) < limit:
+            for key in self.fuzzy(query, limit=limit, accept=accept):
+                if key not in out:
+                    out.append(key)
+                    if len(out) >= limit:
+                        break
+        return out
+
+
+def _dedupe(keys: Iterable[str], limit: int) -> List[str]:
+    out: List[str] = []
+    seen = set()
+    for k in keys:
+        if k in seen:
+            continue
+        seen.add(k)
+        out.append(k)
+        if len(out) >= limit:
+            break
+    return out
+
+
+def did_you_mean(labels: Iterable[str]) -> str:
+    """Format suggestion labels as a message suffix ('' when there are none)."""
+    labels = [f"**{l}**" for l in labels if l]
+    if not labels:
+        return ""
+    return " Did you mean " + (", ".join(labels[:-1]) + " or " + labels[-1] if len(labels) > 1 else labels[0]) + "?"
@@ -0,0 +1,187 @@
+"""
+Registry for the static game data files in data/ (items, planets, enemies,
+bosses, shop, crafting, ...).
+
+Each file is parsed once and handed out as a shared, read-only view
+(FrozenDict / FrozenList: real dict/list subclasses whose mutators raise
+TypeError). Callers that need to modify something copy it first
+(dict(...), copy.deepcopy(...) both return plain containers).
+
+A file is re-parsed only when its mtime changes. The mtime itself is checked
+at most every GAMEDATA_CHECK_INTERVAL seconds, so hot paths such as `scan`
+do no disk I/O for static data at all. reload() (used by `!reload`) forces a
+re-read of everything.
+"""
+import copy
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from core.constants import (
+    ITEMS_FILE, SHOP_FILE, PLANETS_FILE, BOSSES_FILE, ENEMIES_FILE, CRAFTING_FILE,
+    SUPPLY_CRATES_FILE, RESEARCH_FILE, CREDITSHOP_FILE, RECIPES_FILE, GAMEDATA_CHECK_INTERVAL,
+)
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError("game data is read-only; copy it before modifying (dict(...) / copy.deepcopy(...))")
+
+
+class FrozenDict(dict):
+    """dict that refuses mutation. Copies (dict(), .copy(), deepcopy) are plain dicts."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    pop = popitem = update = clear = _readonly
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        _readonly(self)
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {k: copy.deepcopy(v, memo) for k, v in self.items()}
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """list that refuses mutation. Copies (list(), [:], deepcopy) are plain lists."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(v, memo) for v in self]
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def freeze(value):
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+class _Entry:
+    __slots__ = ("data", "mtime", "checked", "version")
+
+    def __init__(self, data, mtime, checked, version):
+        self.data = data
+        self.mtime = mtime
+        self.checked = checked
+        self.version = version
+
+
+_EMPTY = FrozenDict()
+_entries: Dict[str, _Entry] = {}
+_reload_hooks: List[Callable[[], None]] = []
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _load(path: str, mtime: Optional[float], now: float) -> _Entry:
+    data = _EMPTY
+    if mtime is not None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = freeze(json.load(f))
+        except Exception as e:
+            old = _entries.get(path)
+            print(f"[gamedata] ⚠️ Could not parse {path}: {e}" + ("; keeping the previous version" if old else ""))
+            if old is not None:
+                old.checked = now
+                return old
+    prev = _entries.get(path)
+    entry = _Entry(data, mtime, now, (prev.version + 1) if prev else 1)
+    _entries[path] = entry
+    return entry
+
+
+def get(path: str):
+    """Read-only parsed contents of a static JSON file ({} if it does not exist)."""
+    now = time.monotonic()
+    entry = _entries.get(path)
+    if entry is not None and now - entry.checked < GAMEDATA_CHECK_INTERVAL:
+        return entry.data
+    mtime = _mtime(path)
+    if entry is not None and mtime == entry.mtime:
+        entry.checked = now
+        return entry.data
+    return _load(path, mtime, now).data
+
+
+def version(path: str) -> int:
+    """Bumped every time `path` is (re)parsed; lets derived caches notice reloads."""
+    get(path)
+    return _entries[path].version
+
+
+def reload() -> int:
+    """Force every known file to be re-read on next access and run reload hooks. Returns files dropped."""
+    n = len(_entries)
+    for entry in _entries.values():
+        entry.checked = float("-inf")
+        entry.mtime = None
+    for hook in list(_reload_hooks):
+        try:
+            hook()
+        except Exception as e:
+            print(f"[gamedata] reload hook {getattr(hook, '__name__', hook)} failed: {e}")
+    return n
+
+
+def on_reload(hook: Callable[[], None]) -> Callable[[], None]:
+    """Register a callback run by reload() (e.g. to rebuild an index). Usable as a decorator."""
+    if hook not in _reload_hooks:
+        _reload_hooks.append(hook)
+    return hook
+
+
+# ---------- named accessors ----------
+def items():
+    return get(ITEMS_FILE)
+
+def shop():
+    return get(SHOP_FILE)
+
+def planets():
+    return get(PLANETS_FILE)
+
+def bosses():
+    return get(BOSSES_FILE)
+
+def enemies():
+    return get(ENEMIES_FILE)
+
+def crafting():
+    return get(CRAFTING_FILE)
+
+def supply_crates():
+    return get(SUPPLY_CRATES_FILE)
+
+def research():
+    return get(RESEARCH_FILE)
+
+def creditshop():
+    return get(CREDITSHOP_FILE)
+
+def recipes():
+    return get(RECIPES_FILE)
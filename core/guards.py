@@ -1,6 +1,7 @@
 import time
 from typing import Optional, Set, Dict
 from discord.ext import commands
+from core.shared_state import get_shared_state
 
 # Per-user timestamps for anti-spam
 _last_cmd_ts: Dict[str, float] = {}
@@ -8,6 +9,7 @@ _last_warn_ts: Dict[str, float] = {}
 
 # Per-user pending locks
 # { user_id: { "type": str, "created": float, "allowed": set[str], "note": str } }
+# In the sharded runtime they live in core.shared_state instead, so every shard process sees them.
 _user_locks: Dict[str, Dict] = {}
 
 GUARD_SPAM_SECONDS = 1.0
@@ -16,43 +18,62 @@ EXEMPT_FROM_RATELIMIT = {"cancel"}  # allow quick cancel during interactive flow
 
 # ---------- Lock helpers ----------
 def set_lock(user_id: str, lock_type: str, allowed: Optional[Set[str]] = None, note: str = ""):
-    _user_locks[str(user_id)] = {
+    lock = {
         "type": lock_type,
         "created": time.time(),
         "allowed": set(allowed or set()),
         "note": note or lock_type,
     }
+    shared = get_shared_state()
+    if shared is not None:
+        shared.set_lock(str(user_id), lock)
+    else:
+        _user_locks[str(user_id)] = lock
 
 def clear_lock(user_id: str):
-    _user_locks.pop(str(user_id), None)
+    shared = get_shared_state()
+    if shared is not None:
+        shared.clear_lock(str(user_id))
+    else:
+        _user_locks.pop(str(user_id), None)
 
 def get_lock(user_id: str) -> Optional[Dict]:
+    shared = get_shared_state()
+    if shared is not None:
+        return shared.get_lock(str(user_id))
     return _user_locks.get(str(user_id))
 
 def has_lock(user_id: str) -> bool:
-    return str(user_id) in _user_locks
+    return get_lock(user_id) is not None
+
+def lock_hint(lock: Dict) -> str:
+    """Short explanation of why a pending lock blocks other commands."""
+    if lock["type"] == "research":
+        return "Finish your research first (reply with the option number or use `!cancel`)."
+    if lock["type"] == "bossfight":
+        return "You’re in a bossfight. Other commands are disabled until it ends."
+    return f"Pending action: {lock['note']}. Complete it first."
+
+def blocking_lock(ctx, extra_allowed: Optional[Set[str]] = None) -> Optional[Dict]:
+    """The author's pending lock if it does not allow ctx.command, else None."""
+    lock = get_lock(str(ctx.author.id))
+    if not lock:
+        return None
+    cmd_name = (ctx.command.name if getattr(ctx, "command", None) else "").lower()
+    if cmd_name in set(lock["allowed"]) | set(extra_allowed or ()):
+        return None
+    return lock
 
 # ---------- Decorator you can add on commands to enforce no-lock ----------
 def require_no_lock(extra_allowed: Optional[Set[str]] = None):
     extra_allowed = set(extra_allowed or set())
     async def predicate(ctx: commands.Context) -> bool:
-        uid = str(ctx.author.id)
-        lock = get_lock(uid)
+        lock = blocking_lock(ctx, extra_allowed)
         if not lock:
             return True
-        cmd_name = (ctx.command.name if ctx.command else "").lower()
-        allowed = set(lock["allowed"]) | extra_allowed
-        if cmd_name in allowed:
-            return True
         # Send a concise, contextual hint
-        if lock["type"] == "research":
-            hint = "Finish your research first (reply with the option number or use `!cancel`)."
-        elif lock["type"] == "bossfight":
-            hint = "You’re in a bossfight. Other commands are disabled until it ends."
-        else:
-            hint = f"Pending action: {lock['note']}. Complete it first."
         try:
-            await ctx.send(f"⏳ {hint}")
+            await ctx.send(f"⏳ {lock_hint(lock)}")
         except Exception:
             pass
         return False
@@ -78,7 +99,7 @@ async def global_command_guard(ctx: commands.Context) -> bool:
             return False
 
     # 2) Pending locks
-    lock = _user_locks.get(uid)
+    lock = get_lock(uid)
     if lock:
         allowed = lock["allowed"]
         if cmd_name not in allowed:
@@ -86,13 +107,7 @@ async def global_command_guard(ctx: commands.Context) -> bool:
             if now - last_warn >= WARN_SPAM_SECONDS:
                 _last_warn_ts[uid] = now
                 try:
-                    if lock["type"] == "research":
-                        hint = "Finish your research first (reply with the option number or use `!cancel`)."
-                    elif lock["type"] == "bossfight":
-                        hint = "You’re in a bossfight. Other commands are disabled until it ends."
-                    else:
-                        hint = f"Pending action: {lock['note']}. Complete it first."
-                    await ctx.send(f"⏳ {hint}")
+                    await ctx.send(f"⏳ {lock_hint(lock)}")
                 except Exception:
                     pass
             return False
@@ -1,16 +1,182 @@
-from core.shared import load_json
+from typing import Dict, List, Optional, Tuple
+
+from core import gamedata
+from core.fuzzy import NameSearch
 from core.emoji_helper import get_item_emoji, format_item_display
 
-ITEMS_FILE = "data/items.json"
 
-def get_item_by_id(items, item_id):
-    for category in items.values():
-        if item_id in category:
-            return category[item_id]
-    return None
+def normalize_item_name(text) -> str:
+    """Case/separator-insensitive form used for name and alias matching."""
+    return str(text).lower().strip().replace("_", " ").replace("-", " ")
+
+
+class ItemIndex:
+    """
+    Lookup tables over items.json, built once per catalogue version:
+    - by_id:    item_id -> (category, item)
+    - by_name:  normalized name  -> [item_id, ...]  (catalogue order)
+    - by_alias: normalized alias -> [item_id, ...]
+    Flat (uncategorized) catalogues index with category None.
+    """
+
+    __slots__ = ("by_id", "by_name", "by_alias")
+
+    def __init__(self, items_data):
+        self.by_id: Dict[str, Tuple[Optional[str], dict]] = {}
+        self.by_name: Dict[str, List[str]] = {}
+        self.by_alias: Dict[str, List[str]] = {}
+        for category, iid, item in _iter_categorized(items_data):
+            sid = str(iid)
+            if sid in self.by_id:
+                continue  # first category wins, like the old linear scans
+            self.by_id[sid] = (category, item)
+            if not isinstance(item, dict):
+                continue
+            name = item.get("name")
+            if isinstance(name, str) and name.strip():
+                self.by_name.setdefault(normalize_item_name(name), []).append(sid)
+            for alias in item.get("aliases") or []:
+                if isinstance(alias, str) and alias.strip():
+                    ids = self.by_alias.setdefault(normalize_item_name(alias), [])
+                    if sid not in ids:
+                        ids.append(sid)
+
+    def get(self, item_id) -> Optional[dict]:
+        hit = self.by_id.get(str(item_id))
+        return hit[1] if hit else None
+
+    def category_of(self, item_id) -> Optional[str]:
+        hit = self.by_id.get(str(item_id))
+        return hit[0] if hit else None
+
+    def ids_for(self, query, match_id: bool = False) -> List[str]:
+        """Item ids whose name (first) or alias matches query; optionally the raw id too."""
+        q = normalize_item_name(query)
+        out = list(self.by_name.get(q, ()))
+        for sid in self.by_alias.get(q, ()):
+            if sid not in out:
+                out.append(sid)
+        if match_id:
+            raw = str(query).strip()
+            for cand in (raw, raw.lower()):
+                if cand in self.by_id and cand not in out:
+                    out.insert(0, cand)
+                    break
+        return out
+
+    def id_for_name(self, name) -> Optional[str]:
+        """First item id with exactly this (normalized) name, ignoring aliases."""
+        ids = self.by_name.get(normalize_item_name(name))
+        return ids[0] if ids else None
+
+    def resolve(self, query, category_filter=None, match_id: bool = False):
+        """(category, item_id, item) for the first match of query, or (None, None, None)."""
+        allowed = set(category_filter) if category_filter else None
+        for sid in self.ids_for(query, match_id=match_id):
+            category, item = self.by_id[sid]
+            if allowed is None or category in allowed:
+                return category, sid, item
+        return None, None, None
+
+
+def _iter_categorized(items_data):
+    """Yield (category, item_id, item) for category-grouped or flat items.json data."""
+    if not isinstance(items_data, dict):
+        return
+    if items_data and all(isinstance(v, dict) and "name" in v for v in items_data.values()):
+        for iid, itm in items_data.items():
+            yield None, iid, itm
+        return
+    for cat, group in items_data.items():
+        if isinstance(group, dict):
+            for iid, itm in group.items():
+                yield cat, iid, itm
+
+
+_index_cache: Tuple[object, Optional[ItemIndex]] = (None, None)
+
+
+def get_item_index(items_data=None) -> ItemIndex:
+    """
+    ItemIndex for items_data (default: the live items.json). The index for the
+    shared read-only catalogue is built once and rebuilt only after a reload;
+    other (mutable) dicts get a fresh index per call.
+    """
+    global _index_cache
+    if items_data is None:
+        items_data = gamedata.items()
+    data, index = _index_cache
+    if index is not None and items_data is data:
+        return index
+    index = ItemIndex(items_data)
+    if isinstance(items_data, gamedata.FrozenDict):
+        _index_cache = (items_data, index)
+    return index
+
+
+
+_search_cache: Tuple[object, object, Optional[NameSearch]] = (None, None, None)
+
+
+def get_item_search(items_data=None) -> NameSearch:
+    """
+    Prefix/typo search over item ids, names and aliases, plus the recipe names
+    and aliases from crafting.json for recipes whose output is an item.
+    Cached like get_item_index (rebuilt after items.json or crafting.json reloads).
+    """
+    global _search_cache
+    if items_data is None:
+        items_data = gamedata.items()
+    recipes = (gamedata.crafting() or {}).get("recipes") or {}
+    data, recs, search = _search_cache
+    if search is not None and items_data is data and recipes is recs:
+        return search
+
+    index = get_item_index(items_data)
+    entries: List[Tuple[str, str]] = []
+    for sid, (_, item) in index.by_id.items():
+        entries.append((sid, sid))
+        if isinstance(item, dict):
+            entries.append((item.get("name") or "", sid))
+            entries.extend((a, sid) for a in item.get("aliases") or [] if isinstance(a, str))
+    for rid, recipe in recipes.items():
+        sid = str(rid)
+        if sid in index.by_id and isinstance(recipe, dict):
+            entries.append((recipe.get("name") or "", sid))
+            entries.extend((a, sid) for a in recipe.get("aliases") or [] if isinstance(a, str))
+
+    search = NameSearch(entries)
+    if isinstance(items_data, gamedata.FrozenDict):
+        _search_cache = (items_data, recipes, search)
+    return search
+
+
+def suggest_item_names(query, items_data=None, owned=None, category_filter=None, limit: int = 3) -> List[str]:
+    """
+    "Did you mean" candidates (item display names) for an unresolved query.
+    With `owned` (an inventory dict), items the player holds are suggested first.
+    """
+    index = get_item_index(items_data)
+    search = get_item_search(items_data)
+    allowed = set(category_filter) if category_filter else None
+
+    def in_category(sid: str) -> bool:
+        return allowed is None or index.category_of(sid) in allowed
+
+    ids: List[str] = []
+    if owned:
+        ids = search.suggest(query, limit=limit,
+                             accept=lambda sid: in_category(sid) and int(owned.get(sid, 0) or 0) > 0)
+    if len(ids) < limit:
+        for sid in search.suggest(query, limit=limit, accept=in_category):
+            if sid not in ids:
+                ids.append(sid)
+                if len(ids) >= limit:
+                    break
+    return [index.get(sid).get("name", sid) for sid in ids]
 
 def load_items():
-    return load_json(ITEMS_FILE)
+    return gamedata.items()
 
 def iterate_all_items(items_data):
     """Yield (item_id, item_dict) for both flat and category-grouped items.json structures."""
@@ -34,20 +200,12 @@ def get_item_by_id(items_data, item_id):
     Look for an item in items_data (nested by category) by ID.
     Returns the item dict or None if not found.
     """
-    item_id = str(item_id)
-    for category in items_data.values():  # consumables, weapons, armor, etc.
-        if item_id in category:
-            return category[item_id]
-    return None
+    return get_item_index(items_data).get(item_id)
 
 
 def find_item(items, item_id):
     """Find an item by ID across all categories."""
-    item_id = str(item_id)
-    for category in items.values():  # consumables, weapons, armor
-        if item_id in category:
-            return category[item_id]
-    return None
+    return get_item_index(items).get(item_id)
 
 
 def get_item_display_name(item_data, item_id=None, bot=None):
@@ -79,41 +237,7 @@ def resolve_item_by_name_or_alias(items_data, query, category_filter=None):
         query: The search term (can be name or alias)
         category_filter: Optional list of category names to search within
     """
-    query_normalized = query.lower().strip().replace("_", " ").replace("-", " ")
-    
-    # Determine which categories to search
-    categories_to_search = {}
-    if category_filter:
-        for cat in category_filter:
-            if cat in items_data:
-                categories_to_search[cat] = items_data[cat]
-    else:
-        categories_to_search = items_data
-    
-    # Search through categories
-    for category_name, category_items in categories_to_search.items():
-        if not isinstance(category_items, dict):
-            continue
-            
-        for item_key, item_data in category_items.items():
-            if not isinstance(item_data, dict):
-                continue
-            
-            # Check item name
-            item_name = item_data.get("name", "")
-            name_normalized = item_name.lower().strip().replace("_", " ").replace("-", " ")
-            
-            if query_normalized == name_normalized:
-                return (category_name, item_key, item_data)
-            
-            # Check aliases
-            aliases = item_data.get("aliases", [])
-            for alias in aliases:
-                alias_normalized = alias.lower().strip().replace("_", " ").replace("-", " ")
-                if query_normalized == alias_normalized:
-                    return (category_name, item_key, item_data)
-    
-    return (None, None, None)
+    return get_item_index(items_data).resolve(query, category_filter=category_filter)
 
 
 def get_inventory_key_for_item(item_name):
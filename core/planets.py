@@ -1,7 +1,5 @@
-from core.shared import load_json
-
-PLANETS_FILE = "data/planets.json"
+from core import gamedata
 
 def get_planet_name(planet_id):
-    planets = load_json(PLANETS_FILE)
+    planets = gamedata.planets()
     return planets.get(str(planet_id), {}).get("name", f"Planet {planet_id}")
\ No newline at end of file
@@ -0,0 +1,460 @@
+"""
+Storage backends for core.player_store.PlayerStore.
+
+Every backend implements:
+- load_all() -> {uid: profile}          (called once when the store warms up)
+- write(profiles, dirty_uids) -> None   (persist the dirty profiles)
+and may implement:
+- compact(profiles) -> None             (fold incremental writes into a snapshot)
+- read(uid) -> profile | None           (fresh copy of one profile from storage)
+- compare_and_swap(uid, expected_rev, profile) -> bool
+                                        (write only if the stored "rev" is still expected_rev)
+- compare_and_swap_many([(uid, expected_rev, profile)]) -> uid | None
+                                        (all-or-nothing group CAS; returns the first
+                                         conflicting uid, None when everything was written)
+Backends with read + compare_and_swap + compare_and_swap_many (sqlite, files)
+can be shared by several bot processes (PLAYERS_SHARED).
+
+Run as a script for one-shot migrations:
+    python -m core.player_backends import [players.json] [players.sqlite3]
+    python -m core.player_backends export [players.sqlite3] [players.json]
+    python -m core.player_backends split  [players.json] [players/]
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, files CAS is then only safe within one process
+    fcntl = None
+
+from core.shared import load_json, save_json
+
+
+def profile_rev(profile) -> int:
+    """The profile's revision counter (0 for profiles saved before revs existed)."""
+    try:
+        return int(profile.get("rev", 0) or 0) if isinstance(profile, dict) else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+class JsonFileBackend:
+    """Monolithic players.json: every flush rewrites the whole file."""
+
+    name = "json"
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load_all(self) -> Dict[str, dict]:
+        data = load_json(self.path)
+        return data if isinstance(data, dict) else {}
+
+    def write(self, profiles: Dict[str, dict], dirty_uids: Iterable[str]) -> None:
+        save_json(self.path, profiles)
+
+
+class SqliteBackend:
+    """One row per player (uid -> JSON text). A flush upserts only the dirty rows."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            d = os.path.dirname(self.path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            # timeout: other bot processes may hold the write lock briefly
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS players ("
+                " uid TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL,"
+                " updated_at INTEGER NOT NULL,"
+                " rev INTEGER NOT NULL DEFAULT 0)"
+            )
+            cols = {row[1] for row in conn.execute("PRAGMA table_info(players)")}
+            if "rev" not in cols:
+                conn.execute("ALTER TABLE players ADD COLUMN rev INTEGER NOT NULL DEFAULT 0")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def load_all(self) -> Dict[str, dict]:
+        out: Dict[str, dict] = {}
+        for uid, data in self._connect().execute("SELECT uid, data FROM players"):
+            try:
+                prof = json.loads(data)
+            except Exception:
+                continue
+            if isinstance(prof, dict):
+                out[str(uid)] = prof
+        return out
+
+    def write(self, profiles: Dict[str, dict], dirty_uids: Iterable[str]) -> None:
+        now = int(time.time())
+        upserts, deletes = [], []
+        for uid in dirty_uids:
+            prof = profiles.get(uid)
+            if prof is None:
+                deletes.append((uid,))
+            else:
+                upserts.append((uid, json.dumps(prof, separators=(",", ":")), now, profile_rev(prof)))
+        conn = self._connect()
+        with conn:
+            if upserts:
+                conn.executemany(
+                    "INSERT INTO players (uid, data, updated_at, rev) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(uid) DO UPDATE SET data=excluded.data, updated_at=excluded.updated_at, rev=excluded.rev",
+                    upserts,
+                )
+            if deletes:
+                conn.executemany("DELETE FROM players WHERE uid = ?", deletes)
+
+    def read(self, uid: str) -> Optional[dict]:
+        row = self._connect().execute("SELECT data FROM players WHERE uid = ?", (str(uid),)).fetchone()
+        if row is None:
+            return None
+        try:
+            prof = json.loads(row[0])
+        except Exception:
+            return None
+        return prof if isinstance(prof, dict) else None
+
+    def compare_and_swap(self, uid: str, expected_rev: int, profile: dict) -> bool:
+        """Single conditional UPDATE (or INSERT for a new player when expected_rev is 0)."""
+        uid = str(uid)
+        data = json.dumps(profile, separators=(",", ":"))
+        rev, now = profile_rev(profile), int(time.time())
+        conn = self._connect()
+        with conn:
+            cur = conn.execute(
+                "UPDATE players SET data = ?, updated_at = ?, rev = ? WHERE uid = ? AND rev = ?",
+                (data, now, rev, uid, int(expected_rev)),
+            )
+            if cur.rowcount == 0 and int(expected_rev) == 0:
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO players (uid, data, updated_at, rev) VALUES (?, ?, ?, ?)",
+                    (uid, data, now, rev),
+                )
+            return cur.rowcount == 1
+
+    def compare_and_swap_many(self, items) -> Optional[str]:
+        """One BEGIN IMMEDIATE transaction: check every expected rev, then write every profile (or none)."""
+        now = int(time.time())
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for uid, expected_rev, _ in items:
+                row = conn.execute("SELECT rev FROM players WHERE uid = ?", (str(uid),)).fetchone()
+                if (int(row[0]) if row else 0) != int(expected_rev):
+                    conn.rollback()
+                    return str(uid)
+            conn.executemany(
+                "INSERT INTO players (uid, data, updated_at, rev) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(uid) DO UPDATE SET data=excluded.data, updated_at=excluded.updated_at, rev=excluded.rev",
+                [(str(uid), json.dumps(prof, separators=(",", ":")), now, profile_rev(prof)) for uid, _, prof in items],
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return None
+
+
+class ShardedFilesBackend:
+    """
+    One JSON file per player: <root>/<shard>/<uid>.json.
+    A flush atomically rewrites only the dirty players' files.
+
+    The shard is the first two hex digits of md5(uid) (256 directories).
+    Raw uid prefixes are not used because Discord snowflakes start with a
+    timestamp, so their leading digits cluster into a handful of directories.
+    """
+
+    name = "files"
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @staticmethod
+    def shard_for(uid: str) -> str:
+        return hashlib.md5(str(uid).encode("utf-8")).hexdigest()[:2]
+
+    def path_for(self, uid: str) -> str:
+        uid = str(uid)
+        return os.path.join(self.root, self.shard_for(uid), f"{uid}.json")
+
+    def _read(self, path: str):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                prof = json.load(f)
+        except Exception:
+            return None
+        return prof if isinstance(prof, dict) else None
+
+    def load_all(self) -> Dict[str, dict]:
+        out: Dict[str, dict] = {}
+        if not os.path.isdir(self.root):
+            return out
+        with os.scandir(self.root) as top:
+            for entry in top:
+                if entry.is_dir():
+                    with os.scandir(entry.path) as shard:
+                        for f in shard:
+                            if f.name.endswith(".json"):
+                                prof = self._read(f.path)
+                                if prof is not None:
+                                    out[f.name[:-5]] = prof
+                elif entry.name.endswith(".json"):
+                    # Flat legacy layout: <root>/<uid>.json (sharded copy wins)
+                    prof = self._read(entry.path)
+                    if prof is not None:
+                        out.setdefault(entry.name[:-5], prof)
+        return out
+
+    def write(self, profiles: Dict[str, dict], dirty_uids: Iterable[str]) -> None:
+        for uid in dirty_uids:
+            path = self.path_for(uid)
+            prof = profiles.get(uid)
+            if prof is None:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            save_json(path, prof)
+
+    @contextmanager
+    def _locked(self, path: str):
+        """Exclusive advisory lock on <path>.lock, held across processes."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".lock", "a") as lf:
+            if fcntl is not None:
+                fcntl.flock(lf, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lf, fcntl.LOCK_UN)
+
+    def read(self, uid: str) -> Optional[dict]:
+        return self._read(self.path_for(uid))
+
+    def compare_and_swap(self, uid: str, expected_rev: int, profile: dict) -> bool:
+        """Under the player's file lock: compare the on-disk rev, then atomically replace the file."""
+        path = self.path_for(uid)
+        with self._locked(path):
+            if profile_rev(self._read(path)) != int(expected_rev):
+                return False
+            save_json(path, profile)
+            return True
+
+    def compare_and_swap_many(self, items) -> Optional[str]:
+        """
+        Take every player's file lock (sorted, so concurrent groups cannot
+        deadlock), check every rev, then replace the files. Other processes never
+        see half of the group written; a crash mid-write still can leave it so.
+        """
+        items = sorted(items, key=lambda it: self.path_for(it[0]))
+        with ExitStack() as stack:
+            for uid, _, _ in items:
+                stack.enter_context(self._locked(self.path_for(uid)))
+            for uid, expected_rev, _ in items:
+                if profile_rev(self._read(self.path_for(uid))) != int(expected_rev):
+                    return str(uid)
+            for uid, _, prof in items:
+                save_json(self.path_for(uid), prof)
+        return None
+
+
+class JournalBackend:
+    """
+    players.json snapshot + append-only journal of per-profile deltas.
+
+    A flush appends one compact JSON line per dirty profile:
+        {"u": uid, "s": {changed top-level keys}, "d": [removed keys]}
+        {"u": uid, "x": 1}                     (profile deleted)
+    so a save costs O(size of the change), not O(all players).
+    compact() writes the full snapshot and truncates the journal.
+    load_all() replays snapshot + journal, ignoring a torn final line
+    left by a crash mid-append.
+
+    Deltas are computed against the last persisted version of each profile.
+    That relies on PlayerStore never mutating a cached profile in place
+    (put() always stores a fresh copy).
+    """
+
+    name = "journal"
+
+    def __init__(self, snapshot_path: str, journal_path: str):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        # uid -> shallow copy of the last persisted profile
+        self._persisted: Dict[str, dict] = {}
+
+    def load_all(self) -> Dict[str, dict]:
+        data = load_json(self.snapshot_path)
+        profiles: Dict[str, dict] = data if isinstance(data, dict) else {}
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        rec = json.loads(line)
+                    except Exception:
+                        continue  # torn write from a crash; later lines (if any) still apply
+                    self._apply(profiles, rec)
+        self._persisted = {uid: dict(p) for uid, p in profiles.items() if isinstance(p, dict)}
+        return profiles
+
+    @staticmethod
+    def _apply(profiles: Dict[str, dict], rec: dict) -> None:
+        uid = str(rec.get("u", ""))
+        if not uid:
+            return
+        if rec.get("x"):
+            profiles.pop(uid, None)
+            return
+        prof = profiles.get(uid)
+        if not isinstance(prof, dict):
+            prof = profiles[uid] = {}
+        prof.update(rec.get("s") or {})
+        for k in rec.get("d") or []:
+            prof.pop(k, None)
+
+    def _delta(self, uid: str, prof) -> dict | None:
+        if prof is None:
+            return {"u": uid, "x": 1} if uid in self._persisted else None
+        old = self._persisted.get(uid) or {}
+        changed = {k: v for k, v in prof.items() if k not in old or (old[k] is not v and old[k] != v)}
+        removed = [k for k in old if k not in prof]
+        if not changed and not removed:
+            return None
+        rec = {"u": uid, "s": changed}
+        if removed:
+            rec["d"] = removed
+        return rec
+
+    def write(self, profiles: Dict[str, dict], dirty_uids: Iterable[str]) -> None:
+        lines = []
+        for uid in dirty_uids:
+            prof = profiles.get(uid)
+            rec = self._delta(uid, prof)
+            if rec is None:
+                continue
+            lines.append(json.dumps(rec, separators=(",", ":")))
+            if prof is None:
+                self._persisted.pop(uid, None)
+            else:
+                self._persisted[uid] = dict(prof)
+        if not lines:
+            return
+        d = os.path.dirname(self.journal_path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+
+    def compact(self, profiles: Dict[str, dict]) -> None:
+        """
+        Write the full snapshot, then truncate the journal.
+        A crash between the two steps is harmless: replaying the old journal
+        over the new snapshot ends in the same state.
+        """
+        save_json(self.snapshot_path, profiles)
+        open(self.journal_path, "w", encoding="utf-8").close()
+        self._persisted = {uid: dict(p) for uid, p in profiles.items() if isinstance(p, dict)}
+
+    def journal_size(self) -> int:
+        try:
+            return os.path.getsize(self.journal_path)
+        except OSError:
+            return 0
+
+
+def make_backend(kind: str, players_file: str, db_file: str, profile_dir: str, journal_file: str):
+    """Build the backend named by PLAYERS_BACKEND (unknown values fall back to json)."""
+    if kind == "journal":
+        return JournalBackend(players_file, journal_file)
+    if kind == "sqlite":
+        return SqliteBackend(db_file)
+    if kind == "files":
+        return ShardedFilesBackend(profile_dir)
+    return JsonFileBackend(players_file)
+
+
+# ---------- one-shot migration helpers ----------
+def import_players_json(json_path: str, db_path: str) -> int:
+    """Copy every profile from a players.json blob into the SQLite store. Returns rows written."""
+    profiles = JsonFileBackend(json_path).load_all()
+    db = SqliteBackend(db_path)
+    try:
+        db.write(profiles, list(profiles.keys()))
+    finally:
+        db.close()
+    return len(profiles)
+
+
+def export_players_json(db_path: str, json_path: str) -> int:
+    """Dump the SQLite store to a players.json-shaped file (e.g. to roll back to the json backend). Returns profiles written."""
+    db = SqliteBackend(db_path)
+    try:
+        profiles = db.load_all()
+    finally:
+        db.close()
+    save_json(json_path, profiles)
+    return len(profiles)
+
+
+def split_players_json(json_path: str, profile_dir: str) -> int:
+    """Split a players.json blob into per-player shard files. Returns files written."""
+    profiles = JsonFileBackend(json_path).load_all()
+    ShardedFilesBackend(profile_dir).write(profiles, list(profiles.keys()))
+    return len(profiles)
+
+
+if __name__ == "__main__":
+    from core.constants import PLAYERS_FILE, PLAYERS_DB_FILE, PROFILE_DIR
+
+    args = sys.argv[1:]
+    if not args or args[0] not in ("import", "export", "split"):
+        print(__doc__)
+        sys.exit(1)
+    if args[0] == "import":
+        src = args[1] if len(args) > 1 else PLAYERS_FILE
+        dst = args[2] if len(args) > 2 else PLAYERS_DB_FILE
+        n = import_players_json(src, dst)
+        print(f"[players] Imported {n} profiles from {src} into {dst}")
+    elif args[0] == "split":
+        src = args[1] if len(args) > 1 else PLAYERS_FILE
+        dst = args[2] if len(args) > 2 else PROFILE_DIR
+        n = split_players_json(src, dst)
+        print(f"[players] Split {n} profiles from {src} into {dst}")
+    else:
+        src = args[1] if len(args) > 1 else PLAYERS_DB_FILE
+        dst = args[2] if len(args) > 2 else PLAYERS_FILE
+        n = export_players_json(src, dst)
+        print(f"[players] Exported {n} profiles from {src} to {dst}")
@@ -0,0 +1,360 @@
+import asyncio
+import atexit
+import copy
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from core.constants import (
+    PLAYERS_FILE, PLAYERS_DB_FILE, PLAYERS_EXPORT_FILE, PLAYERS_BACKEND, PROFILE_DIR,
+    PLAYERS_JOURNAL_FILE, PLAYERS_FLUSH_INTERVAL, PLAYERS_FLUSH_THRESHOLD, PLAYERS_COMPACT_INTERVAL,
+    PLAYERS_SHARED,
+)
+from core.shared import save_json
+from core.player_backends import make_backend, profile_rev
+from core.change_tracking import TrackedProfile
+
+
+class ProfileConflict(Exception):
+    """Raised when a save's expected rev no longer matches the stored profile (someone else saved first)."""
+
+
+class PlayerStore:
+    """
+    Process-wide in-memory cache of every player profile.
+
+    - Profiles are read from the backend once (lazily, on first access).
+    - get() hands out deep copies so callers can mutate freely without
+      touching the cache until they put() the profile back.
+    - put() marks the profile dirty; dirty profiles are written back when
+      `flush_threshold` of them have accumulated, when `flush_interval`
+      seconds have passed since the last flush, or when flush() is called.
+    - How a flush hits disk is up to the backend (see core/player_backends.py).
+    - Every write bumps the profile's "rev". put()/patch() accept expected_rev
+      and raise ProfileConflict if the stored rev moved on (compare-and-swap).
+    - shared=True (several processes on one sqlite/files store): single-profile
+      reads re-read the backend, and every write is a write-through
+      backend.compare_and_swap() instead of a batched flush. Writes inside
+      batch() are staged and committed together by one
+      backend.compare_and_swap_many() when the block ends.
+    """
+
+    def __init__(self, backend, flush_interval: float = 5.0, flush_threshold: int = 50, shared: bool = False):
+        self.backend = backend
+        self.shared = bool(shared) and all(
+            hasattr(backend, m) for m in ("compare_and_swap", "compare_and_swap_many", "read"))
+        if shared and not self.shared:
+            print(f"[players] ⚠️ Backend '{getattr(backend, 'name', backend)}' cannot be shared between processes; running unshared.")
+        self.flush_interval = float(flush_interval)
+        self.flush_threshold = int(flush_threshold)
+        self._profiles: Optional[Dict[str, dict]] = None
+        self._dirty: set[str] = set()
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        # Shared mode, inside batch(): uid -> (rev it was loaded at, cached profile before the batch)
+        self._staged: Dict[str, tuple] = {}
+
+    # ---------- loading ----------
+    def _ensure_loaded(self) -> Dict[str, dict]:
+        if self._profiles is None:
+            self._profiles = self.backend.load_all()
+            self._last_flush = time.monotonic()
+        return self._profiles
+
+    def reload(self) -> None:
+        """Flush pending writes, then drop the cache so the next access re-reads disk."""
+        with self._lock:
+            self.flush()
+            self._profiles = None
+
+    def _refresh(self, uid: str) -> Optional[dict]:
+        """Cached profile; in shared mode re-read from the backend first (other processes may have saved)."""
+        profiles = self._ensure_loaded()
+        if self.shared and uid not in self._dirty and uid not in self._staged:
+            prof = self.backend.read(uid)
+            if prof is None:
+                profiles.pop(uid, None)
+            else:
+                profiles[uid] = prof
+        return profiles.get(uid)
+
+    # ---------- reads ----------
+    def get(self, user_id) -> Optional[dict]:
+        with self._lock:
+            prof = self._refresh(str(user_id))
+            return copy.deepcopy(prof) if prof is not None else None
+
+    def get_tracked(self, user_id) -> Optional[TrackedProfile]:
+        """Change-tracking copy of a profile (see core/change_tracking.py)."""
+        with self._lock:
+            prof = self._refresh(str(user_id))
+            return TrackedProfile(prof) if isinstance(prof, dict) else None
+
+    def uids(self) -> list:
+        with self._lock:
+            return list(self._ensure_loaded().keys())
+
+    def exists(self, user_id) -> bool:
+        with self._lock:
+            return self._refresh(str(user_id)) is not None
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Deep copy of every profile (uid -> profile)."""
+        with self._lock:
+            return copy.deepcopy(self._ensure_loaded())
+
+    def iter_profiles(self) -> Iterator[dict]:
+        """
+        Yield the cached profiles themselves (no copy) for read-only scans.
+        Callers must not mutate what they receive.
+        """
+        with self._lock:
+            profiles = list(self._ensure_loaded().values())
+        for prof in profiles:
+            if isinstance(prof, dict):
+                yield prof
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ensure_loaded())
+
+    # ---------- writes ----------
+    def _store(self, uid: str, new: dict, expected_rev: Optional[int]) -> int:
+        """Install `new` (a private copy) as rev+1 if the stored rev matches. Returns the new rev."""
+        profiles = self._ensure_loaded()
+        cur_rev = profile_rev(profiles.get(uid))
+        if expected_rev is None:
+            expected_rev = cur_rev
+        elif int(expected_rev) != cur_rev:
+            raise ProfileConflict(uid)
+        new["rev"] = int(expected_rev) + 1
+        if self.shared and self._batch_depth:
+            # Written by _commit_staged() together with the rest of the batch
+            self._staged.setdefault(uid, (cur_rev, profiles.get(uid)))
+            profiles[uid] = new
+            return new["rev"]
+        if self.shared:
+            if not self.backend.compare_and_swap(uid, expected_rev, new):
+                self._refresh(uid)
+                raise ProfileConflict(uid)
+            profiles[uid] = new
+            return new["rev"]
+        profiles[uid] = new
+        self._dirty.add(uid)
+        self._maybe_flush()
+        return new["rev"]
+
+    def put(self, user_id, profile: dict, expected_rev: Optional[int] = None) -> int:
+        """Store a copy of `profile` and mark it dirty. Returns the new rev."""
+        with self._lock:
+            return self._store(str(user_id), copy.deepcopy(profile), expected_rev)
+
+    def patch(self, user_id, set_fields: dict, unset_fields=(), entries: Optional[Dict[str, dict]] = None,
+              expected_rev: Optional[int] = None) -> int:
+        """
+        Apply a delta to one cached profile and mark it dirty:
+        - set_fields: top-level key -> new value (must already be a private copy)
+        - unset_fields: top-level keys to remove
+        - entries: {map_key: {entry: value or None}} per-entry updates of a nested
+          map (e.g. inventory); None removes the entry.
+        Copy-on-write: only the top-level dict and the touched maps are copied, so
+        snapshots held by backends (journal) never change underneath them.
+        Returns the new rev; raises ProfileConflict if expected_rev is stale.
+        """
+        uid = str(user_id)
+        with self._lock:
+            profiles = self._ensure_loaded()
+            cur = profiles.get(uid)
+            new = dict(cur) if isinstance(cur, dict) else {}
+            new.update(set_fields)
+            for k in unset_fields:
+                new.pop(k, None)
+            for key, updates in (entries or {}).items():
+                sub = new.get(key)
+                sub = dict(sub) if isinstance(sub, dict) else {}
+                for ek, ev in updates.items():
+                    if ev is None:
+                        sub.pop(ek, None)
+                    else:
+                        sub[ek] = ev
+                new[key] = sub
+            return self._store(uid, new, expected_rev)
+
+    def replace_all(self, data: Dict[str, dict]) -> None:
+        """Replace the whole cache (legacy save_players path) and flush immediately."""
+        with self._lock:
+            self._profiles = copy.deepcopy(data) if isinstance(data, dict) else {}
+            self._dirty.update(self._profiles.keys())
+            self.flush()
+
+    @contextmanager
+    def batch(self):
+        """
+        with store.batch(): ... group several put()/patch() calls.
+        The store lock is held for the whole block and no flush happens inside
+        it, so the group becomes visible all at once and reaches the backend
+        in a single write().
+        Shared mode: the writes are staged and committed by one
+        compare_and_swap_many() at the end. If any expected rev is stale (or
+        the block raises) nothing is written and ProfileConflict is raised.
+        """
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                if self._batch_depth == 1:
+                    self._drop_staged()
+                raise
+            finally:
+                self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._commit_staged()
+                self._maybe_flush()
+
+    def _commit_staged(self) -> None:
+        if not self._staged:
+            return
+        profiles = self._ensure_loaded()
+        items = [(uid, rev, profiles[uid]) for uid, (rev, _) in self._staged.items()]
+        conflict = self.backend.compare_and_swap_many(items)
+        if conflict is not None:
+            self._drop_staged()
+            raise ProfileConflict(conflict)
+        self._staged.clear()
+
+    def _drop_staged(self) -> None:
+        """Undo staged writes in the cache; the next read re-reads them from the backend."""
+        profiles = self._ensure_loaded()
+        for uid, (_, old) in self._staged.items():
+            if old is None:
+                profiles.pop(uid, None)
+            else:
+                profiles[uid] = old
+        self._staged.clear()
+
+    # ---------- flushing ----------
+    @property
+    def dirty_count(self) -> int:
+        return len(self._dirty)
+
+    def _maybe_flush(self) -> None:
+        if self._batch_depth:
+            return
+        if len(self._dirty) >= self.flush_threshold:
+            self.flush()
+        elif self._dirty and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> int:
+        """Persist dirty profiles through the backend. Returns number of dirty profiles written."""
+        with self._lock:
+            if self._profiles is None or not self._dirty:
+                self._last_flush = time.monotonic()
+                return 0
+            count = len(self._dirty)
+            self.backend.write(self._profiles, list(self._dirty))
+            self._dirty.clear()
+            self._last_flush = time.monotonic()
+            return count
+
+    def compact(self) -> bool:
+        """Flush, then let the backend fold incremental writes into a snapshot. Returns False if unsupported."""
+        compact = getattr(self.backend, "compact", None)
+        if compact is None:
+            return False
+        with self._lock:
+            self.flush()
+            compact(self._ensure_loaded())
+            return True
+
+    def export_json(self, path: str) -> int:
+        """Flush, then write every cached profile to a players.json-shaped file. Returns profile count."""
+        with self._lock:
+            self.flush()
+            # Shared store: other processes saved too, so export what is on disk
+            profiles = self.backend.load_all() if self.shared else self._ensure_loaded()
+            save_json(path, profiles)
+            return len(profiles)
+
+
+_store: Optional[PlayerStore] = None
+
+
+def get_player_store() -> PlayerStore:
+    """Return the process-wide PlayerStore, creating it on first use."""
+    global _store
+    if _store is None:
+        _store = PlayerStore(
+            make_backend(PLAYERS_BACKEND, PLAYERS_FILE, PLAYERS_DB_FILE, PROFILE_DIR, PLAYERS_JOURNAL_FILE),
+            flush_interval=PLAYERS_FLUSH_INTERVAL,
+            flush_threshold=PLAYERS_FLUSH_THRESHOLD,
+            shared=PLAYERS_SHARED,
+        )
+    return _store
+
+
+def flush_player_store() -> int:
+    """Flush the process-wide store if it was ever created."""
+    if _store is None:
+        return 0
+    return _store.flush()
+
+
+def players_backup_source() -> str:
+    """File that the daily backup should copy for the configured backend."""
+    return PLAYERS_FILE if get_player_store().backend.name in ("json", "journal") else PLAYERS_EXPORT_FILE
+
+
+def prepare_players_backup() -> None:
+    """Flush cached profiles and bring the file that gets backed up up to date."""
+    store = get_player_store()
+    if store.backend.name == "json":
+        store.flush()
+    elif store.backend.name == "journal":
+        store.compact()
+    else:
+        store.export_json(PLAYERS_EXPORT_FILE)
+
+
+# Never lose dirty profiles on a clean interpreter exit
+atexit.register(flush_player_store)
+
+
+async def run_player_store_flusher(interval: float | None = None, logger=print):
+    """
+    Background task: periodically flush dirty profiles so idle periods
+    still reach disk within `interval` seconds.
+    """
+    store = get_player_store()
+    interval = float(interval if interval is not None else store.flush_interval)
+    while True:
+        try:
+            await asyncio.sleep(max(0.5, interval))
+            store.flush()
+        except asyncio.CancelledError:
+            store.flush()
+            raise
+        except Exception as e:
+            logger(f"[players] Flush task error: {e}")
+
+
+async def run_player_store_compactor(interval: float = PLAYERS_COMPACT_INTERVAL, logger=print):
+    """
+    Background task (journal backend only): every `interval` seconds fold the
+    journal into the players.json snapshot so startup replay stays short.
+    """
+    store = get_player_store()
+    if getattr(store.backend, "compact", None) is None:
+        return
+    while True:
+        try:
+            await asyncio.sleep(max(1.0, float(interval)))
+            if store.backend.journal_size() > 0 or store.dirty_count:
+                store.compact()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger(f"[players] Compaction error: {e}")
@@ -1,19 +1,26 @@
-from core.shared import load_json, save_json
-from core.constants import ITEMS_FILE, PLAYERS_FILE
-from core.items import get_item_by_id
-from systems.ship_sys import derive_ship_effects
+from core.player_store import get_player_store, ProfileConflict
+from core.player_backends import profile_rev
+from core.constants import PROFILE_CAS_RETRIES
+from core.change_tracking import TrackedProfile, INVENTORY_KEY
+from core.derived import derived_stats
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Dict, Iterable, Optional
+import asyncio
 import time
 
 
 def load_players():
-    return load_json(PLAYERS_FILE)
+    """Deep copy of all profiles (uid -> profile) from the in-memory store."""
+    return get_player_store().snapshot()
 
 def save_players(data):
-    save_json(PLAYERS_FILE, data)
+    get_player_store().replace_all(data)
 
 def _normalize_currency(profile: dict) -> None:
     if not isinstance(profile, dict):
         return
+    if "scrap" not in profile and type(profile.get("Scrap")) is int:
+        return  # already normalized; don't touch (keeps change tracking quiet)
     upper = int(profile.get("Scrap", 0) or 0)
     lower = int(profile.get("scrap", 0) or 0)
     profile["Scrap"] = upper + lower
@@ -34,19 +41,223 @@ def _normalize_inventory_map(inv: dict) -> dict:
     return out
 
 def _normalize_inventory(profile: dict) -> None:
+    """Normalize profile['inventory'] in place (only the bad entries are rewritten)."""
     if not isinstance(profile, dict):
         return
-    inv = profile.get("inventory", {})
-    profile["inventory"] = _normalize_inventory_map(inv)
+    inv = profile.get("inventory")
+    if not isinstance(inv, dict):
+        profile["inventory"] = _normalize_inventory_map(inv)
+        return
+    bad = [k for k, v in inv.items() if not (type(k) is str and type(v) is int and v > 0)]
+    for k in bad:
+        v = inv.pop(k)
+        try:
+            q = int(v)
+        except Exception:
+            q = 0
+        if q > 0:
+            inv[str(k)] = q
+
+# ---------- Per-user profile transactions ----------
+class ProfileBusy(Exception):
+    """Raised when profile_txn could not get the user's lock within its timeout."""
+
+
+class _Txn:
+    __slots__ = ("owner", "profile")
+
+    def __init__(self, owner, profile):
+        self.owner = owner
+        self.profile = profile
+
+
+_txn_locks: Dict[str, asyncio.Lock] = {}
+_active_txns: Dict[str, _Txn] = {}
+
+
+def _current_task():
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None  # called outside the event loop (scripts, tools)
+
+
+def _own_txn(uid: str) -> Optional[_Txn]:
+    """The open transaction for uid if the current task holds it."""
+    txn = _active_txns.get(uid)
+    if txn is not None and txn.owner is not None and txn.owner is _current_task():
+        return txn
+    return None
+
+
+@asynccontextmanager
+async def profile_txn(user_id, timeout: float | None = None, commit: bool = True):
+    """
+    async with profile_txn(uid) as p: ...
+
+    - Serializes commands for the same user with a per-user asyncio.Lock.
+    - Loads the profile once; p is None if the user has no profile.
+    - Commits once on normal exit (no merge needed: nobody else can write
+      this user's profile while the lock is held). Nothing is committed if
+      the block raises, or if commit=False, unless save_profile was called.
+    - Re-entrant within the same task: nested profile_txn/load_profile calls
+      return the same dict, and save_profile writes through it.
+    - timeout: seconds to wait for the lock before raising ProfileBusy (None = wait forever).
+    """
+    uid = str(user_id)
+    txn = _own_txn(uid)
+    if txn is not None:
+        yield txn.profile
+        return
+
+    lock = _txn_locks.setdefault(uid, asyncio.Lock())
+    try:
+        if timeout is None:
+            await lock.acquire()
+        else:
+            await asyncio.wait_for(lock.acquire(), timeout)
+    except asyncio.TimeoutError:
+        raise ProfileBusy(uid)
+
+    try:
+        txn = _Txn(_current_task(), load_profile(uid))
+        _active_txns[uid] = txn
+        try:
+            yield txn.profile
+        finally:
+            _active_txns.pop(uid, None)
+        if commit and isinstance(txn.profile, dict):
+            commit_profile(uid, txn.profile)
+    finally:
+        lock.release()
+
+
+def commit_profile(user_id, profile: dict, expected_rev: Optional[int] = None) -> None:
+    """
+    Store a profile without merging. Callers must own the user's profile
+    (profile_txn, or a TrackedProfile from load_profile).
+    - TrackedProfile: persist only the top-level keys and inventory entries
+      that changed since load / the last commit.
+    - plain dict: normalize and replace the whole stored profile.
+    With expected_rev (always, for a shared store: the rev the profile was
+    loaded at) the save is a compare-and-swap and raises ProfileConflict if
+    another save got there first. profile["rev"] is advanced on success.
+    """
+    store = get_player_store()
+    if expected_rev is None and store.shared:
+        expected_rev = profile_rev(profile)
+    if isinstance(profile, TrackedProfile):
+        _normalize_currency(profile)
+        if not profile.has_changes:
+            return
+        changes = profile.collect_changes()
+        set_fields = changes["set"]
+        if INVENTORY_KEY in set_fields:
+            set_fields[INVENTORY_KEY] = _normalize_inventory_map(set_fields[INVENTORY_KEY])
+        entries = None
+        if INVENTORY_KEY in changes:
+            entries = {INVENTORY_KEY: {str(k): _positive_qty(v) for k, v in changes[INVENTORY_KEY].items()}}
+        rev = store.patch(str(user_id), set_fields, changes["unset"], entries, expected_rev=expected_rev)
+        dict.__setitem__(profile, "rev", rev)  # bookkeeping, not a change to persist
+        profile.mark_clean()
+        return
+    _normalize_currency(profile)
+    _normalize_inventory(profile)
+    profile["rev"] = store.put(str(user_id), profile, expected_rev=expected_rev)
+
+
+def update_profile(user_id, mutate, retries: Optional[int] = None):
+    """
+    Compare-and-swap save loop: load the profile, call mutate(profile), save
+    it only if nobody else saved in between; otherwise reload and re-run
+    mutate (up to `retries` extra times, default PROFILE_CAS_RETRIES).
+    mutate must only touch the profile (no messages or other side effects),
+    since it can run more than once. Returns the saved profile (None if the
+    user has no profile); raises ProfileConflict when retries run out.
+    """
+    uid = str(user_id)
+    if _own_txn(uid) is not None:
+        # The caller already holds the user's transaction: nobody else can save in between
+        prof = load_profile(uid)
+        if prof is not None:
+            mutate(prof)
+            commit_profile(uid, prof)
+        return prof
+    retries = PROFILE_CAS_RETRIES if retries is None else int(retries)
+    for _ in range(retries + 1):
+        prof = load_profile(uid)
+        if prof is None:
+            return None
+        expected = profile_rev(prof)
+        mutate(prof)
+        try:
+            commit_profile(uid, prof, expected_rev=expected)
+            return prof
+        except ProfileConflict:
+            continue
+    raise ProfileConflict(uid)
+
+
+def _positive_qty(v):
+    """Inventory quantity as a positive int, or None (= remove the entry)."""
+    try:
+        q = int(v)
+    except Exception:
+        return None
+    return q if q > 0 else None
+
 
 def load_profile(user_id):
-    players = load_players()
-    prof = players.get(str(user_id))
+    """
+    Change-tracking copy of the user's profile (or None). Inside the caller's
+    own profile_txn this is the transaction's profile itself.
+    """
+    txn = _own_txn(str(user_id))
+    if txn is not None:
+        return txn.profile
+    prof = get_player_store().get_tracked(user_id)
     if isinstance(prof, dict):
-        _normalize_currency(prof)
-        _normalize_inventory(prof)
+        # Normalization/migrations run once per profile, then this is an int compare
+        ensure_schema(prof)
     return prof
 
+def load_profiles(user_ids: Iterable) -> Dict[str, Optional[dict]]:
+    """load_profile for a group of users in one store pass: {uid: profile or None}, in input order."""
+    with get_player_store().batch():
+        return {str(u): load_profile(u) for u in user_ids}
+
+def save_profiles(profiles: Dict[str, dict]) -> None:
+    """
+    save_profile for a group of users. Every profile lands in the store under
+    one lock hold and is persisted by a single backend write, so party and
+    payout flows never leave half of the group saved. None entries are skipped.
+    Shared store: every expected rev is checked and every profile written in
+    one backend transaction; if any is stale, none is saved and
+    ProfileConflict is raised (reload the group before trying again).
+    """
+    with get_player_store().batch():
+        for uid, prof in profiles.items():
+            if isinstance(prof, dict):
+                save_profile(uid, prof)
+
+@asynccontextmanager
+async def profiles_txn(user_ids, timeout: float | None = None, commit: bool = True):
+    """
+    async with profiles_txn(uids) as profiles: ...   (profiles: {uid: profile or None})
+
+    profile_txn for a group: takes every user's lock (in sorted uid order, so
+    overlapping groups cannot deadlock), then commits the whole group at once
+    through save_profiles on normal exit.
+    """
+    uids = list(dict.fromkeys(str(u) for u in user_ids))
+    async with AsyncExitStack() as stack:
+        for uid in sorted(uids):
+            await stack.enter_async_context(profile_txn(uid, timeout=timeout, commit=False))
+        profiles = {uid: _own_txn(uid).profile for uid in uids}
+        yield profiles
+        if commit:
+            save_profiles(profiles)
+
 def _deep_merge(dst: dict, src: dict) -> dict:
     for k, v in src.items():
         if isinstance(v, dict) and isinstance(dst.get(k), dict):
@@ -61,27 +272,53 @@ def save_profile(user_id, profile):
     - Normalize currency and inventory in both current and incoming profile
     - Replace 'inventory' entirely from the incoming profile (so deletions persist)
     - Deep-merge other fields to preserve concurrent updates
+    Profiles from load_profile track their own changes and skip all of that:
+    only the keys/inventory entries they changed are written (commit_profile).
+    Inside the caller's own profile_txn this writes through the open
+    transaction instead (merging first if a different dict was passed).
     """
-    players = load_players()
+    store = get_player_store()
     uid = str(user_id)
-    cur = players.get(uid, {})
-
-    if isinstance(cur, dict):
-        _normalize_currency(cur)
-        _normalize_inventory(cur)
+    txn = _own_txn(uid)
+    if txn is not None:
+        if txn.profile is None:
+            txn.profile = profile
+        elif profile is not txn.profile and isinstance(profile, dict):
+            _merge_into(txn.profile, profile)
+        if isinstance(txn.profile, dict):
+            commit_profile(uid, txn.profile)
+        return
+    if isinstance(profile, TrackedProfile):
+        commit_profile(uid, profile)
+        return
 
     incoming = profile if isinstance(profile, dict) else {}
     if isinstance(incoming, dict):
         _normalize_currency(incoming)
         _normalize_inventory(incoming)
 
+    # Merge onto the stored profile; a shared store can change it between
+    # get and put, so re-merge onto the newer copy when that happens
+    for _ in range(PROFILE_CAS_RETRIES + 1):
+        cur = store.get(uid) or {}
+        if isinstance(cur, dict):
+            _normalize_currency(cur)
+            _normalize_inventory(cur)
+        try:
+            store.put(uid, _merge_into(cur if isinstance(cur, dict) else {}, incoming), expected_rev=profile_rev(cur))
+            return
+        except ProfileConflict:
+            continue
+    raise ProfileConflict(uid)
+
+def _merge_into(cur: dict, incoming: dict) -> dict:
+    """Deep-merge incoming into cur, replacing 'inventory' wholesale. Returns cur."""
     # Replace inventory (critical: allow consumption/removal)
     incoming_inv = incoming.get("inventory") if isinstance(incoming.get("inventory"), dict) else None
 
     # Merge everything except 'inventory'
-    cur_merged = cur if isinstance(cur, dict) else {}
-    src_no_inv = {k: v for k, v in (incoming.items() if isinstance(incoming, dict) else []) if k != "inventory"}
-    merged = _deep_merge(cur_merged, src_no_inv)
+    src_no_inv = {k: v for k, v in incoming.items() if k != "inventory"}
+    merged = _deep_merge(cur, src_no_inv)
 
     # Apply inventory replacement if provided, else keep normalized current
     if isinstance(incoming_inv, dict):
@@ -89,9 +326,7 @@ def save_profile(user_id, profile):
     else:
         # ensure normalized
         merged["inventory"] = _normalize_inventory_map(merged.get("inventory", {}))
-
-    players[uid] = merged
-    save_players(players)
+    return merged
 
 def get_scrap(profile: dict) -> int:
     return int(profile.get("Scrap", 0) or 0)
@@ -130,72 +365,16 @@ def default_profile(uid, username):
         "equipped": {"weapon": None, "armor": None},
         "enhancements": {},
         "bank": { "unlocked": False, "balance": 0 },
+        "schema_version": CURRENT_SCHEMA_VERSION,
     }
 
 def calculate_combat_stats(player):
-    """Return combat stats = base per level + equipped bonuses with multipliers and enhancements."""
-    level = player.get("level", 1)
-
-    # Base scaling: +5 per level
-    base_attack = 5 * level
-    base_defense = 5 * level
-
-    items = load_json(ITEMS_FILE)
-    equipped = player.get("equipped", {}) or {}
-    enhancements = player.get("enhancements", {}) or {}
-
-    # Start from base stats
-    attack = base_attack
-    defense = base_defense
-
-    # Default multipliers
-    attack_mult = 1.0
-    defense_mult = 1.0
-
-    # Weapon
-    weapon_id = equipped.get("weapon")
-    if weapon_id:
-        weapon = get_item_by_id(items, weapon_id)
-        if weapon:
-            w_base_atk = int(weapon.get("attack", 0) or 0)
-            w_base_def = int(weapon.get("defense", 0) or 0)
-            w_buff = float((enhancements.get(str(weapon_id)) or {}).get("buff", 0.0))
-            # Enhancement applies multiplicatively to the gear stat only
-            attack += int(round(w_base_atk * (1.0 + w_buff)))
-            defense += int(round(w_base_def * (1.0 + w_buff)))
-            attack_mult *= float(weapon.get("attack_mult", 1.0))
-            defense_mult *= float(weapon.get("defense_mult", 1.0))
-
-    # Armor
-    armor_id = equipped.get("armor")
-    if armor_id:
-        armor = get_item_by_id(items, armor_id)
-        if armor:
-            a_base_atk = int(armor.get("attack", 0) or 0)
-            a_base_def = int(armor.get("defense", 0) or 0)
-            a_buff = float((enhancements.get(str(armor_id)) or {}).get("buff", 0.0))
-            attack += int(round(a_base_atk * (1.0 + a_buff)))
-            defense += int(round(a_base_def * (1.0 + a_buff)))
-            attack_mult *= float(armor.get("attack_mult", 1.0))
-            defense_mult *= float(armor.get("defense_mult", 1.0))
-
-    # Apply multipliers to total
-    final_attack = int(attack * attack_mult)
-    final_defense = int(defense * defense_mult)
-
-    # Ship type boosts for attack/defense
-    eff = derive_ship_effects(player)
-    tb = eff.get("type_boost", {})
-    if tb and tb.get("stat") == "attack":
-        final_attack = int(round(final_attack * (1.0 + float(tb.get("value", 0.0)))))
-    if tb and tb.get("stat") == "defense":
-        final_defense = int(round(final_defense * (1.0 + float(tb.get("value", 0.0)))))
-
-    return {"attack": final_attack, "defense": final_defense}
+    """Return combat stats = base per level + equipped bonuses with multipliers and enhancements (see core.derived)."""
+    return derived_stats(player).combat
 
 
-def migrate_player(player, uid, username):
-    """Migrate a single player profile in memory."""
+def _migrate_v2_structure(player):
+    """Schema v2: fill/repair structural fields and drop obsolete keys (formerly run on every command)."""
     changed = False
 
     try:
@@ -221,11 +400,6 @@ def migrate_player(player, uid, username):
             player.pop(key)
             changed = True
 
-    # Add username if missing
-    if "username" not in player:
-        player["username"] = username
-        changed = True
-
     # Ensure last_regen exists
     if "last_regen" not in player:
         player["last_regen"] = int(time.time())
@@ -266,4 +440,65 @@ def migrate_player(player, uid, username):
                 b["balance"] = 0
             changed = True
         player["bank"] = b
-    return player
\ No newline at end of file
+    return player
+
+
+def _migrate_v1_normalize(player):
+    """Schema v1: merge legacy 'scrap' into 'Scrap' and clean inventory keys/quantities."""
+    _normalize_currency(player)
+    _normalize_inventory(player)
+
+
+# Ordered (version, step). Append new steps with the next version number;
+# each step runs exactly once per profile (lazily on load, or via migrate_all_profiles).
+SCHEMA_MIGRATIONS = [
+    (1, _migrate_v1_normalize),
+    (2, _migrate_v2_structure),
+]
+CURRENT_SCHEMA_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+
+def ensure_schema(player) -> bool:
+    """Run every migration step newer than player['schema_version']. Returns True if anything ran."""
+    try:
+        version = int(player.get("schema_version", 0) or 0)
+    except Exception:
+        version = 0
+    if version >= CURRENT_SCHEMA_VERSION:
+        return False
+    for step_version, step in SCHEMA_MIGRATIONS:
+        if version < step_version:
+            step(player)
+    player["schema_version"] = CURRENT_SCHEMA_VERSION
+    return True
+
+
+def migrate_player(player, uid, username):
+    """Migrate a single player profile in memory (schema steps + username)."""
+    ensure_schema(player)
+    if "username" not in player:
+        player["username"] = username
+    return player
+
+
+def migrate_all_profiles() -> int:
+    """Offline bulk pass: bring every stored profile to CURRENT_SCHEMA_VERSION. Returns profiles migrated."""
+    store = get_player_store()
+    migrated = 0
+    for uid in store.uids():
+        prof = store.get_tracked(uid)
+        if prof is not None and ensure_schema(prof):
+            commit_profile(uid, prof)
+            migrated += 1
+    store.flush()
+    return migrated
+
+
+if __name__ == "__main__":
+    # Offline bulk schema migration: python -m core.players migrate
+    import sys
+    if sys.argv[1:] != ["migrate"]:
+        print("Usage: python -m core.players migrate")
+        sys.exit(1)
+    n = migrate_all_profiles()
+    print(f"[players] Migrated {n} profiles to schema v{CURRENT_SCHEMA_VERSION}")
@@ -1,8 +1,7 @@
 from __future__ import annotations
 from typing import Callable, Dict, List, Tuple
 from math import prod
-from core.shared import load_json
-from core.constants import PLANETS_FILE
+from core import gamedata
 from core.bank import bank_xp_multiplier
 from systems.ship_sys import derive_ship_effects
 from core.utils import add_xp
@@ -45,6 +44,17 @@ def _combine(scope: str, mods: List[Modifier]) -> Tuple[float, int, List[str]]:
     notes = [f"{m['source']}:{m['kind']}×{m['value']}" for m in mods if m["scope"] == scope]
     return m, a, notes
 
+def reward_multipliers(player: Dict, base: Dict | None = None, ctx_meta: Dict | None = None,
+                       tags: List[str] | None = None) -> Dict[str, Tuple[float, int]]:
+    """
+    {'xp': (mult, add), 'scrap': (mult, add)} that apply_rewards would use for this
+    player right now (final = max(0, round(base * mult) + add)). Does not modify the player.
+    """
+    mods = _collect_modifiers(player, base or {}, ctx_meta or {}, tags or [])
+    xp_mult, xp_add, _ = _combine("xp", mods)
+    sc_mult, sc_add, _ = _combine("scrap", mods)
+    return {"xp": (xp_mult, xp_add), "scrap": (sc_mult, sc_add)}
+
 def apply_rewards(player: Dict, base: Dict, ctx_meta: Dict | None = None, tags: List[str] | None = None) -> Dict:
     """
     Base keys supported: xp, scrap, items
@@ -117,7 +127,7 @@ def ship_provider(player: Dict, base: Dict, ctx_meta: Dict, tags: List[str]) ->
     return mods
 
 def planet_provider(player: Dict, base: Dict, ctx_meta: Dict, tags: List[str]) -> List[Modifier]:
-    root = load_json(PLANETS_FILE) or {}
+    root = gamedata.planets() or {}
     data = root.get("planets") if isinstance(root.get("planets"), dict) else root
     pid = str(player.get("current_planet") or player.get("max_unlocked_planet", 1))
     p = data.get(pid) or {}
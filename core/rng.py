@@ -0,0 +1,93 @@
+# core/rng.py
+"""
+Seeded RNG streams for reward rolls.
+
+A stream is a random.Random seeded from (root seed, key...), so it drops into
+every existing `rng=random` parameter, plus batch draws for many rolls at once.
+The root seed is RNG_SEED when set, otherwise random per process;
+set_root_seed() pins it (tests, benchmarks, replays), which makes every
+stream and therefore every roll reproducible.
+
+- stream(*key): a fresh stream for any key, e.g. stream("crew.job", code, started)
+- command_rng(ctx): the stream of one command invocation (cached on ctx),
+  keyed on command name, author id and message id
+"""
+import hashlib
+import os
+import random
+from itertools import accumulate
+from typing import List, Optional, Sequence
+
+from core.constants import RNG_SEED
+from core.sampling import binomial, multinomial
+
+
+class RNGStream(random.Random):
+    """random.Random with batch draws."""
+
+    def uniforms(self, k: int) -> List[float]:
+        """k independent uniforms in [0, 1)."""
+        rnd = self.random
+        return [rnd() for _ in range(max(0, int(k)))]
+
+    def categorical(self, k: int, weights: Sequence[float]) -> List[int]:
+        """k independent indices drawn with the given (unnormalized) weights."""
+        if k <= 0 or not weights:
+            return []
+        return self.choices(range(len(weights)), cum_weights=list(accumulate(weights)), k=int(k))
+
+    def counts(self, n: int, weights: Sequence[float]) -> List[int]:
+        """How often each index comes up in n categorical draws (one multinomial draw)."""
+        total = float(sum(weights))
+        if n <= 0 or total <= 0:
+            return [0] * len(weights)
+        return multinomial(int(n), [w / total for w in weights], self)
+
+    def binomial(self, n: int, p: float) -> int:
+        """Successes in n Bernoulli(p) trials."""
+        return binomial(int(n), float(p), self)
+
+
+def _fresh_root() -> int:
+    return int.from_bytes(os.urandom(8), "big")
+
+
+_root_seed: int = int(RNG_SEED) if RNG_SEED not in (None, "") else _fresh_root()
+
+
+def set_root_seed(seed: Optional[int]) -> None:
+    """Pin the root seed (None = fresh random seed)."""
+    global _root_seed
+    _root_seed = _fresh_root() if seed is None else int(seed)
+
+
+def root_seed() -> int:
+    return _root_seed
+
+
+def derive_seed(*key) -> int:
+    """64-bit seed for `key` under the current root seed (stable across processes)."""
+    raw = repr((_root_seed,) + tuple(key)).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "big")
+
+
+def stream(*key) -> RNGStream:
+    """A new stream for `key`; equal keys under the same root seed replay the same rolls."""
+    return RNGStream(derive_seed(*key))
+
+
+def command_rng(ctx) -> RNGStream:
+    """Per-invocation stream, created on first use and cached on ctx as ctx.rng."""
+    rng = getattr(ctx, "rng", None)
+    if isinstance(rng, RNGStream):
+        return rng
+    command = getattr(getattr(ctx, "command", None), "qualified_name", None)
+    author = getattr(getattr(ctx, "author", None), "id", None)
+    message = getattr(getattr(ctx, "message", None), "id", None)
+    # Without a message id there is nothing unique to replay from
+    rng = stream("command", command, author, message if message is not None else _fresh_root())
+    try:
+        ctx.rng = rng
+    except AttributeError:
+        pass
+    return rng
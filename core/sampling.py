@@ -0,0 +1,99 @@
+# core/sampling.py
+"""
+Exact discrete samplers on top of a `random.Random`-like rng (randrange/random):
+- AliasTable: O(1) draws from a fixed weighted distribution
+- binomial / multinomial: aggregate counts for many independent draws in
+  O(outcomes) time instead of one draw per trial
+"""
+import math
+import random
+from typing import List, Sequence
+
+
+class AliasTable:
+    """Walker/Vose alias table: O(n) build, O(1) weighted sampling (one randrange + one random)."""
+
+    __slots__ = ("prob", "alias")
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Leftovers are 1.0 up to float error
+
+    def sample(self, rng=random) -> int:
+        i = rng.randrange(len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+def binomial(n: int, p: float, rng=random) -> int:
+    """
+    Number of successes in n Bernoulli(p) trials, drawn exactly:
+    Devroye's geometric-gap method when n*p < 10, else Hormann's BTRS rejection.
+    """
+    if n <= 0 or p <= 0.0:
+        return 0
+    if p >= 1.0:
+        return n
+    if p > 0.5:
+        return n - binomial(n, 1.0 - p, rng)
+
+    if n * p < 10.0:
+        # Sum geometric gaps between successes until they run past n
+        c = math.log(1.0 - p)
+        x = y = 0
+        while True:
+            y += math.floor(math.log(1.0 - rng.random()) / c) + 1
+            if y > n:
+                return x
+            x += 1
+
+    spq = math.sqrt(n * p * (1.0 - p))
+    b = 1.15 + 2.53 * spq
+    a = -0.0873 + 0.0248 * b + 0.01 * p
+    c = n * p + 0.5
+    vr = 0.92 - 4.2 / b
+    alpha = (2.83 + 5.1 / b) * spq
+    lpq = math.log(p / (1.0 - p))
+    m = math.floor((n + 1) * p)
+    h = math.lgamma(m + 1) + math.lgamma(n - m + 1)
+    while True:
+        u = rng.random() - 0.5
+        us = 0.5 - abs(u)
+        k = math.floor((2.0 * a / us + b) * u + c)
+        if k < 0 or k > n:
+            continue
+        v = rng.random()
+        if us >= 0.07 and v <= vr:
+            return k
+        v *= alpha / (a / (us * us) + b)
+        if math.log(v) <= h - math.lgamma(k + 1) - math.lgamma(n - k + 1) + (k - m) * lpq:
+            return k
+
+
+def multinomial(n: int, probs: Sequence[float], rng=random) -> List[int]:
+    """Counts per outcome for n independent draws from `probs` (conditional binomials)."""
+    counts = [0] * len(probs)
+    remaining = int(n)
+    mass = float(sum(probs))
+    for i, p in enumerate(probs):
+        if remaining <= 0:
+            break
+        if i == len(probs) - 1 or mass <= p:
+            counts[i] = remaining
+            break
+        x = binomial(remaining, min(1.0, max(0.0, p / mass)), rng)
+        counts[i] = x
+        remaining -= x
+        mass -= p
+    return counts
@@ -0,0 +1,120 @@
+"""
+Opt-in multi-process runtime: BOT_PROCESSES=N python bot.py
+
+bot.py then runs run_shard_supervisor(), which starts N worker processes of
+bot.py. Each worker runs an AutoShardedBot for its slice of the Discord
+shards (BOT_SHARD_IDS), so command handling spreads across CPU cores.
+Workers share nothing in memory; they coordinate through the volume:
+- player profiles: sqlite/files backend with compare-and-swap saves (PLAYERS_SHARED)
+- per-user locks and cooldowns: core/shared_state.py
+Worker 0 is the primary and also runs the once-per-deployment background
+jobs (daily backup, journal compaction).
+"""
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+from core.constants import BOT_PROCESSES, BOT_SHARD_COUNT, COOLDOWNS_FILE, PLAYERS_BACKEND
+from core.shared_state import get_shared_state
+
+RESTART_DELAY = 5.0
+
+
+def shard_groups(shard_count: int, processes: int) -> List[List[int]]:
+    """Round-robin shard ids over worker processes (no worker gets an empty group)."""
+    processes = max(1, min(int(processes), int(shard_count)))
+    return [list(range(shard_count))[i::processes] for i in range(processes)]
+
+
+def worker_shard_ids() -> Optional[List[int]]:
+    """Shard ids assigned to this process by the supervisor, or None when not a shard worker."""
+    raw = os.getenv("BOT_SHARD_IDS")
+    if not raw:
+        return None
+    return [int(x) for x in raw.split(",") if x.strip()]
+
+
+def is_primary_process() -> bool:
+    """True for a single-process bot and for worker 0 of the sharded runtime."""
+    return os.getenv("BOT_PRIMARY", "1") == "1"
+
+
+def _prepare_shared_state() -> None:
+    state = get_shared_state()
+    cleared = state.clear_all_locks()
+    if cleared:
+        print(f"[shards] Cleared {cleared} stale user locks")
+    if os.path.exists(COOLDOWNS_FILE):
+        try:
+            with open(COOLDOWNS_FILE, "r", encoding="utf-8") as f:
+                n = state.import_cooldowns(json.load(f))
+            if n:
+                print(f"[shards] Imported {n} cooldowns from {COOLDOWNS_FILE}")
+        except Exception as e:
+            print(f"[shards] ⚠️ Could not import cooldowns: {e}")
+    # Workers open their own connection; never hand one across processes
+    state.close()
+
+
+def run_shard_supervisor(script_path: str) -> int:
+    """Start and babysit the shard workers. Returns the process exit code."""
+    if PLAYERS_BACKEND not in ("sqlite", "files"):
+        print(f"[shards] ❌ BOT_PROCESSES={BOT_PROCESSES} needs PLAYERS_BACKEND=sqlite or files "
+              f"(got '{PLAYERS_BACKEND}'): the json/journal stores cannot be shared between processes.")
+        return 1
+
+    shard_count = BOT_SHARD_COUNT if BOT_SHARD_COUNT > 0 else BOT_PROCESSES
+    groups = shard_groups(shard_count, BOT_PROCESSES)
+    _prepare_shared_state()
+
+    def spawn(i: int) -> subprocess.Popen:
+        env = dict(
+            os.environ,
+            BOT_SHARD_IDS=",".join(str(s) for s in groups[i]),
+            BOT_SHARD_COUNT=str(shard_count),
+            BOT_PRIMARY="1" if i == 0 else "0",
+        )
+        print(f"[shards] Starting worker {i} with shards {groups[i]} of {shard_count}")
+        return subprocess.Popen([sys.executable, script_path], env=env)
+
+    workers = {i: spawn(i) for i in range(len(groups))}
+    stopping = False
+
+    def stop(*_):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        while not stopping:
+            time.sleep(1.0)
+            for i, proc in list(workers.items()):
+                code = proc.poll()
+                if code is None:
+                    continue
+                if code == 0:
+                    print(f"[shards] Worker {i} exited")
+                    workers.pop(i)
+                    continue
+                print(f"[shards] ⚠️ Worker {i} exited with code {code}; restarting in {RESTART_DELAY:.0f}s")
+                time.sleep(RESTART_DELAY)
+                workers[i] = spawn(i)
+            if not workers:
+                return 0
+    except KeyboardInterrupt:
+        pass
+
+    # Forward shutdown so every worker flushes its store
+    for proc in workers.values():
+        if proc.poll() is None:
+            proc.send_signal(signal.SIGINT)
+    for proc in workers.values():
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    return 0
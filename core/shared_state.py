@@ -0,0 +1,148 @@
+"""
+Cross-process runtime state for the sharded runtime (core/sharding.py).
+
+With several shard processes, a user's commands can land in any of them
+(shards are split by guild), so per-user locks (core/guards.py) and command
+cooldowns (core/cooldowns.py) live in one SQLite file on the shared volume
+instead of module-level dicts. A single-process bot never opens it.
+"""
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+from core.constants import SHARED_RUNTIME, SHARED_STATE_FILE
+
+
+class SharedState:
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            d = os.path.dirname(self.path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS user_locks ("
+                " uid TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cooldowns ("
+                " uid TEXT NOT NULL,"
+                " command TEXT NOT NULL,"
+                " expires_at INTEGER NOT NULL,"
+                " username TEXT,"
+                " PRIMARY KEY (uid, command))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ---------- user locks ----------
+    def get_lock(self, uid: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._connect().execute("SELECT data FROM user_locks WHERE uid = ?", (str(uid),)).fetchone()
+        if row is None:
+            return None
+        lock = json.loads(row[0])
+        lock["allowed"] = set(lock.get("allowed") or [])
+        return lock
+
+    def set_lock(self, uid: str, lock: Dict) -> None:
+        data = dict(lock, allowed=sorted(lock.get("allowed") or []))
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO user_locks (uid, data) VALUES (?, ?) "
+                "ON CONFLICT(uid) DO UPDATE SET data=excluded.data",
+                (str(uid), json.dumps(data)),
+            )
+
+    def clear_lock(self, uid: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM user_locks WHERE uid = ?", (str(uid),))
+
+    def clear_all_locks(self) -> int:
+        """Drop every lock (a fresh deployment has no interactive flows in progress)."""
+        with self._lock, self._connect() as conn:
+            return conn.execute("DELETE FROM user_locks").rowcount
+
+    # ---------- cooldowns ----------
+    def get_cooldown(self, uid: str, command: str) -> int:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT expires_at FROM cooldowns WHERE uid = ? AND command = ?", (str(uid), command)
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def set_cooldown(self, uid: str, command: str, expires_at: int, username: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO cooldowns (uid, command, expires_at, username) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(uid, command) DO UPDATE SET expires_at=excluded.expires_at, username=excluded.username",
+                (str(uid), command, int(expires_at), username),
+            )
+
+    def get_user_cooldowns(self, uid: str) -> Optional[Dict]:
+        """Same shape as an active_cooldowns entry: {"username": str, "cooldowns": {command: expires_at}}."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT command, expires_at, username FROM cooldowns WHERE uid = ?", (str(uid),)
+            ).fetchall()
+        if not rows:
+            return None
+        return {"username": rows[-1][2] or f"user_{uid}", "cooldowns": {c: int(e) for c, e, _ in rows}}
+
+    def set_user_cooldowns(self, uid: str, user_data: Dict) -> None:
+        """Replace all of one user's cooldowns."""
+        uid = str(uid)
+        username = user_data.get("username") or f"user_{uid}"
+        cooldowns = user_data.get("cooldowns") or {}
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM cooldowns WHERE uid = ?", (uid,))
+            conn.executemany(
+                "INSERT INTO cooldowns (uid, command, expires_at, username) VALUES (?, ?, ?, ?)",
+                [(uid, c, int(e or 0), username) for c, e in cooldowns.items()],
+            )
+
+    def import_cooldowns(self, active: Dict) -> int:
+        """Load a cooldowns.json-shaped dict if the table is still empty. Returns rows written."""
+        with self._lock, self._connect() as conn:
+            if conn.execute("SELECT 1 FROM cooldowns LIMIT 1").fetchone():
+                return 0
+            rows = []
+            for uid, user_data in (active or {}).items():
+                if not isinstance(user_data, dict):
+                    continue
+                username = user_data.get("username") or f"user_{uid}"
+                for c, e in (user_data.get("cooldowns") or {}).items():
+                    rows.append((str(uid), c, int(e or 0), username))
+            conn.executemany(
+                "INSERT OR IGNORE INTO cooldowns (uid, command, expires_at, username) VALUES (?, ?, ?, ?)", rows
+            )
+            return len(rows)
+
+
+_state: Optional[SharedState] = None
+
+
+def get_shared_state() -> Optional[SharedState]:
+    """The process-wide SharedState in the sharded runtime, else None (use the in-memory dicts)."""
+    global _state
+    if not SHARED_RUNTIME:
+        return None
+    if _state is None:
+        _state = SharedState(SHARED_STATE_FILE)
+    return _state
@@ -1,6 +1,9 @@
 from __future__ import annotations
 import math
-from typing import Dict, Tuple
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from core.gamedata import freeze
 
 # Post-100 stepped scaling settings (can be tuned later)
 POST100_FACTOR_BASE = 2.0      # F for levels 101–103
@@ -15,6 +18,9 @@ SKILLS_BANK_INTEREST_PRINCIPAL_CAP = 1_000_000_000  # 1B (tweak as needed)
 # Boxer extra crates cap (tunable)
 BOXER_EXTRA_CAP = 5
 
+# Levels with precomputed perk dicts; higher levels are evaluated on demand
+PERK_TABLE_LEVELS = 1000
+
 SKILLS = ("worker","crafter","tinkerer","trader","boxer","gambler","soldier")
 
 def _skill_node(p: dict, k: str) -> dict:
@@ -52,7 +58,7 @@ def _post100_factor(level: int) -> float:
         f = min(f, POST100_FACTOR_CAP)
     return f
 
-def xp_required(name: str, level: int) -> int:
+def _xp_required_formula(name: str, level: int) -> int:
     L = max(1, int(level))
     if L <= 100:
         return _base_xp_required(name, L)
@@ -61,37 +67,108 @@ def xp_required(name: str, level: int) -> int:
     req = int(round(total100 * _post100_factor(L)))
     return max(1, req)
 
+def _first_flat_level() -> Optional[int]:
+    """First level from which _post100_factor() stops changing (None if it grows forever)."""
+    if POST100_FACTOR_CAP is None and POST100_FACTOR_STEP:
+        return None
+    L = 101
+    while _post100_factor(L) != _post100_factor(L + POST100_FACTOR_SPAN):
+        L += 1
+    return L
+
+# Per-skill requirement and cumulative tables, index = level:
+#   _REQ[name][L] = XP to go from L to L+1
+#   _CUM[name][L] = XP to go from 1 to L  (_CUM[name][0] = _CUM[name][1] = 0)
+# Tables stop at the flat level (constant requirement beyond it, handled in closed
+# form). Without a factor cap they grow on demand instead.
+_FLAT_FROM = _first_flat_level()
+_REQ: Dict[str, List[int]] = {}
+_CUM: Dict[str, List[int]] = {}
+
+def _grow_tables(name: str, level: int) -> None:
+    req, cum = _REQ[name], _CUM[name]
+    while len(cum) <= level:
+        L = len(cum) - 1
+        cum.append(cum[L] + req[L])
+        req.append(_xp_required_formula(name, L + 1))
+
+for _name in SKILLS:
+    _REQ[_name] = [0, _xp_required_formula(_name, 1)]
+    _CUM[_name] = [0, 0]
+    _grow_tables(_name, _FLAT_FROM or 200)
+
+def xp_required(name: str, level: int) -> int:
+    L = max(1, int(level))
+    req = _REQ.get(name)
+    if req is None:
+        return _xp_required_formula(name, L)
+    if L >= len(req):
+        if _FLAT_FROM is None:
+            _grow_tables(name, L)
+        else:
+            return req[-1]
+    return req[L]
+
+def _cum_xp(name: str, level: int) -> int:
+    """Total XP needed to go from level 1 to `level`."""
+    cum = _CUM[name]
+    if level < len(cum):
+        return cum[level]
+    if _FLAT_FROM is None:
+        _grow_tables(name, level)
+        return cum[level]
+    top = len(cum) - 1
+    return cum[top] + (level - top) * _REQ[name][top]
+
+def _level_for_total(name: str, total: int) -> int:
+    """Highest level whose cumulative requirement is <= total XP (0 if total < 0)."""
+    cum = _CUM[name]
+    if _FLAT_FROM is None:
+        while cum[-1] <= total:
+            _grow_tables(name, len(cum) + 64)
+    elif total >= cum[-1]:
+        top = len(cum) - 1
+        return top + (total - cum[top]) // _REQ[name][top]
+    return bisect_right(cum, total) - 1
+
 def award_skill_xp(player: dict, name: str, amount: int) -> Tuple[int, int]:
-    """Awards skill XP; no leveling past 100 unless overcharged is enabled."""
+    """
+    Awards skill XP; no leveling past 100 unless overcharged is enabled.
+    Closed form over the cumulative tables, so any amount costs one search.
+    """
     name = str(name).lower()
     if name not in SKILLS:
         return (0, 0)
     node = _skill_node(player, name)
     node["xp"] += int(amount)
 
-    levels = 0
-    # Disallow leveling >100 unless overcharged
-    while True:
-        lvl = node["level"]
-        req = xp_required(name, lvl)
-        if node["xp"] < req:
-            break
-
-        # If at 100+ and not overcharged, clamp and stop
-        if lvl >= 100 and not is_overcharged(player):
-            # keep xp just below threshold to show progress without leveling
-            node["xp"] = min(node["xp"], req - 1)
-            break
+    lvl, xp = node["level"], node["xp"]
+    req = xp_required(name, lvl)
+    if xp < req:
+        return lvl, 0
 
-        node["xp"] -= req
-        node["level"] = lvl + 1
-        levels += 1
+    # Disallow leveling >100 unless overcharged
+    cap = None if is_overcharged(player) else max(lvl, 100)
+    total = _cum_xp(name, lvl) + xp
+    new = max(lvl, _level_for_total(name, total))
+    if cap is not None and new >= cap:
+        new = cap
+    xp = total - _cum_xp(name, new)
+    if cap is not None and new == cap:
+        # keep xp just below threshold to show progress without leveling
+        xp = min(xp, xp_required(name, new) - 1)
 
-    return node["level"], levels
+    node["level"] = new
+    node["xp"] = xp
+    return new, new - lvl
 
 def get_level(player: dict, name: str) -> int:
     return _skill_node(player, name)["level"]
 
+def skill_level(player: dict, name: str) -> int:
+    """get_level without creating or repairing the skill node (never writes to player)."""
+    return int(((player.get("skills") or {}).get(name) or {}).get("level", 1) or 1)
+
 def is_overcharged(player: dict) -> bool:
     return bool(player.get("overcharged", False))
 
@@ -163,14 +240,30 @@ def perks_soldier(level: int) -> dict:
     }
 
 
+_PERK_FUNCS = {
+    "worker": perks_worker,
+    "crafter": perks_crafter,
+    "tinkerer": perks_tinkerer,
+    "trader": perks_trader,
+    "boxer": perks_boxer,
+    "gambler": perks_gambler,
+    "soldier": perks_soldier,
+}
+
+# _PERKS[name][L] = read-only perks for level L (1..PERK_TABLE_LEVELS)
+_PERKS: Dict[str, list] = {
+    _name: [None] + [freeze(fn(L)) for L in range(1, PERK_TABLE_LEVELS + 1)]
+    for _name, fn in _PERK_FUNCS.items()
+}
+
+def perks_at(name: str, level: int) -> dict:
+    """Read-only perks of one skill at `level` (table lookup up to PERK_TABLE_LEVELS)."""
+    L = int(level)
+    if 1 <= L <= PERK_TABLE_LEVELS:
+        return _PERKS[name][L]
+    return freeze(_PERK_FUNCS[name](L))
+
 def compute_perks(player: dict) -> dict:
-    return {
-        "worker": perks_worker(get_level(player, "worker")),
-        "crafter": perks_crafter(get_level(player, "crafter")),
-        "tinkerer": perks_tinkerer(get_level(player, "tinkerer")),
-        "trader": perks_trader(get_level(player, "trader")),
-        "boxer": perks_boxer(get_level(player, "boxer")),
-        "gambler": perks_gambler(get_level(player, "gambler")),
-        "soldier": perks_soldier(get_level(player, "soldier")),
-        "overcharged": is_overcharged(player),
-    }
+    out = {name: perks_at(name, skill_level(player, name)) for name in SKILLS}
+    out["overcharged"] = is_overcharged(player)
+    return out
@@ -2,7 +2,8 @@ from __future__ import annotations
 import logging
 from typing import Optional, Tuple
 from core.constants import SKILLS_ENABLED, SKILLS_VERBOSE, SKILLS_LOG_CHANNEL_ID
-from core.skills import award_skill_xp, compute_perks, get_level, is_overcharged, can_overcharge, set_overcharged
+from core.derived import derived_stats
+from core.skills import award_skill_xp, get_level, is_overcharged, can_overcharge, set_overcharged
 
 log = logging.getLogger(__name__)
 
@@ -21,12 +22,14 @@ def award_skill(ctx, skill: str, amount: int) -> Tuple[int, int]:
     return (lvl, up)
 
 def perks_for(player: dict) -> dict:
-    return compute_perks(player or {})
+    """Per-skill perks (memoized via core.derived; read-only)."""
+    return derived_stats(player or {}).perks
 
 # NEW: Flattened, skill-derived effects for systems to consume without touching ship_sys
 def effects_for(player: dict) -> dict:
     """
-    Returns a flat dict of skill-driven effects. Safe to import in combat/sell/tinker/work/etc.
+    Returns a flat, read-only dict of skill-driven effects (memoized via core.derived).
+    Safe to import in combat/sell/tinker/work/etc.
     Keys:
       - supply_crate_mult, extra_supply_crates
       - sell_price_mult
@@ -36,26 +39,7 @@ def effects_for(player: dict) -> dict:
       - craft_refund_pct
       - overcharged
     """
-    pk = perks_for(player)
-    boxer = pk.get("boxer", {}) or {}
-    trader = pk.get("trader", {}) or {}
-    tink = pk.get("tinkerer", {}) or {}
-    soldi = pk.get("soldier", {}) or {}
-    work = pk.get("worker", {}) or {}
-    craft = pk.get("crafter", {}) or {}
-    return {
-        "supply_crate_mult": float(boxer.get("supply_crate_chance_mult", 1.0)),
-        "extra_supply_crates": int(boxer.get("extra_supply_crates", 0)),
-        "sell_price_mult": float(trader.get("sell_price_mult", 1.0)),
-        "tinker_high_tier_weight_mult": float(tink.get("tinker_high_tier_weight_mult", 1.0)),
-        "tinker_scrap_refund_chance": float(tink.get("tinker_scrap_refund_chance", 0.0)),
-        "ship_upgrade_cost_reduction": float(soldi.get("ship_upgrade_cost_reduction", 0.0)),
-        "ship_max_level_bonus": int(soldi.get("ship_max_level_bonus", 0)),
-        "work_tier_weight_mult": float(work.get("work_tier_weight_mult", 1.0)),
-        "cross_material_chance": float(work.get("cross_material_chance", 0.0)),
-        "craft_refund_pct": float(craft.get("craft_refund_pct", 0.0)),
-        "overcharged": bool(pk.get("overcharged", False)),
-    }
+    return derived_stats(player or {}).effects
 
 # NEW: Focused helpers (import these in modules as needed)
 
@@ -1,44 +1,20 @@
 import json, os
 from discord.ext import commands
 from typing import Optional, Any
-from core.items import load_items, get_item_by_id
-from systems.ship_sys import derive_ship_effects
+from core.derived import derived_stats
 
 
 def get_max_health(player_or_level):
-    """Accept either a player dict or an integer level."""
+    """Accept either a player dict or an integer level (no ship boost for a bare level)."""
     if isinstance(player_or_level, dict):
-        level = int(player_or_level.get("level", 1))
-    else:
-        level = int(player_or_level)
-    max_hp = 100 + (level * 5)
-
-    base_max_hp = max_hp
-
-    eff = derive_ship_effects(player_or_level)
-    tb = eff.get("type_boost", {})
-    if tb and tb.get("stat") == "hp":
-        base_max_hp = int(round(max_hp * (1.0 + float(tb.get("value", 0.0)))))
-    return base_max_hp
+        return derived_stats(player_or_level).max_health
+    return 100 + (int(player_or_level) * 5)
 
 def get_max_oxygen(player_or_level):
     """Accept either a player dict or an integer level. Adds equipped armor oxygen_capacity bonus if present."""
-    base = 100
-    per_level = 5
-
     if isinstance(player_or_level, dict):
-        level = int(player_or_level.get("level", 1))
-        bonus = 0
-        armor_id = player_or_level.get("equipped", {}).get("armor")
-        if armor_id:
-            items = load_items()
-            armor = get_item_by_id(items, armor_id)
-            if armor and "oxygen_capacity" in armor:
-                bonus = int(armor["oxygen_capacity"])
-        return base + (level * per_level) + bonus
-    else:
-        level = int(player_or_level)
-        return base + (level * per_level)
+        return derived_stats(player_or_level).max_oxygen
+    return 100 + (int(player_or_level) * 5)
 
 def add_xp(player: dict, amount: int) -> dict:
     """Add XP, process level-ups, and clamp health/oxygen to new max. Returns info dict."""
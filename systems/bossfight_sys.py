@@ -1,10 +1,10 @@
 import random
 import asyncio
 from core.utils import get_max_health
-from core.shared import load_json, save_json
+from core.shared import save_json
+from core import gamedata
 from core.players import calculate_combat_stats
 from systems.ship_sys import derive_ship_effects
-from core.constants import BOSSES_FILE, ITEMS_FILE, PLANETS_FILE
 from systems.ship_sys import derive_ship_effects
 from core.rewards import apply_rewards 
 from typing import Tuple
@@ -22,8 +22,8 @@ def _keycard_count(player: dict) -> int:
 
 
 def load_boss_for_planet(planet_id: int, num_players: int):
-    bosses = load_json(BOSSES_FILE) or {}
-    planets = load_json(PLANETS_FILE) or {}
+    bosses = gamedata.bosses() or {}
+    planets = gamedata.planets() or {}
     pdata = planets.get(str(int(planet_id)), {}) or {}
 
     boss_id = pdata.get("boss_id")
@@ -144,7 +144,7 @@ async def check_requirements(ctx, profiles: dict, boss: dict):
     req_weapon_id = _norm_id(req_weapon)
     req_armor_id = _norm_id(req_armor)
 
-    items = load_json(ITEMS_FILE) or {}
+    items = gamedata.items() or {}
 
     # Keycard requirement (ship mk6+ can override)
     missing_keycard = []
@@ -448,7 +448,7 @@ def grant_boss_rewards(user_id: str, planet_id: int, profile: dict):
     profile["max_unlocked_planet"] = max(profile.get("max_unlocked_planet", 1), next_planet)
     profile["current_planet"] = next_planet  # NEW: auto-place on the unlocked planet
 
-    items = load_json(ITEMS_FILE)
+    items = gamedata.items()
     warpdrives = items.get("warpdrives", {})
 
     inv = profile.get("inventory", {})
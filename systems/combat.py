@@ -1,13 +1,12 @@
 # systems/combat.py
 import random
-from typing import List
-from core.shared import load_json
-from core.constants import ENEMIES_FILE
+from typing import List, Tuple
 from core.utils import get_max_health
 from core.players import calculate_combat_stats
 from systems.ship_sys import derive_ship_effects
 from core.skills_hooks import supply_crate_effects
 from core.sector import ensure_sector, sector_bonus_multiplier
+from core.enemies import get_enemy_tables
 
 
 # ===== Supply Crate drop config =====
@@ -16,6 +15,12 @@ BASE_SUPPLY_CRATE_CHANCE = {
     "explore": 0.040,  # 4.0% base on elite fights
 }
 
+# Base (Scrap, XP) reward ranges per won fight, before core.rewards multipliers
+BASE_FIGHT_REWARDS = {
+    "scan": {"scrap": (5, 25), "xp": (10, 30)},
+    "explore": {"scrap": (50, 100), "xp": (80, 150)},
+}
+
 RARITY_WEIGHTS = {
     "scan": {
         "common": 75.0,
@@ -50,20 +55,19 @@ RARITY_TO_ID = {
     "universal": "307",
 }
 
-def _roll_supply_crate_rarity(fight_type: str) -> str:
+def _roll_supply_crate_rarities(fight_type: str, k: int = 1, rng=random) -> List[str]:
     ft = "explore" if fight_type == "explore" else "scan"
     table = RARITY_WEIGHTS[ft]
     names = list(table.keys())
     weights = list(table.values())
-    return random.choices(names, weights=weights, k=1)[0]
+    return rng.choices(names, weights=weights, k=k)
 
-def roll_supply_crate_drop(player: dict, fight_type: str) -> List[str]:
+def supply_crate_drop_params(player: dict, fight_type: str) -> Tuple[float, bool, int]:
     """
-    Returns a list of supply crate item_ids dropped this fight.
+    (chance, ship_double, extra_from_skill) for one fight's supply crate roll.
     Skill effects: supply_crate_mult (chance) and extra_supply_crates (extra rolls).
-    Ship effects: double_supply_crates (adds one extra independent roll) but only when a base crate drops.
-    Boxer extras apply ONLY if at least one base crate drops.
-    Sector multiplies the drop chance.
+    Ship effects: double_supply_crates (one extra independent roll on a base hit).
+    Sector multiplies the drop chance (capped to avoid certainty).
     """
     sk = supply_crate_effects(player)
     mult = float(sk.get("supply_crate_mult", 1.0))
@@ -80,27 +84,22 @@ def roll_supply_crate_drop(player: dict, fight_type: str) -> List[str]:
 
     # Final chance after sector + skill mult
     chance = max(0.0, min(0.95, base * max(0.0, mult) * max(0.0, sec_mult)))
+    return chance, ship_double, max(0, extra_from_skill)
 
-    drops: List[str] = []
-    base_hit = False
-
-    # Primary roll
-    if random.random() < chance:
-        rar = _roll_supply_crate_rarity(fight_type)
-        drops.append(RARITY_TO_ID.get(rar, "300"))
-        base_hit = True
-
-        # Ship “double_supply_crates” (independent extra roll) - only if base crate dropped
-        if ship_double:
-            rar2 = _roll_supply_crate_rarity(fight_type)
-            drops.append(RARITY_TO_ID.get(rar2, "300"))
-
-        # Extra crates from Boxer (only if base crate hit)
-        for _ in range(max(0, extra_from_skill)):
-            rarx = _roll_supply_crate_rarity(fight_type)
-            drops.append(RARITY_TO_ID.get(rarx, "300"))
+def roll_supply_crate_drop(player: dict, fight_type: str, rng=random) -> List[str]:
+    """
+    Returns a list of supply crate item_ids dropped this fight.
+    Ship double_supply_crates and Boxer extras apply ONLY if the base crate drops
+    (see supply_crate_drop_params).
+    """
+    chance, ship_double, extra_from_skill = supply_crate_drop_params(player, fight_type)
 
-    return drops
+    if rng.random() >= chance:
+        return []
+    # Base crate hit: its rarity, the ship "double_supply_crates" roll and the Boxer
+    # extras are independent rolls, drawn in one batch
+    k = 1 + int(ship_double) + extra_from_skill
+    return [RARITY_TO_ID.get(rar, "300") for rar in _roll_supply_crate_rarities(fight_type, k, rng)]
 
 def _unique_non_loot_drops_list(drops):
     """
@@ -117,16 +116,20 @@ def _unique_non_loot_drops_list(drops):
             out.append(sid)
     return out
 
+def enemy_drop_chance(player: dict, enemy: dict) -> float:
+    """Per-entry chance of an enemy-native drop; sector multiplies it (capped)."""
+    base_chance = float(enemy.get("drop_chance", 0.02))  # fallback 2% per entry
+    sec = ensure_sector(player)
+    sec_mult = sector_bonus_multiplier(sec)
+    return max(0.0, min(0.95, base_chance * max(0.0, sec_mult)))
+
 def _roll_enemy_drops(player: dict, enemy: dict, rng=random) -> list[str]:
     """
     Roll enemy-native drops (non-supply-crate). Each unique non-supply-crate item is rolled once.
     Sector multiplies the per-entry chance. No ship double-drops here (apply later in scan/explore if needed).
     """
     tokens = _unique_non_loot_drops_list(enemy.get("drops", []))
-    base_chance = float(enemy.get("drop_chance", 0.02))  # fallback 2% per entry
-    sec = ensure_sector(player)
-    sec_mult = sector_bonus_multiplier(sec)
-    chance = max(0.0, min(0.95, base_chance * max(0.0, sec_mult)))
+    chance = enemy_drop_chance(player, enemy)
     out: list[str] = []
     for tok in tokens:
         if rng.random() < chance:
@@ -134,15 +137,30 @@ def _roll_enemy_drops(player: dict, enemy: dict, rng=random) -> list[str]:
     return out
 
 
-def calculate_damage(attacker, defender):
+def calculate_damage(attacker, defender, rng=random):
     attack = attacker.get("attack", 0)
     defense = defender.get("defense", 0)
     base_damage = max(1, attack - defense * 0.5)
-    if random.random() < 0.1:
+    if rng.random() < 0.1:
         base_damage *= 1.5
     return int(base_damage)
 
-def simulate_combat(player, enemy, fight_type: str):
+def resolve_rounds(player_hp, enemy_hp, player_damage, enemy_damage):
+    """
+    Closed form of the round loop: both sides hit once per round (simultaneously)
+    until one is at 0 HP or below. Damage is fixed per round, so the fight ends
+    after min(ceil(enemy_hp / player_damage), ceil(player_hp / enemy_damage)) rounds.
+    Returns (enemy_hp, player_hp, rounds) after the last round (HP may be negative).
+    """
+    if player_hp <= 0 or enemy_hp <= 0:
+        return enemy_hp, player_hp, 0
+    rounds = -(-enemy_hp // player_damage)
+    if enemy_damage > 0:
+        rounds = min(rounds, -(-player_hp // enemy_damage))
+    rounds = int(rounds)
+    return enemy_hp - rounds * player_damage, player_hp - rounds * enemy_damage, rounds
+
+def simulate_combat(player, enemy, fight_type: str, rng=random):
     """
     Simulate a full fight until one side dies.
     fight_type: 'scan' (basic) or 'explore' (elite)
@@ -150,25 +168,21 @@ def simulate_combat(player, enemy, fight_type: str):
       player_won, enemy_hp_left, player_hp_left, rounds, drops[list[item_id or tokens]]
     """
     stats = calculate_combat_stats(player)
-    player_hp = player.get("health", get_max_health(player))
-    enemy_hp = enemy["hp"]
-    rounds = 0
+    player_damage = max(stats["attack"] - enemy.get("defense", 0), 1)
+    enemy_damage = max(enemy.get("attack", 0) - stats["defense"], 0)
     drops: List[str] = []
 
-    while player_hp > 0 and enemy_hp > 0:
-        rounds += 1
-        player_damage = max(stats["attack"] - enemy.get("defense", 0), 1)
-        enemy_damage = max(enemy.get("attack", 0) - stats["defense"], 0)
-        enemy_hp -= player_damage
-        player_hp -= enemy_damage
+    enemy_hp, player_hp, rounds = resolve_rounds(
+        player.get("health", get_max_health(player)), enemy["hp"], player_damage, enemy_damage
+    )
 
     player_won = enemy_hp <= 0 and player_hp > 0
 
     if player_won:
         # non-supply-crate drops (deduped)
-        drops.extend(_roll_enemy_drops(player, enemy))
+        drops.extend(_roll_enemy_drops(player, enemy, rng))
         # Supply Cratees (chance × Boxer, extras gated by base hit, ship double on base hit)
-        drops.extend(roll_supply_crate_drop(player, fight_type))
+        drops.extend(roll_supply_crate_drop(player, fight_type, rng))
 
     return {
         "player_won": player_won,
@@ -179,13 +193,6 @@ def simulate_combat(player, enemy, fight_type: str):
     }
 
 
-def choose_random_enemy(player, category="basic"):
-    planet_id = str(player.get("current_planet", 1))
-    enemies_data = load_json(ENEMIES_FILE).get(f"P{planet_id}E", {})
-
-    valid_enemies = {k: v for k, v in enemies_data.items() if v.get("category") == category}
-    if not valid_enemies:
-        return None, None
-
-    enemy_key = random.choice(list(valid_enemies.keys()))
-    return enemy_key, valid_enemies[enemy_key]
+def choose_random_enemy(player, category="basic", rng=random):
+    planet_id = int(player.get("current_planet", 1) or 1)
+    return get_enemy_tables().pick(planet_id, category, rng)
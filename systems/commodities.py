@@ -1,10 +1,9 @@
 import os, json, time, math
 from typing import Dict, Iterable, Tuple
 from discord.ext import tasks
-from core.shared import load_json
-from core.constants import ITEMS_FILE
+from core import gamedata
+from core.player_store import get_player_store
 
-PROFILE_DIR = os.path.join("data", "players")
 STATE_FILE = os.path.join("data", "commodities.json")
 TICK_SECONDS = 300
 HISTORY_MAX = 288
@@ -42,33 +41,9 @@ def _save_state(state: Dict) -> None:
     os.replace(tmp, STATE_FILE)
 
 def _iter_profiles():
-    # players.json (monolithic) support
-    fallback = os.path.join("data", "players.json")
-    if os.path.isfile(fallback):
-        try:
-            with open(fallback, "r", encoding="utf-8") as f:
-                data = json.load(f) or {}
-            if isinstance(data, dict):
-                for v in data.values():
-                    if isinstance(v, dict):
-                        yield v
-            return
-        except Exception:
-            return
-    # per-file dir support (unused today)
-    if not os.path.isdir(PROFILE_DIR):
-        return
-    for name in os.listdir(PROFILE_DIR):
-        if not name.lower().endswith(".json"):
-            continue
-        path = os.path.join(PROFILE_DIR, name)
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                prof = json.load(f) or {}
-            if isinstance(prof, dict):
-                yield prof
-        except Exception:
-            continue
+    # In-memory player store: covers every backend (players.json, SQLite, per-player files)
+    # and includes profiles not yet flushed to disk
+    yield from get_player_store().iter_profiles()
 
 def _build_chain_index(items_data: Dict) -> Dict[str, Dict[str, int]]:
     idx: Dict[str, Dict[str, int]] = {b: {} for b in CHAINS.keys()}
@@ -108,7 +83,7 @@ def _cap_move(prev: float, target: float) -> float:
 
 @tasks.loop(seconds=TICK_SECONDS)
 async def commodities_tick():
-    items_data = load_json(ITEMS_FILE) or {}
+    items_data = gamedata.items() or {}
     chain_index = _build_chain_index(items_data)
     now = int(time.time())
 
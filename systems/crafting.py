@@ -1,12 +1,13 @@
 # systems/crafting.py
 from __future__ import annotations
 import re
-from core.shared import load_json
-from core.constants import RECIPES_FILE
+from typing import Optional, Tuple
+from core import gamedata
+from core.fuzzy import NameSearch
 
 
 def load_recipes():
-    return load_json(RECIPES_FILE)
+    return gamedata.recipes()
 
 def can_craft(player, recipe_id):
     """Check if player has enough materials to craft."""
@@ -139,4 +140,193 @@ def crafter_xp_for_product(product_key: str | int, product_name: str | None = No
         if ak in _CRAFTER_XP:
             return int(_CRAFTER_XP[ak])
 
-    return 0
\ No newline at end of file
+    return 0
+
+# ---- Recipe lookup (crafting.json) ----
+_recipe_search_cache: Tuple[object, Optional[NameSearch]] = (None, None)
+
+
+def get_recipe_search(recipes: dict | None = None) -> NameSearch:
+    """NameSearch over crafting.json recipe keys, names and aliases (rebuilt after reloads)."""
+    global _recipe_search_cache
+    if recipes is None:
+        recipes = (gamedata.crafting() or {}).get("recipes") or {}
+    data, search = _recipe_search_cache
+    if search is not None and recipes is data:
+        return search
+    entries = []
+    for key, r in recipes.items():
+        entries.append((str(key), str(key)))
+        if isinstance(r, dict):
+            if "name" in r:
+                entries.append((str(r["name"]), str(key)))
+            entries.extend((str(a), str(key)) for a in r.get("aliases", []))
+    search = NameSearch(entries)
+    if isinstance(recipes, gamedata.FrozenDict):
+        _recipe_search_cache = (recipes, search)
+    return search
+
+
+def find_recipe(query: str, recipes: dict | None = None) -> tuple[str | None, dict | None]:
+    """(recipe_key, recipe) matching a key, name or alias exactly, else (None, None)."""
+    if recipes is None:
+        recipes = (gamedata.crafting() or {}).get("recipes") or {}
+    for key in get_recipe_search(recipes).exact(query):
+        if key in recipes:
+            return key, recipes[key]
+    return None, None
+
+
+def suggest_recipe_names(query: str, recipes: dict | None = None, limit: int = 3) -> list[str]:
+    """"Did you mean" recipe names for an unknown craft query."""
+    if recipes is None:
+        recipes = (gamedata.crafting() or {}).get("recipes") or {}
+    keys = get_recipe_search(recipes).suggest(query, limit=limit)
+    return [str((recipes.get(k) or {}).get("name", k)) for k in keys]
+
+
+# ---- Recipe graph and chain planner ----
+class RecipeGraph:
+    """
+    crafting.json recipes as a DAG over normalized keys:
+    - recipes: key -> recipe (output key is the recipe key)
+    - inputs:  key -> {normalized material key: qty per craft}
+    - order:   topological order, every product before the materials it consumes
+    - keys:    normalized key -> recipe key as written in crafting.json (the inventory id)
+    """
+
+    __slots__ = ("recipes", "inputs", "order", "keys")
+
+    def __init__(self, recipes: dict):
+        self.recipes: dict[str, dict] = {}
+        self.inputs: dict[str, dict[str, int]] = {}
+        self.keys: dict[str, str] = {}
+        for key, r in (recipes or {}).items():
+            if not isinstance(r, dict):
+                continue
+            nk = _norm_key(key)
+            self.recipes[nk] = r
+            self.keys[nk] = str(key)
+            self.inputs[nk] = {_norm_key(m): int(q) for m, q in (r.get("materials") or {}).items()}
+
+        # DFS post-order gives materials before products; reverse it. Back edges (cycles) are ignored.
+        post: list[str] = []
+        state: dict[str, int] = {}  # 1 = on stack, 2 = done
+        for root in self.inputs:
+            if state.get(root):
+                continue
+            stack = [(root, iter(self.inputs.get(root, ())))]
+            state[root] = 1
+            while stack:
+                node, it = stack[-1]
+                child = next(it, None)
+                if child is None:
+                    stack.pop()
+                    state[node] = 2
+                    post.append(node)
+                elif not state.get(child):
+                    state[child] = 1
+                    stack.append((child, iter(self.inputs.get(child, ()))))
+                elif state[child] == 1:
+                    print(f"[crafting] recipe cycle through '{child}' ignored")
+        self.order: list[str] = post[::-1]
+
+    def craftable(self, key: str, level: int) -> bool:
+        r = self.recipes.get(key)
+        return r is not None and int(r.get("level_req", 0) or 0) <= level
+
+    def expand(self, target: str, batches: int, stock: dict[str, int], level: int):
+        """
+        Crafts needed to make `batches` crafts of target, using stock first and crafting
+        intermediates as needed. Returns (crafts {key: batches}, need {key: qty consumed}).
+        """
+        crafts = {target: batches}
+        need: dict[str, int] = {}
+        for mat, q in self.inputs[target].items():
+            need[mat] = need.get(mat, 0) + q * batches
+        for node in self.order:
+            if node == target or need.get(node, 0) <= 0 or not self.craftable(node, level):
+                continue
+            short = need[node] - stock.get(node, 0)
+            if short <= 0:
+                continue
+            out = max(1, int(self.recipes[node].get("output", 1) or 1))
+            b = -(-short // out)
+            crafts[node] = crafts.get(node, 0) + b
+            for mat, q in self.inputs[node].items():
+                need[mat] = need.get(mat, 0) + q * b
+        return crafts, need
+
+    def feasible(self, need: dict[str, int], crafts: dict[str, int], stock: dict[str, int]) -> bool:
+        for key, qty in need.items():
+            made = crafts.get(key, 0) * max(1, int((self.recipes.get(key) or {}).get("output", 1) or 1))
+            if qty > stock.get(key, 0) + made:
+                return False
+        return True
+
+
+_graph_cache: Tuple[object, Optional[RecipeGraph]] = (None, None)
+
+# Upper bound for "as many as possible" searches (recipes without inputs never run out)
+_MAX_CHAIN_BATCHES = 1_000_000_000
+
+
+def get_recipe_graph(recipes: dict | None = None) -> RecipeGraph:
+    """RecipeGraph for crafting.json (rebuilt only after a reload)."""
+    global _graph_cache
+    if recipes is None:
+        recipes = (gamedata.crafting() or {}).get("recipes") or {}
+    data, graph = _graph_cache
+    if graph is not None and recipes is data:
+        return graph
+    graph = RecipeGraph(recipes)
+    if isinstance(recipes, gamedata.FrozenDict):
+        _graph_cache = (recipes, graph)
+    return graph
+
+
+def plan_chain_craft(target_key: str, stock: dict[str, int], level: int,
+                     batches: int | None = None, recipes: dict | None = None) -> dict:
+    """
+    Plan crafting target_key through its chain of intermediates.
+    stock: normalized key -> available qty ("scrap" included).
+    batches=None crafts as many as possible (exponential + binary search over the
+    monotone feasibility check). Returns
+      {"target", "batches", "crafts": [(key, batches), ...] in execution order,
+       "delta": {normalized key: net qty change}, "max": max feasible batches}
+    "batches" is 0 when nothing (or not the requested amount) can be made.
+    """
+    graph = get_recipe_graph(recipes)
+    target = _norm_key(target_key)
+    if target not in graph.inputs or not graph.craftable(target, level):
+        return {"target": target, "batches": 0, "crafts": [], "delta": {}, "max": 0}
+
+    def ok(n: int) -> bool:
+        crafts, need = graph.expand(target, n, stock, level)
+        return graph.feasible(need, crafts, stock)
+
+    hi = 1
+    while hi <= _MAX_CHAIN_BATCHES and ok(hi):
+        hi *= 2
+    lo = hi // 2  # ok(lo) holds (or lo == 0)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if ok(mid):
+            lo = mid
+        else:
+            hi = mid
+    best = lo
+
+    n = best if batches is None else (batches if batches <= best else 0)
+    if n <= 0:
+        return {"target": target, "batches": 0, "crafts": [], "delta": {}, "max": best}
+
+    crafts, need = graph.expand(target, n, stock, level)
+    delta: dict[str, int] = {k: -q for k, q in need.items()}
+    for key, b in crafts.items():
+        out = max(1, int(graph.recipes[key].get("output", 1) or 1))
+        delta[key] = delta.get(key, 0) + b * out
+    rank = {k: i for i, k in enumerate(graph.order)}
+    steps = sorted(crafts.items(), key=lambda kv: -rank.get(kv[0], 0))  # materials first
+    return {"target": target, "batches": n, "crafts": steps,
+            "delta": {k: v for k, v in delta.items() if v}, "max": best}
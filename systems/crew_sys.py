@@ -1,8 +1,9 @@
-import asyncio, time, random, discord
+import asyncio, time, discord
 from typing import Optional
 from core.decorators import requires_profile
 from core.players import save_profile
 from core.guards import set_lock, clear_lock
+from core.rng import command_rng
 from core.crew import (
     capacity_for_sector, ensure_crew_struct, spawn_candidate, parse_offer_string,
     clamp_offer_to_wallet, hire_probability, pay_now, add_hired_crew
@@ -19,10 +20,11 @@ async def maybe_spawn_crew(ctx, source: str):
         return
     if len(player["crew"]) >= cap:
         return
-    if random.random() >= SPAWN_CHANCE:
+    rng = command_rng(ctx)
+    if rng.random() >= SPAWN_CHANCE:
         return
 
-    cand = spawn_candidate()
+    cand = spawn_candidate(rng)
     # Lock during prompt
     set_lock(str(ctx.author.id), lock_type="crew_hire", allowed=set(), note="Crew hire prompt")
     try:
@@ -56,7 +58,7 @@ async def maybe_spawn_crew(ctx, source: str):
         # Hiring probability should reflect the strength of the actual offer the player can afford now
         pay_scrap, pay_med = clamp_offer_to_wallet(player, offer_scrap_nominal, offer_med_nominal)
         p = hire_probability(pay_scrap, pay_med, cand["salary_demand"], cand["benefits_demand"])
-        hired = (random.random() <= p)
+        hired = (rng.random() <= p)
 
         # Deduct now (consumed on hire), clamped to wallet
         pay_now(player, pay_scrap, pay_med)
@@ -1,9 +1,11 @@
 ﻿import math
-from core.shared import load_json, save_json
-from core.constants import ITEMS_FILE
+from core.shared import save_json
+from core import gamedata
 from core.players import save_profile
-from core.items import resolve_item_by_name_or_alias, get_inventory_key_for_item
+from core.items import resolve_item_by_name_or_alias, get_inventory_key_for_item, suggest_item_names
+from core.fuzzy import did_you_mean
 from core.parsing import parse_amount
+from typing import Dict, List, Optional, Tuple
 
 DISMANTLE_RETURN_RATE = 0.8  # 80% return
 
@@ -18,100 +20,194 @@ def get_material_tiers():
     }
 
 
-def dismantle_item(player, item_name: str, amount_input: int | str | None):
-    items_data = load_json(ITEMS_FILE)
-    inventory = player.get("inventory", {})
+class TierTable:
+    """
+    Material tiers resolved against items.json once per catalogue version:
+    - families: family -> [(inventory key, item id, display name), ...] from base to top tier
+    - position: inventory key / item id -> (family, tier index)
+    """
+
+    __slots__ = ("families", "position")
+
+    def __init__(self, items_data):
+        self.families: Dict[str, List[Tuple[str, Optional[str], str]]] = {}
+        self.position: Dict[str, Tuple[str, int]] = {}
+        for family, names in get_material_tiers().items():
+            row = []
+            for i, tier_name in enumerate(names):
+                _, iid, meta = resolve_item_by_name_or_alias(items_data, tier_name, category_filter=["materials"])
+                display = meta.get("name", tier_name) if meta else tier_name
+                key = get_inventory_key_for_item(display)
+                row.append((key, iid, display))
+                self.position[key] = (family, i)
+                if iid:
+                    self.position.setdefault(str(iid), (family, i))
+            self.families[family] = row
+
+    def have(self, inventory: dict, family: str, tier: int) -> Tuple[str, int]:
+        """(inventory key actually holding this tier, qty); prefers the name-derived key like dismantle_item."""
+        key, iid, _ = self.families[family][tier]
+        if key not in inventory and iid and str(iid) in inventory:
+            key = str(iid)
+        return key, int(inventory.get(key, 0) or 0)
+
+
+_tier_cache: Tuple[object, Optional[TierTable]] = (None, None)
+
+
+def get_tier_table(items_data=None) -> TierTable:
+    global _tier_cache
+    if items_data is None:
+        items_data = gamedata.items()
+    data, table = _tier_cache
+    if table is not None and items_data is data:
+        return table
+    table = TierTable(items_data)
+    if isinstance(items_data, gamedata.FrozenDict):
+        _tier_cache = (items_data, table)
+    return table
+
+
+def _yield_per_step() -> int:
+    return math.floor(10 * DISMANTLE_RETURN_RATE)  # 10 -> 8 by default
 
-    # Resolve item using alias resolution - search only in materials
-    category, item_key, item_data = resolve_item_by_name_or_alias(
-        items_data, 
-        item_name, 
-        category_filter=["materials"]
-    )
-    
+
+def _parse_dismantle_amount(amount_input, have_qty: int) -> Tuple[Optional[int], Optional[str]]:
+    """(amount, None) or (None, error message) — same rules as single-step dismantle."""
+    if amount_input is None:
+        return 1, None
+    if isinstance(amount_input, str):
+        parsed = parse_amount(amount_input, max_possible=have_qty)
+        if parsed == "all":
+            return have_qty, None
+        if parsed is None:
+            return None, f" Invalid amount: `{amount_input}`"
+        return parsed, None
+    return amount_input, None
+
+
+def _resolve_tier(items_data, inventory, name: str):
+    """(family, tier index, display name) of a dismantlable material, or an error string."""
+    table = get_tier_table(items_data)
+    category, item_key, item_data = resolve_item_by_name_or_alias(items_data, name, category_filter=["materials"])
     if not item_data:
-        return f" `{item_name}` is not a valid material or cannot be dismantled."
-    
-    resolved_name = item_data.get("name", item_name)
-    material_tiers = get_material_tiers()
-
-    # Find which tier the item belongs to
-    found_family, tier_index = None, None
-    name_normalized = resolved_name.lower().strip()
-    
-    for family, tiers in material_tiers.items():
-        for i, tier_name in enumerate(tiers):
-            if name_normalized == tier_name.lower():
-                found_family = family
-                tier_index = i
-                break
-        if found_family:
-            break
-
-    if not found_family:
+        hint = did_you_mean(suggest_item_names(name, items_data, owned=inventory, category_filter=["materials"]))
+        return f" `{name}` is not a valid material or cannot be dismantled.{hint}"
+    resolved_name = item_data.get("name", name)
+    pos = table.position.get(get_inventory_key_for_item(resolved_name)) or table.position.get(str(item_key))
+    if not pos:
         return f" `{resolved_name}` cannot be dismantled."
+    return pos[0], pos[1], resolved_name
+
+
+def _apply_inventory_delta(player: dict, inventory: dict, delta: Dict[str, int]) -> None:
+    for key, d in delta.items():
+        inventory[key] = int(inventory.get(key, 0) or 0) + d
+        if inventory[key] <= 0:
+            del inventory[key]
+    player["inventory"] = inventory
+
+
+def dismantle_item(player, item_name: str, amount_input: int | str | None):
+    return dismantle_chain(player, item_name, amount_input, steps=1)
+
+
+def dismantle_chain(player, item_name: str, amount_input: int | str | None = None,
+                    down_to: str | None = None, steps: int | None = None):
+    """
+    Dismantle `amount` of a material straight down its chain, by default to the base tier
+    (or to `down_to`, or `steps` tiers down). Each tier step returns floor(10 * rate) of the
+    tier below, so n items k tiers up yield n * step**k in closed form; one save, one message.
+    """
+    items_data = gamedata.items()
+    inventory = player.get("inventory", {})
+    table = get_tier_table(items_data)
+
+    src = _resolve_tier(items_data, inventory, item_name)
+    if isinstance(src, str):
+        return src
+    family, tier_index, resolved_name = src
 
     if tier_index == 0:
         return f" `{resolved_name}` is the base material and cannot be dismantled further."
 
-    # Find the actual inventory key - try both formats
-    inv_key = get_inventory_key_for_item(resolved_name)
-    if inv_key not in inventory:
-        # Try with the original key from items.json
-        inv_key = item_key
-    
-    have_qty = inventory.get(inv_key, 0)
-    
-    # Parse amount with knowledge of available quantity (for "half" calculation)
-    if amount_input is None:
-        amount = 1
-    elif isinstance(amount_input, str):
-        parsed = parse_amount(amount_input, max_possible=have_qty)
-        if parsed == "all":
-            amount = have_qty
-        elif parsed is None:
-            return f" Invalid amount: `{amount_input}`"
-        else:
-            amount = parsed
+    if down_to is not None:
+        dst = _resolve_tier(items_data, inventory, down_to)
+        if isinstance(dst, str):
+            return dst
+        if dst[0] != family or dst[1] >= tier_index:
+            return f" `{resolved_name}` cannot be dismantled into `{dst[2]}`."
+        target_index = dst[1]
+    elif steps is not None:
+        target_index = max(0, tier_index - int(steps))
     else:
-        amount = amount_input
-    
+        target_index = 0
+
+    inv_key, have_qty = table.have(inventory, family, tier_index)
+    amount, err = _parse_dismantle_amount(amount_input, have_qty)
+    if err:
+        return err
+
     # Validate amount
     if have_qty < amount:
         return f" You don't have enough `{resolved_name}` to dismantle. You have {have_qty}, need {amount}."
-    
+
     if amount <= 0:
         return f" You need to dismantle at least 1 `{resolved_name}`."
 
-    # Determine what item this dismantles into
-    lower_tier_name = material_tiers[found_family][tier_index - 1]
-    
-    # Resolve the lower tier item to get its proper key
-    _, lower_item_key, lower_item_data = resolve_item_by_name_or_alias(
-        items_data, 
-        lower_tier_name, 
-        category_filter=["materials"]
-    )
-    
-    if not lower_item_data:
-        # Fallback to generated key
-        lower_tier_id = get_inventory_key_for_item(lower_tier_name)
-    else:
-        lower_tier_id = get_inventory_key_for_item(lower_item_data.get("name", lower_tier_name))
+    lower_tier_id, _, lower_display_name = table.families[family][target_index]
+    gained = amount * _yield_per_step() ** (tier_index - target_index)
 
-    lower_tier_qty = math.floor(10 * DISMANTLE_RETURN_RATE)  # 10  8 by default
+    _apply_inventory_delta(player, inventory, {inv_key: -amount, lower_tier_id: gained})
+    save_profile(player["id"], player)
 
-    # Apply transaction
-    inventory[inv_key] -= amount
-    if inventory[inv_key] <= 0:
-        del inventory[inv_key]
+    via = [name for _, _, name in table.families[family][target_index + 1:tier_index]]
+    via_str = f" (via {', '.join(reversed(via))})" if via else ""
+    return f" Dismantled **{amount}x {resolved_name}**  **{gained}x {lower_display_name}**{via_str}"
 
-    inventory[lower_tier_id] = inventory.get(lower_tier_id, 0) + lower_tier_qty * amount
-    player["inventory"] = inventory
 
+def dismantle_family(player, family_query: str, down_to: str | None = None):
+    """
+    Break every tier of a material family that sits above the target (base by default)
+    down to that tier. family_query is a family name ("plasteel") or any material in it.
+    The total is sum(have_k * step**(k - target)); one save, one message.
+    """
+    items_data = gamedata.items()
+    inventory = player.get("inventory", {})
+    table = get_tier_table(items_data)
+
+    family = str(family_query or "").lower().strip()
+    target_index = 0
+    if family not in table.families:
+        pos = _resolve_tier(items_data, inventory, family_query)
+        if isinstance(pos, str):
+            return pos
+        family = pos[0]
+    if down_to is not None:
+        dst = _resolve_tier(items_data, inventory, down_to)
+        if isinstance(dst, str):
+            return dst
+        if dst[0] != family:
+            return f" `{dst[2]}` is not part of the {family} chain."
+        target_index = dst[1]
+
+    step = _yield_per_step()
+    delta: Dict[str, int] = {}
+    used: List[str] = []
+    gained = 0
+    for k in range(len(table.families[family]) - 1, target_index, -1):
+        key, qty = table.have(inventory, family, k)
+        if qty <= 0:
+            continue
+        delta[key] = -qty
+        gained += qty * step ** (k - target_index)
+        used.append(f"{qty}x {table.families[family][k][2]}")
+
+    lower_tier_id, _, lower_display_name = table.families[family][target_index]
+    if not gained:
+        return f" You have nothing above **{lower_display_name}** in the {family} chain to dismantle."
+
+    delta[lower_tier_id] = delta.get(lower_tier_id, 0) + gained
+    _apply_inventory_delta(player, inventory, delta)
     save_profile(player["id"], player)
-    
-    # Get proper display name for lower tier
-    lower_display_name = lower_item_data.get("name", lower_tier_name) if lower_item_data else lower_tier_name
-    
-    return f" Dismantled **{amount}x {resolved_name}**  **{lower_tier_qty * amount}x {lower_display_name}**"
+    return f" Dismantled **{', '.join(used)}**  **{gained}x {lower_display_name}**"
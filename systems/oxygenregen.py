@@ -1,6 +1,5 @@
 import time
-from core.constants import ITEMS_FILE
-from core.shared import load_json
+from core import gamedata
 from core.utils import get_max_health, get_max_oxygen
 from core.items import get_item_by_id
 
@@ -20,7 +19,7 @@ def apply_oxygen_regen(player):
 
     equipped = player.get("equipped", {})
     armor_id = equipped.get("armor")
-    items = load_json(ITEMS_FILE)
+    items = gamedata.items()
 
     if not armor_id:
         return player  # no armor
@@ -1,8 +1,10 @@
 from __future__ import annotations
 import math
 import random
-from typing import Dict, Optional, Tuple
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
 from core.skills_hooks import perks_for  
+from core.derived import derived_stats
 
 
 SHIP_TYPES = ("frigate", "monitor", "dreadnought", "freighter", "outrider")  # attack, defense, hp, scrap, tinker
@@ -97,6 +99,47 @@ def upgrade_cost_for_next_level(tier: int, level: int, ship_skill: float = 0.0)
     return max(1, int(cost))
 
 
+# Cumulative upgrade costs keyed on (tier, ship_skill, cost_reduction):
+#   table[L] = Scrap to go from level 1 to level L, with the Soldier reduction
+#   applied (and rounded) per level exactly like a single !ship upgrade.
+# The table ends at the last level upgrade_cost_for_next_level() can reach.
+_cost_tables: Dict[Tuple[int, float, float], List[int]] = {}
+
+def upgrade_cost_table(tier: int, ship_skill: float = 0.0, cost_reduction: float = 0.0) -> List[int]:
+    key = (int(tier), float(ship_skill), float(cost_reduction))
+    table = _cost_tables.get(key)
+    if table is None:
+        table = [0, 0]
+        level = 1
+        while True:
+            base = upgrade_cost_for_next_level(key[0], level, key[1])
+            if base is None:
+                break
+            table.append(table[-1] + max(1, int(round(base * (1.0 - key[2])))))
+            level += 1
+        _cost_tables[key] = table
+    return table
+
+def upgrade_cost_between(tier: int, from_level: int, to_level: int,
+                         ship_skill: float = 0.0, cost_reduction: float = 0.0) -> Optional[int]:
+    """Scrap for from_level → to_level in one go, or None if to_level is past the cost curve."""
+    table = upgrade_cost_table(tier, ship_skill, cost_reduction)
+    lo, hi = max(1, int(from_level)), int(to_level)
+    if hi >= len(table):
+        return None
+    return max(0, table[hi] - table[min(lo, hi)])
+
+def max_affordable_level(tier: int, level: int, scrap: int, cap_level: int,
+                         ship_skill: float = 0.0, cost_reduction: float = 0.0) -> int:
+    """Highest level <= cap_level reachable from `level` with `scrap` (binary search over the prefix sums)."""
+    table = upgrade_cost_table(tier, ship_skill, cost_reduction)
+    lo = max(1, int(level))
+    if lo >= len(table):
+        return lo
+    best = bisect_right(table, table[lo] + max(0, int(scrap))) - 1
+    return max(lo, min(best, int(cap_level), len(table) - 1))
+
+
 def type_boost_percent(tier: int, level: int) -> float:
     """
     Returns decimal (e.g., 0.012 = +1.2%) based on tier+level.
@@ -112,6 +155,13 @@ def type_boost_percent(tier: int, level: int) -> float:
     return base_lvl1 * scale  # final percent as decimal
 
 def derive_ship_effects(player: dict) -> dict:
+    """
+    Ship effects/multipliers for gameplay (memoized via core.derived; read-only).
+    Keys are documented on ship_effects_uncached().
+    """
+    return derived_stats(player).ship
+
+def ship_effects_uncached(player: dict) -> dict:
     """
     Derive all ship effects/multipliers for gameplay.
     Returns keys:
@@ -1,8 +1,9 @@
 # Supply Crate rewards driven by data/supply_crates.json
 import random
 from typing import Dict, List, Tuple
-from core.shared import load_json
-from core.constants import ITEMS_FILE, SUPPLY_CRATES_FILE
+from core import gamedata
+from core.items import ItemIndex, get_item_index
+from core.sampling import AliasTable, multinomial
 
 def _clamp_qty(low: int, high: int) -> Tuple[int, int]:
     a, b = int(low), int(high)
@@ -10,37 +11,12 @@ def _clamp_qty(low: int, high: int) -> Tuple[int, int]:
         a, b = b, a
     return max(1, a), max(1, b)
 
-def _index_items(items_data: dict) -> tuple[set[str], dict[str, str]]:
-    """
-    Build:
-      - id_set: all canonical item ids across categories
-      - name_to_id: lowercased meta['name'] -> canonical id
-    """
-    id_set: set[str] = set()
-    name_to_id: dict[str, str] = {}
-    if not isinstance(items_data, dict):
-        return id_set, name_to_id
-    for cat, table in items_data.items():
-        if not isinstance(table, dict):
-            continue
-        for iid, meta in table.items():
-            sid = str(iid)
-            id_set.add(sid)
-            if isinstance(meta, dict):
-                nm = meta.get("name")
-                if isinstance(nm, str) and nm.strip():
-                    name_to_id.setdefault(nm.strip().lower(), sid)
-    return id_set, name_to_id
-
 def _lookup_meta(items_data: dict, item_id: str) -> tuple[str | None, dict | None]:
     """Return (category, meta) for the given canonical item_id, or (None, None)."""
-    sid = str(item_id)
-    for cat, table in (items_data or {}).items():
-        if isinstance(table, dict) and sid in table:
-            return cat, table[sid]
-    return None, None
+    hit = get_item_index(items_data).by_id.get(str(item_id))
+    return hit if hit else (None, None)
 
-def _canon_entry(entry: str, id_set: set[str], name_to_id: dict[str, str]) -> str:
+def _canon_entry(entry: str, index: ItemIndex) -> str:
     """
     Resolve a pool entry to a canonical item id:
       - if already an id in items_data -> keep
@@ -49,25 +25,22 @@ def _canon_entry(entry: str, id_set: set[str], name_to_id: dict[str, str]) -> st
       - else return original string (e.g., 'credit')
     """
     s = str(entry).strip()
-    if s in id_set:
+    if s in index.by_id:
         return s
     s_us = s.replace(" ", "_")
-    if s_us in id_set:
+    if s_us in index.by_id:
         return s_us
-    nm = s.lower()
-    if nm in name_to_id:
-        return name_to_id[nm]
-    return s  # leave as-is (like 'credit')
+    return index.id_for_name(s) or s  # leave as-is (like 'credit')
 
-def _canon_pool(pool: List[str], id_set: set[str], name_to_id: dict[str, str]) -> List[str]:
-    return [_canon_entry(x, id_set, name_to_id) for x in (pool or [])]
+def _canon_pool(pool: List[str], index: ItemIndex) -> List[str]:
+    return [_canon_entry(x, index) for x in (pool or [])]
 
 def _get_pool_for_rarity(tier_cfg: dict, rarity: str) -> List[str]:
     pools = tier_cfg.get("pools", {}) or {}
     return list(pools.get(rarity, []) or [])
 
 def has_valid_supply_crate_config(tier: str) -> bool:
-    cfg_all = load_json(SUPPLY_CRATES_FILE) or {}
+    cfg_all = gamedata.supply_crates() or {}
     tcfg = cfg_all.get(str(tier).lower())
     if not tcfg:
         return False
@@ -75,7 +48,7 @@ def has_valid_supply_crate_config(tier: str) -> bool:
     return any(len(v or []) > 0 for v in pools.values())
 
 def get_supply_crate_config_snapshot(tier: str) -> dict:
-    cfg_all = load_json(SUPPLY_CRATES_FILE) or {}
+    cfg_all = gamedata.supply_crates() or {}
     return cfg_all.get(str(tier).lower(), {})
 
 # ---- Planet gating helpers ----
@@ -137,76 +110,171 @@ def _is_allowed_for_planet(item_id: str, items_data: dict, max_planet: int) -> b
     # Other categories (weapons/armor/etc.) are allowed by default
     return True
 
-def generate_supply_crate_rewards(player: dict, crate_tier: str, items_data: dict) -> dict[str, int]:
+# ---- Compiled loot tables ----
+class CompiledCrate:
     """
-    Each roll yields exactly 1 unit of a chosen item. Total items per open equals the roll count.
-    Duplicates aggregate if the same item is picked multiple times.
-    Pool entries in the JSON are canonicalized to real item ids before picking.
-    Applies planet gating so players cannot receive materials/drops from planets they haven't reached.
+    One tier at one planet bracket, ready to sample:
+    - rolls:    (min, max) picks per crate
+    - outcomes: canonical item ids; None is a roll lost to planet gating
+    - probs:    per-pick probability of each outcome (rarity roll, fallback and pool draw folded in)
     """
-    cfg_all = load_json(SUPPLY_CRATES_FILE) or {}
-    tcfg = cfg_all.get(str(crate_tier).lower())
-    if not tcfg:
-        return {}
 
+    __slots__ = ("rolls", "outcomes", "probs", "table")
+
+    def __init__(self, rolls: Tuple[int, int], outcomes: List[str | None], probs: List[float]):
+        self.rolls = rolls
+        self.outcomes = outcomes
+        self.probs = probs
+        self.table = AliasTable(probs)
+
+    def pick(self, rng=random) -> str | None:
+        return self.outcomes[self.table.sample(rng)]
+
+
+def _rarity_order(rarity_names: List[str]) -> List[str]:
+    default_order = ["common", "uncommon", "rare", "mythic", "legendary"]
+    return [r for r in default_order if r in rarity_names] + [r for r in rarity_names if r not in default_order]
+
+
+def _fallback_pool(chosen: str, order: List[str], pools: Dict[str, List[str]]) -> List[str]:
+    """Pool used when `chosen` rolls: its own, else the nearest non-empty rarity (up, down, up 2, ...)."""
+    pool = pools.get(chosen, [])
+    if pool:
+        return pool
+    idx = order.index(chosen)
+    for delta in (1, -1, 2, -2, 3, -3, 4, -4):
+        j = idx + delta
+        if 0 <= j < len(order) and pools.get(order[j]):
+            return pools[order[j]]
+    return []
+
+
+def _compile_crate(tcfg: dict, items_all: dict, max_planet: int) -> CompiledCrate:
     rolls_low, rolls_high = tcfg.get("rolls", [1, 1])
-    rmin, rmax = _clamp_qty(rolls_low, rolls_high)
-    picks = random.randint(rmin, rmax)
+    rolls = _clamp_qty(rolls_low, rolls_high)
 
     rarity_weights = tcfg.get("rarity_weights", {"common": 100})
     rarity_names = list(rarity_weights.keys())
-    rarity_vals = list(rarity_weights.values())
+    index = get_item_index(items_all)
+    pools: Dict[str, List[str]] = {}
+    for rar in rarity_names:
+        canon = _canon_pool(_get_pool_for_rarity(tcfg, rar), index)
+        pools[rar] = [pid for pid in canon if _is_allowed_for_planet(pid, items_all, max_planet)]
+    order = _rarity_order(rarity_names)
 
-    # Canonicalize pools once per call (for all rarities present)
-    items_all = items_data or (load_json(ITEMS_FILE) or {})
-    id_set, name_to_id = _index_items(items_all)
-    pools_canon: Dict[str, List[str]] = {}
+    # Fold rarity weight x (multiplicity / pool size) into one distribution per pick
+    weights: Dict[str | None, float] = {}
     for rar in rarity_names:
-        raw = _get_pool_for_rarity(tcfg, rar)
-        pools_canon[rar] = _canon_pool(raw, id_set, name_to_id)
+        w = float(rarity_weights.get(rar) or 0)
+        if w <= 0:
+            continue
+        pool = _fallback_pool(rar, order, pools)
+        if not pool:
+            weights[None] = weights.get(None, 0.0) + w  # roll skipped
+            continue
+        share = w / len(pool)
+        for pid in pool:
+            weights[pid] = weights.get(pid, 0.0) + share
 
-    # Planet-gated filtered pools
-    max_planet = _player_max_planet(player or {})
-    pools_filtered: Dict[str, List[str]] = {}
-    for rar, plist in pools_canon.items():
-        allowed = [pid for pid in plist if _is_allowed_for_planet(pid, items_all, max_planet)]
-        pools_filtered[rar] = allowed
+    if not weights:
+        weights[None] = 1.0
+    total = sum(weights.values())
+    outcomes = list(weights.keys())
+    return CompiledCrate(rolls, outcomes, [weights[o] / total for o in outcomes])
 
-    # Rarity order for fallback
-    default_order = ["common", "uncommon", "rare", "mythic", "legendary"]
-    order = [r for r in default_order if r in rarity_names] + [r for r in rarity_names if r not in default_order]
 
-    rewards: Dict[str, int] = {}
+def _planet_bracket(tcfg: dict, items_all: dict, max_planet: int) -> int:
+    """Highest gating threshold <= max_planet; players in the same bracket share a compiled table."""
+    bracket = 1
+    index = get_item_index(items_all)
+    for rar in (tcfg.get("pools") or {}):
+        for pid in _canon_pool(_get_pool_for_rarity(tcfg, rar), index):
+            # Lowest planet that unlocks pid (gating is monotone in planet)
+            for req in range(1, max_planet + 1):
+                if _is_allowed_for_planet(pid, items_all, req):
+                    bracket = max(bracket, req)
+                    break
+    return bracket
 
-    for _ in range(picks):
-        # roll rarity by weights
-        chosen = random.choices(rarity_names, weights=rarity_vals, k=1)[0]
-        pool = pools_filtered.get(chosen, [])
 
-        if not pool:
-            # walk to nearest non-empty rarity pool
-            if chosen in order:
-                idx = order.index(chosen)
-            else:
-                # if not in order, just pick any non-empty pool
-                non_empty = next((pools_filtered[r] for r in order if pools_filtered.get(r)), [])
-                pool = non_empty
-            if not pool:
-                # search neighbors
-                for delta in (1, -1, 2, -2, 3, -3, 4, -4):
-                    j = (idx + delta) if 'idx' in locals() else None
-                    if j is None or j < 0 or j >= len(order):
-                        continue
-                    alt = pools_filtered.get(order[j], [])
-                    if alt:
-                        pool = alt
-                        break
+_compiled_cache: Tuple[object, object, Dict[Tuple[str, int], CompiledCrate | None]] = (None, None, {})
+_bracket_cache: Dict[Tuple[str, int], int] = {}
 
-        if not pool:
-            # No valid items available at this rarity after gating; skip this roll
-            continue
 
-        chosen_id = random.choice(pool)
-        rewards[chosen_id] = rewards.get(chosen_id, 0) + 1
+def get_compiled_crate(crate_tier: str, max_planet: int, items_data: dict | None = None) -> CompiledCrate | None:
+    """
+    Compiled table for a tier at the player's planet bracket (None if the tier is unknown).
+    Cached per supply_crates.json / items.json version; ad-hoc items_data is compiled uncached.
+    """
+    global _compiled_cache, _bracket_cache
+    cfg_all = gamedata.supply_crates() or {}
+    items_all = items_data or (gamedata.items() or {})
+    tier = str(crate_tier).lower()
+    tcfg = cfg_all.get(tier)
+    if not tcfg:
+        return None
+    cacheable = isinstance(items_all, gamedata.FrozenDict)
+    if not cacheable:
+        return _compile_crate(tcfg, items_all, max_planet)
+
+    cfg_ref, items_ref, tables = _compiled_cache
+    if cfg_ref is not cfg_all or items_ref is not items_all:
+        tables = {}
+        _bracket_cache = {}
+        _compiled_cache = (cfg_all, items_all, tables)
+
+    bkey = (tier, max_planet)
+    bracket = _bracket_cache.get(bkey)
+    if bracket is None:
+        bracket = _bracket_cache[bkey] = _planet_bracket(tcfg, items_all, max_planet)
+    key = (tier, bracket)
+    compiled = tables.get(key)
+    if compiled is None:
+        compiled = tables[key] = _compile_crate(tcfg, items_all, bracket)
+    return compiled
 
-    return rewards
\ No newline at end of file
+
+def generate_supply_crate_rewards(player: dict, crate_tier: str, items_data: dict, rng=random) -> dict[str, int]:
+    """
+    Each roll yields exactly 1 unit of a chosen item. Total items per open equals the roll count.
+    Duplicates aggregate if the same item is picked multiple times.
+    Pool entries in the JSON are canonicalized to real item ids before picking.
+    Applies planet gating so players cannot receive materials/drops from planets they haven't reached.
+    Sampling uses the compiled table for the player's planet bracket (see get_compiled_crate).
+    """
+    compiled = get_compiled_crate(crate_tier, _player_max_planet(player or {}), items_data)
+    if compiled is None:
+        return {}
+
+    rewards: Dict[str, int] = {}
+    rmin, rmax = compiled.rolls
+    for _ in range(rng.randint(rmin, rmax)):
+        chosen_id = compiled.pick(rng)
+        if chosen_id is not None:
+            rewards[chosen_id] = rewards.get(chosen_id, 0) + 1
+    return rewards
+
+
+def open_supply_crates(player: dict, crate_tier: str, count: int, items_data: dict, rng=random) -> dict[str, int]:
+    """
+    Aggregated rewards for opening `count` crates at once, distributed exactly like
+    summing `count` calls of generate_supply_crate_rewards:
+    - crates per roll count ~ Multinomial(count, uniform over rolls[0]..rolls[1])
+    - picks per outcome     ~ Multinomial(total picks, compiled per-pick probabilities)
+    Cost depends on the number of distinct outcomes, not on `count`.
+    """
+    count = int(count)
+    compiled = get_compiled_crate(crate_tier, _player_max_planet(player or {}), items_data)
+    if compiled is None or count <= 0:
+        return {}
+
+    rmin, rmax = compiled.rolls
+    span = rmax - rmin + 1
+    per_roll = multinomial(count, [1.0 / span] * span, rng)
+    total_picks = sum((rmin + i) * c for i, c in enumerate(per_roll))
+
+    rewards: Dict[str, int] = {}
+    for outcome, qty in zip(compiled.outcomes, multinomial(total_picks, compiled.probs, rng)):
+        if outcome is not None and qty > 0:
+            rewards[outcome] = qty
+    return rewards
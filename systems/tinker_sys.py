@@ -1,9 +1,7 @@
 import random
 from typing import Dict, Tuple
-from core.shared import load_json
-from core.constants import ITEMS_FILE
+from core import gamedata
 from typing import Dict, Tuple
-from core.shared import load_json
 from systems.ship_sys import derive_ship_effects 
 from core.skills_hooks import tinkerer_effects
 
@@ -170,7 +168,7 @@ def roll_tinker_tier(max_planet: int, rng=None, player: dict = None) -> Tuple[st
     tier = rng.choices(tiers, weights=probs, k=1)[0]
     return tier, TINKER_TIERS[tier]
 
-def apply_tinker(player: dict, slot: str, effective_planet: int | None = None) -> Tuple[bool, str, float, int, str]:
+def apply_tinker(player: dict, slot: str, effective_planet: int | None = None, rng=None) -> Tuple[bool, str, float, int, str]:
     """
     slot: "weapon" or "armor"
     effective_planet: if provided, overrides player's planet for cost/weights (use 10 when Overcharged)
@@ -185,7 +183,7 @@ def apply_tinker(player: dict, slot: str, effective_planet: int | None = None) -
     if not equipped:
         return False, "", 0.0, 0, ""
 
-    items = load_json(ITEMS_FILE)
+    items = gamedata.items()
     category = "weapons" if slot == "weapon" else "armor"
     item_data = (items.get(category, {}) or {}).get(str(equipped))
     if not item_data:
@@ -202,7 +200,7 @@ def apply_tinker(player: dict, slot: str, effective_planet: int | None = None) -
     player["Scrap"] = player.get("Scrap", 0) - cost
 
     # Roll result using effective planet
-    tier, buff = roll_tinker_tier(p, player=player)
+    tier, buff = roll_tinker_tier(p, rng=rng, player=player)
 
     # Save enhancement keyed by item_id to allow re-equips
     enh = player.get("enhancements", {})
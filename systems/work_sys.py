@@ -1,7 +1,6 @@
 import random
-from core.shared import load_json
+from core import gamedata
 from core.players import save_profile
-from core.constants import PLANETS_FILE, ITEMS_FILE
 from core.decorators import requires_profile
 from core.cooldowns import check_and_set_cooldown
 from discord.ext import commands
@@ -124,7 +123,7 @@ async def handle_work(ctx, command_name: str):
     items_data = load_items() or {}
 
     # Load planet data robustly (supports both flat and { "planets": { ... } } shapes)
-    planets_root = load_json(PLANETS_FILE) or {}
+    planets_root = gamedata.planets() or {}
     planets_data = planets_root.get("planets") if isinstance(planets_root.get("planets"), dict) else planets_root
 
     # Use current planet if set; fallback to max_unlocked_planet
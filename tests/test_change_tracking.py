@@ -0,0 +1,134 @@
+import copy
+
+from core.change_tracking import TrackedProfile, to_plain
+
+
+def _profile():
+    return TrackedProfile({
+        "level": 5,
+        "Scrap": 100,
+        "inventory": {"101": 3, "102": 1},
+        "skills": {"boxer": {"level": 2, "xp": 10}},
+        "crew": [{"code": "A1", "status": "idle"}],
+    })
+
+
+def test_fresh_profile_has_no_changes():
+    p = _profile()
+    assert not p.has_changes
+    assert p.collect_changes() == {"set": {}, "unset": []}
+
+
+def test_top_level_set_and_unset():
+    p = _profile()
+    p["level"] = 6
+    del p["Scrap"]
+    assert p.collect_changes() == {"set": {"level": 6}, "unset": ["Scrap"]}
+
+
+def test_nested_mutation_marks_top_level_key():
+    p = _profile()
+    p["skills"]["boxer"]["xp"] = 20
+    p["crew"][0]["status"] = "working"
+    changes = p.collect_changes()
+    assert changes["set"] == {
+        "skills": {"boxer": {"level": 2, "xp": 20}},
+        "crew": [{"code": "A1", "status": "working"}],
+    }
+
+
+def test_inventory_is_tracked_per_entry():
+    p = _profile()
+    p["inventory"]["101"] -= 1
+    p["inventory"].pop("102")
+    p["inventory"]["103"] = 2
+    changes = p.collect_changes()
+    assert changes["set"] == {}
+    assert changes["inventory"] == {"101": 2, "102": None, "103": 2}
+
+
+def test_replaced_inventory_is_written_whole():
+    p = _profile()
+    p["inventory"] = {"200": 1}
+    changes = p.collect_changes()
+    assert changes["set"] == {"inventory": {"200": 1}}
+    assert "inventory" not in changes
+
+
+def test_mark_clean_forgets_tracked_changes():
+    p = _profile()
+    p["skills"]["boxer"]["xp"] = 20
+    p.mark_clean()
+    assert not p.has_changes
+    p["skills"]["boxer"]["level"] = 3
+    assert p.collect_changes()["set"] == {"skills": {"boxer": {"level": 3, "xp": 20}}}
+
+
+def test_plain_top_level_container_stays_sticky():
+    p = _profile()
+    ship = {"level": 1}
+    p["ship"] = ship
+    p.mark_clean()
+    ship["level"] = 2  # caller keeps its alias
+    assert p.has_changes
+    assert p.collect_changes()["set"] == {"ship": {"level": 2}}
+
+
+def test_plain_nested_container_survives_mark_clean():
+    p = _profile()
+    p["skills"]["worker"] = {"level": 1, "xp": 0}
+    p.mark_clean()
+    p["skills"]["worker"]["xp"] = 50
+    assert p.has_changes
+    assert p.collect_changes()["set"]["skills"]["worker"] == {"level": 1, "xp": 50}
+
+
+def test_setdefault_and_update_containers_are_sticky():
+    p = _profile()
+    node = p["skills"].setdefault("crafter", {"level": 1, "xp": 0})
+    p["skills"].update(miner={"level": 1, "xp": 0})
+    p.mark_clean()
+    node["xp"] = 7
+    p["skills"]["miner"]["xp"] = 9
+    skills = p.collect_changes()["set"]["skills"]
+    assert skills["crafter"]["xp"] == 7 and skills["miner"]["xp"] == 9
+
+
+def test_list_mutators_storing_plain_containers_are_sticky():
+    for mutate in (
+        lambda crew, c: crew.append(c),
+        lambda crew, c: crew.insert(0, c),
+        lambda crew, c: crew.extend(iter([c])),
+        lambda crew, c: crew.__setitem__(slice(0, 1), [c]),
+    ):
+        p = _profile()
+        c = {"code": "B2", "status": "idle"}
+        mutate(p["crew"], c)
+        p.mark_clean()
+        c["status"] = "working"
+        assert {"code": "B2", "status": "working"} in p.collect_changes()["set"]["crew"]
+
+
+def test_tracked_values_do_not_become_sticky():
+    p = _profile()
+    p["crew"].append(5)
+    p["crew"][1] = 6
+    p["skills"]["boxer"] = p["skills"]["boxer"]
+    p.mark_clean()
+    assert not p.has_changes
+
+
+def test_container_moved_to_another_key_is_sticky():
+    p = _profile()
+    p["old_skills"] = p["skills"]
+    p.mark_clean()
+    p["old_skills"]["boxer"]["xp"] = 99
+    assert p.collect_changes()["set"]["old_skills"]["boxer"]["xp"] == 99
+
+
+def test_copies_are_plain():
+    p = _profile()
+    for copied in (copy.deepcopy(p), to_plain(p)):
+        assert type(copied) is dict
+        assert type(copied["skills"]["boxer"]) is dict and type(copied["crew"]) is list
+        assert copied == p
@@ -0,0 +1,74 @@
+import copy
+import random
+
+import pytest
+
+from core import gamedata
+from core.derived import clear_cache, derived_stats
+from core.items import iterate_all_items
+from core.skills import SKILLS, compute_perks
+from core.skills_hooks import effects_for, perks_for
+from systems.ship_sys import derive_ship_effects, ship_effects_uncached
+
+
+def _weapon_id():
+    for iid, it in iterate_all_items(gamedata.items()):
+        if int(it.get("attack", 0) or 0) > 0:
+            return str(iid)
+    pytest.skip("no weapon in items.json")
+
+
+def test_matches_uncached():
+    rng = random.Random(11)
+    for _ in range(200):
+        p = {
+            "level": rng.randint(1, 300),
+            "overcharged": rng.random() < 0.2,
+            "skills": {s: {"level": rng.randint(1, 150), "xp": 0} for s in SKILLS if rng.random() < 0.9},
+        }
+        if rng.random() < 0.7:
+            p["ship"] = {"owned": True, "tier": rng.randint(1, 10), "level": rng.randint(1, 100),
+                         "type": rng.choice([None, "frigate", "monitor", "dreadnought"])}
+        assert perks_for(p) == compute_perks(p)
+        assert derive_ship_effects(p) == ship_effects_uncached(p)
+        assert effects_for(p)["overcharged"] == p["overcharged"]
+
+
+def test_profile_changes_produce_fresh_stats():
+    p = {"level": 10}
+    first = derived_stats(p)
+    assert derived_stats(p) is first
+
+    p["level"] = 11
+    assert derived_stats(p).attack == first.attack + 5
+    assert derived_stats(p).max_health == first.max_health + 5
+
+    p["skills"] = {"boxer": {"level": 100, "xp": 0}}
+    assert effects_for(p)["extra_supply_crates"] == compute_perks(p)["boxer"].get("extra_supply_crates", 0)
+
+    p["ship"] = {"owned": True, "tier": 5, "level": 50, "type": "dreadnought", "attempts": {}}
+    assert derived_stats(p).max_health > 100 + 11 * 5
+
+    wid = _weapon_id()
+    p["equipped"] = {"weapon": wid}
+    plain = derived_stats(p).attack
+    p["enhancements"] = {wid: {"buff": 1.0}}
+    assert derived_stats(p).attack > plain
+
+
+def test_results_are_read_only():
+    eff = effects_for({"level": 1})
+    with pytest.raises(TypeError):
+        eff["sell_price_mult"] = 2.0
+
+
+def test_profile_is_never_modified():
+    for p in ({"level": 3}, {"level": 3, "skills": {"boxer": {"level": "7"}}, "ship": {"owned": True, "tier": 2}}):
+        before = copy.deepcopy(p)
+        derived_stats(p)
+        clear_cache()
+        derived_stats(p)
+        effects_for(p), derive_ship_effects(p), compute_perks(p)
+        assert p == before
+    assert derived_stats({"skills": {"boxer": {"level": "7"}}}).perks["boxer"] == compute_perks(
+        {"skills": {"boxer": {"level": 7, "xp": 0}}})["boxer"]
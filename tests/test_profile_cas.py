@@ -0,0 +1,141 @@
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+import core.player_store as player_store
+from core.player_backends import JsonFileBackend, SqliteBackend, ShardedFilesBackend
+from core.player_store import PlayerStore, ProfileConflict
+from core.players import default_profile, load_profile, save_profile, save_profiles, update_profile
+
+UID = "100000000000000001"
+WRITERS = 4
+UPDATES = 50
+
+
+def _backend(kind, root):
+    if kind == "sqlite":
+        return SqliteBackend(os.path.join(root, "players.sqlite3"))
+    if kind == "files":
+        return ShardedFilesBackend(os.path.join(root, "players"))
+    return JsonFileBackend(os.path.join(root, "players.json"))
+
+
+def _seed(kind, root):
+    store = PlayerStore(_backend(kind, root), shared=True)
+    prof = default_profile(UID, "cas")
+    prof["log"] = []
+    store.put(UID, prof)
+    return store
+
+
+def _bump(tag):
+    def mutate(prof):
+        prof["Scrap"] = int(prof.get("Scrap", 0)) + 1
+        prof["log"].append(tag)
+    return mutate
+
+
+def _writer(kind, root, wid):
+    # Each process gets its own store on the shared volume, like one bot shard
+    player_store._store = PlayerStore(_backend(kind, root), shared=True)
+    for i in range(UPDATES):
+        update_profile(UID, _bump(f"{wid}:{i}"), retries=10_000)
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "files"])
+def test_concurrent_processes_lose_no_updates(kind, tmp_path):
+    root = str(tmp_path)
+    seed = _seed(kind, root)
+    if hasattr(seed.backend, "close"):
+        seed.backend.close()
+
+    # spawn, not fork: an SQLite connection must never be inherited by a child process
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_writer, args=(kind, root, w)) for w in range(WRITERS)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+        assert p.exitcode == 0
+
+    final = _backend(kind, root).read(UID)
+    assert final["Scrap"] == WRITERS * UPDATES
+    assert sorted(final["log"]) == sorted(f"{w}:{i}" for w in range(WRITERS) for i in range(UPDATES))
+    assert final["rev"] == WRITERS * UPDATES + 1
+
+
+def test_concurrent_threads_lose_no_updates(tmp_path, monkeypatch):
+    monkeypatch.setattr(player_store, "_store", _seed("json", str(tmp_path)))
+
+    def run(wid):
+        for i in range(UPDATES):
+            update_profile(UID, _bump(f"{wid}:{i}"), retries=10_000)
+
+    threads = [threading.Thread(target=run, args=(w,)) for w in range(WRITERS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    final = player_store._store.get(UID)
+    assert final["Scrap"] == WRITERS * UPDATES
+    assert len(final["log"]) == WRITERS * UPDATES
+
+
+@pytest.mark.parametrize("kind", ["json", "sqlite", "files"])
+def test_stale_rev_is_rejected(kind, tmp_path):
+    store = _seed(kind, str(tmp_path))
+    prof = store.get(UID)
+    rev = prof["rev"]
+    assert store.put(UID, prof, expected_rev=rev) == rev + 1
+    with pytest.raises(ProfileConflict):
+        store.put(UID, prof, expected_rev=rev)
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "files"])
+def test_group_save_is_all_or_nothing(kind, tmp_path, monkeypatch):
+    root = str(tmp_path)
+    store = _seed(kind, root)
+    store.put("2", default_profile("2", "ally"))
+    monkeypatch.setattr(player_store, "_store", store)
+    a, b = load_profile(UID), load_profile("2")
+    a["Scrap"], b["Scrap"] = 10, 20
+
+    # Another process saves the second profile first
+    other = PlayerStore(_backend(kind, root), shared=True)
+    other.put("2", other.get("2"))
+
+    with pytest.raises(ProfileConflict):
+        save_profiles({UID: a, "2": b})
+    fresh = _backend(kind, root)
+    assert fresh.read(UID)["Scrap"] == 0 and fresh.read(UID)["rev"] == 1
+    assert fresh.read("2")["Scrap"] == 0
+    assert store.get(UID)["Scrap"] == 0
+
+    a, b = load_profile(UID), load_profile("2")
+    a["Scrap"], b["Scrap"] = 10, 20
+    save_profiles({UID: a, "2": b})
+    assert fresh.read(UID)["Scrap"] == 10 and fresh.read("2")["Scrap"] == 20
+
+
+def test_plain_save_retries_on_conflict(tmp_path, monkeypatch):
+    store = _seed("sqlite", str(tmp_path))
+    monkeypatch.setattr(player_store, "_store", store)
+    other = PlayerStore(_backend("sqlite", str(tmp_path)), shared=True)
+    real_get = store.get
+    raced = []
+
+    def racing_get(uid):
+        prof = real_get(uid)
+        if not raced:
+            # Another process saves between this read and the write
+            raced.append(1)
+            other.put(uid, dict(other.get(uid), Credits=5))
+        return prof
+
+    monkeypatch.setattr(store, "get", racing_get)
+    save_profile(UID, {"Scrap": 7})
+    final = other.get(UID)
+    assert final["Scrap"] == 7 and final["Credits"] == 5
@@ -0,0 +1,66 @@
+import types
+from collections import Counter
+
+import pytest
+
+from core import gamedata, rng as rngsvc
+from core.crew import finalize_job_reward
+from systems.supply_crates import open_supply_crates
+
+
+@pytest.fixture(autouse=True)
+def pinned_root():
+    before = rngsvc.root_seed()
+    rngsvc.set_root_seed(1234)
+    yield
+    rngsvc.set_root_seed(before)
+
+
+def test_streams_replay_per_key():
+    a = rngsvc.stream("scan", 42, 1001)
+    b = rngsvc.stream("scan", 42, 1001)
+    c = rngsvc.stream("scan", 42, 1002)
+    seq = a.uniforms(50)
+    assert seq == b.uniforms(50)
+    assert seq != c.uniforms(50)
+    rngsvc.set_root_seed(99)
+    assert rngsvc.stream("scan", 42, 1001).uniforms(50) != seq
+
+
+def test_batch_draws():
+    r = rngsvc.stream("batch")
+    assert r.uniforms(0) == [] and all(0.0 <= u < 1.0 for u in r.uniforms(1000))
+
+    weights = [5.0, 3.0, 2.0, 0.0]
+    picks = Counter(r.categorical(20_000, weights))
+    assert set(picks) <= {0, 1, 2}
+    assert abs(picks[0] / 20_000 - 0.5) < 0.02
+
+    counts = r.counts(20_000, weights)
+    assert sum(counts) == 20_000 and counts[3] == 0
+    assert abs(counts[1] / 20_000 - 0.3) < 0.02
+    assert r.counts(10, [0.0, 0.0]) == [0, 0]
+
+
+def test_command_rng_is_cached_and_keyed_on_message():
+    def ctx(message_id):
+        return types.SimpleNamespace(command=types.SimpleNamespace(qualified_name="scan"),
+                                     author=types.SimpleNamespace(id=7),
+                                     message=types.SimpleNamespace(id=message_id))
+    first = ctx(555)
+    r = rngsvc.command_rng(first)
+    assert rngsvc.command_rng(first) is r
+    assert r.uniforms(5) == rngsvc.command_rng(ctx(555)).uniforms(5)
+    assert rngsvc.command_rng(ctx(556)).uniforms(5) != rngsvc.command_rng(ctx(555)).uniforms(5)
+
+
+def test_reward_rolls_replay():
+    items = gamedata.items()
+    player = {"max_unlocked_planet": 3}
+    one = open_supply_crates(player, "rare", 50, items, rng=rngsvc.stream("open", 1))
+    two = open_supply_crates(player, "rare", 50, items, rng=rngsvc.stream("open", 1))
+    assert one == two and one
+
+    crew = {"type": "contractor", "code": "C1", "job_started": 1_700_000_000}
+    rewards = {str(finalize_job_reward({"id": "7"}, crew, 1, 1)) for _ in range(5)}
+    assert len(rewards) == 1
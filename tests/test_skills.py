@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+import core.skills as skills
+from core.skills import SKILLS, award_skill_xp, compute_perks, xp_required
+
+
+def _award_stepwise(player, name, amount):
+    """The original level-by-level loop, kept as the reference."""
+    node = skills._skill_node(player, name)
+    node["xp"] += int(amount)
+    levels = 0
+    while True:
+        lvl = node["level"]
+        req = skills._xp_required_formula(name, lvl)
+        if node["xp"] < req:
+            break
+        if lvl >= 100 and not skills.is_overcharged(player):
+            node["xp"] = min(node["xp"], req - 1)
+            break
+        node["xp"] -= req
+        node["level"] = lvl + 1
+        levels += 1
+    return node["level"], levels
+
+
+def test_xp_required_matches_formula():
+    for name in SKILLS:
+        for level in list(range(1, 400)) + [10_000, 123_456]:
+            assert xp_required(name, level) == skills._xp_required_formula(name, level)
+
+
+@pytest.mark.parametrize("name", SKILLS)
+def test_award_matches_stepwise(name):
+    rng = random.Random(SKILLS.index(name))
+    for _ in range(300):
+        level = rng.choice([1, rng.randint(1, 99), 100, rng.randint(101, 250)])
+        start = {"level": level, "xp": rng.randint(0, xp_required(name, level) - 1)}
+        oc = rng.random() < 0.5
+        amount = rng.choice([1, rng.randint(1, 10_000), rng.randint(1, 10**7), rng.randint(1, 10**9)])
+        a = {"overcharged": oc, "skills": {name: dict(start)}}
+        b = {"overcharged": oc, "skills": {name: dict(start)}}
+        assert award_skill_xp(a, name, amount) == _award_stepwise(b, name, amount)
+        assert a == b
+
+
+def test_huge_award_is_closed_form():
+    p = {"overcharged": True}
+    lvl, gained = award_skill_xp(p, "boxer", 10**15)
+    node = p["skills"]["boxer"]
+    assert gained == lvl - 1 > 100_000
+    assert 0 <= node["xp"] < xp_required("boxer", lvl)
+
+
+def test_perk_table_matches_formulas():
+    for level in (1, 50, 100, 101, 137, 999, 1000, 1001, 50_000):
+        p = {"skills": {n: {"level": level, "xp": 0} for n in SKILLS}}
+        perks = compute_perks(p)
+        for name, fn in skills._PERK_FUNCS.items():
+            assert perks[name] == fn(level)
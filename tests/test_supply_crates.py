@@ -0,0 +1,91 @@
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from core import gamedata
+from core.sampling import binomial, multinomial
+from systems.supply_crates import generate_supply_crate_rewards, get_compiled_crate, open_supply_crates
+
+CRATES = 4000
+BATCH = 100
+
+
+def _chi2_critical(df, z=3.09):
+    # Wilson-Hilferty approximation of the chi-square quantile (z=3.09 -> alpha ~ 0.001)
+    return df * (1 - 2 / (9 * df) + z * math.sqrt(2 / (9 * df))) ** 3
+
+
+def _homogeneity(a: Counter, b: Counter):
+    """Chi-square statistic and degrees of freedom for 'a and b have the same proportions'."""
+    keys = sorted(set(a) | set(b))
+    ta, tb = sum(a.values()), sum(b.values())
+    stat = 0.0
+    for k in keys:
+        col = a[k] + b[k]
+        for obs, tot in ((a[k], ta), (b[k], tb)):
+            exp = col * tot / (ta + tb)
+            stat += (obs - exp) ** 2 / exp
+    return stat, len(keys) - 1
+
+
+@pytest.mark.parametrize("n,p", [(20, 0.1), (1000, 0.3), (50, 0.9), (200_000, 0.02)])
+def test_binomial_moments(n, p):
+    rng = random.Random(1234)
+    draws = [binomial(n, p, rng) for _ in range(20_000)]
+    mean = sum(draws) / len(draws)
+    var = sum((x - mean) ** 2 for x in draws) / (len(draws) - 1)
+    sd = math.sqrt(n * p * (1 - p))
+    assert all(0 <= x <= n for x in draws)
+    assert abs(mean - n * p) < 5 * sd / math.sqrt(len(draws))
+    assert abs(var / (sd * sd) - 1) < 0.06
+
+
+def test_multinomial_preserves_total():
+    rng = random.Random(7)
+    probs = [0.5, 0.25, 0.125, 0.125, 0.0]
+    for n in (0, 1, 17, 10_000):
+        counts = multinomial(n, probs, rng)
+        assert sum(counts) == n
+        assert counts[-1] == 0
+
+
+@pytest.mark.parametrize("tier,planet", [("common", 1), ("rare", 3), ("solar", 6)])
+def test_batch_open_matches_per_crate(tier, planet):
+    items = gamedata.items()
+    player = {"max_unlocked_planet": planet}
+
+    rng = random.Random(2024)
+    single = Counter()
+    per_crate_totals = []
+    for _ in range(CRATES):
+        got = generate_supply_crate_rewards(player, tier, items, rng=rng)
+        single.update(got)
+        per_crate_totals.append(sum(got.values()))
+
+    rng = random.Random(4048)
+    batch = Counter()
+    for _ in range(CRATES // BATCH):
+        batch.update(open_supply_crates(player, tier, BATCH, items, rng=rng))
+
+    # Same item proportions
+    stat, df = _homogeneity(single, batch)
+    assert df > 0
+    assert stat < _chi2_critical(df), f"chi2={stat:.1f} df={df}"
+
+    # Same total number of items (within 5 sd of the difference of two sums)
+    mean = sum(per_crate_totals) / CRATES
+    var = sum((x - mean) ** 2 for x in per_crate_totals) / (CRATES - 1)
+    assert abs(sum(batch.values()) - sum(single.values())) < 5 * math.sqrt(2 * CRATES * var)
+
+
+def test_batch_open_edge_cases():
+    items = gamedata.items()
+    assert open_supply_crates({}, "no_such_tier", 10, items) == {}
+    assert open_supply_crates({}, "common", 0, items) == {}
+    compiled = get_compiled_crate("common", 1, items)
+    assert abs(sum(compiled.probs) - 1.0) < 1e-9
+    got = open_supply_crates({}, "common", 1, items, rng=random.Random(1))
+    rmin, rmax = compiled.rolls
+    assert sum(got.values()) <= rmax